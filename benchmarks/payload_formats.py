@@ -0,0 +1,64 @@
+"""
+Benchmark MessagePack against JSON for article list payloads.
+
+Compares, for lists of 10, 1,000 and 10,000 articles, the two bodies
+core.serialization.schema_response() can send: payload size, server-side
+encoding (dump_json() vs dump_msgpack(), validation included) and
+client-side decoding (json.loads() vs msgpack.unpackb()). Articles carry
+about 2 KB of text each, so most of the payload is strings, which both
+formats store byte for byte.
+
+Run from the repository root:
+
+    PYTHONPATH=src/app python benchmarks/payload_formats.py
+"""
+
+import json
+import time
+from collections.abc import Callable
+
+import msgpack
+
+from core.serialization import dump_json, dump_msgpack
+from schemas.article import ArticleListResponse
+
+from serialization import SIZES, make_articles
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """Fastest of repeat calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    print(
+        f"{'articles':>10} {'json (KB)':>10} {'msgpack (KB)':>13} "
+        f"{'encode json/mp (ms)':>20} {'decode json/mp (ms)':>20}"
+    )
+    for size in SIZES:
+        data = {"articles": make_articles(size), "count": size}
+        as_json = dump_json(ArticleListResponse, data)
+        as_msgpack = dump_msgpack(ArticleListResponse, data)
+        assert json.loads(as_json) == msgpack.unpackb(as_msgpack)
+
+        repeat = max(3, 2_000 // size)
+        encode_json = best_of(lambda: dump_json(ArticleListResponse, data), repeat)
+        encode_msgpack = best_of(
+            lambda: dump_msgpack(ArticleListResponse, data), repeat
+        )
+        decode_json = best_of(lambda: json.loads(as_json), repeat)
+        decode_msgpack = best_of(lambda: msgpack.unpackb(as_msgpack), repeat)
+        print(
+            f"{size:>10} {len(as_json) / 1024:>10.1f} {len(as_msgpack) / 1024:>13.1f} "
+            f"{encode_json * 1000:>9.2f} /{encode_msgpack * 1000:>9.2f} "
+            f"{decode_json * 1000:>9.2f} /{decode_msgpack * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
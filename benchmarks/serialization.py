@@ -0,0 +1,98 @@
+"""
+Benchmark the article list serialization paths.
+
+Compares, for lists of 10, 1,000 and 10,000 articles, the previous
+GET /api/v1/articles path (one ArticleResponse.model_validate() per ORM
+object, then FastAPI validating and serializing the response model again)
+with core.serialization.schema_response() (one TypeAdapter validation of the
+whole list, dumped straight to bytes). Both run as routes of a throwaway
+app without a database, so only serialization and HTTP handling differ.
+
+Run from the repository root:
+
+    PYTHONPATH=src/app python benchmarks/serialization.py
+"""
+
+import time
+from datetime import UTC, datetime
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from core.models import Article
+from core.serialization import schema_response
+from schemas.article import ArticleListResponse, ArticleResponse
+
+SIZES = (10, 1_000, 10_000)
+CONTENT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40
+
+
+def make_articles(count: int) -> list[Article]:
+    """Build transient articles shaped like real ones (about 2 KB of text)."""
+    now = datetime.now(UTC).replace(tzinfo=None)
+    return [
+        Article(
+            id=i,
+            user_id=1,
+            url=f"https://example.com/articles/{i}",
+            title=f"Article number {i}",
+            content=CONTENT,
+            excerpt=CONTENT[:200],
+            image_url="https://example.com/image.jpg",
+            tags=["reading", "later"],
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def make_app(articles: list[Article]) -> FastAPI:
+    """App serving the same articles through both paths."""
+    application = FastAPI()
+
+    @application.get("/model", response_model=ArticleListResponse)
+    def model_path() -> ArticleListResponse:
+        return ArticleListResponse(
+            articles=[ArticleResponse.model_validate(a) for a in articles],
+            count=len(articles),
+        )
+
+    @application.get("/adapter", response_model=ArticleListResponse)
+    def adapter_path(request: Request):
+        return schema_response(
+            request,
+            ArticleListResponse,
+            {"articles": articles, "count": len(articles)},
+        )
+
+    return application
+
+
+def best_of(client: TestClient, path: str, repeat: int) -> float:
+    """Fastest of repeat requests, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return min(timings)
+
+
+def main() -> None:
+    print(f"{'articles':>10} {'model (ms)':>12} {'adapter (ms)':>13} {'speedup':>8}")
+    for size in SIZES:
+        client = TestClient(make_app(make_articles(size)))
+        assert client.get("/model").json() == client.get("/adapter").json()
+        repeat = max(3, 2_000 // size)
+        model = best_of(client, "/model", repeat)
+        adapter = best_of(client, "/adapter", repeat)
+        print(
+            f"{size:>10} {model * 1000:>12.2f} {adapter * 1000:>13.2f} "
+            f"{model / adapter:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import logging
 
 from authlib.integrations.starlette_client import OAuth
 from fastapi import APIRouter, Depends, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
 from sqlmodel import Session
 
@@ -37,15 +38,18 @@ async def google_login(request: Request):
 
 
 @router.get("/auth/google/callback")
-async def google_callback(request: Request, session: Session = Depends(get_session)):
+async def google_callback(
+    request: Request, session: Session = Depends(get_session, scope="function")
+):
     """Google OAuth callback - creates or retrieves user and starts session."""
     try:
         token = await google.authorize_access_token(request)
         user_info = token.get("userinfo")
 
         if user_info:
-            # Get or create user via service
-            user_session = user_service.get_or_create_user(
+            # Get or create user via service, off the event loop
+            user_session = await run_in_threadpool(
+                user_service.get_or_create_user,
                 session,
                 email=user_info["email"],
                 name=user_info.get("name"),
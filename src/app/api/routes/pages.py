@@ -4,15 +4,24 @@ Template routes - HTML pages for browser users.
 These routes render Jinja2 templates and handle form submissions.
 """
 
+from pathlib import Path
+
 from fastapi import APIRouter, Depends, Form, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from markupsafe import Markup
+from pydantic import ValidationError
 from sqlmodel import Session
 
-from core.database import get_session
+from core import invalidation
+from core.cache import TTLCache
+from core.conditional import etag_matches, not_modified, set_etag, weak_etag
+from core.database import get_read_session, get_session
 from core.security import get_current_user, require_login
+from schemas.article import MAX_BULK_IDS, ArticleBulkUpdate
+from schemas.tag import MAX_TAG_LENGTH, MAX_TAGS
 from schemas.user import UserSession
-from services import article_service
+from services import article_service, counts_service, progress_service, tag_service
 
 router = APIRouter(tags=["pages"])
 
@@ -27,6 +36,68 @@ def global_context(request: Request):
 
 templates.context_processors.append(global_context)
 
+# Rendered per-article fragments (dashboard cards, reader bodies), keyed by
+# (template, user ID, article ID, version). Versioned keys go stale on their
+# own; invalidation events evict them so they do not linger until the TTL.
+_fragment_cache = TTLCache(maxsize=1024, ttl=600.0, name="fragment")
+
+
+def render_fragment(name: str, article) -> Markup:
+    """
+    Render a partial template for one article, reusing a cached copy.
+
+    The partial may only depend on the article, since nothing else is part
+    of the key.
+
+    Args:
+        name: Partial template, e.g. '_article_card.html'.
+        article: Article to render.
+
+    Returns:
+        Rendered HTML, safe to embed in the calling template.
+    """
+    key = (name, article.user_id, article.id, article.updated_at)
+    html = _fragment_cache.get(key)
+    if html is None:
+        html = Markup(templates.get_template(name).render(article=article))
+        _fragment_cache.set(key, html)
+    return html
+
+
+def _evict_fragments(user_id: int | None, article_ids: list[int] | None) -> None:
+    """Invalidation handler for the fragment cache."""
+    if user_id is None:
+        _fragment_cache.clear()
+    elif article_ids is None:
+        _fragment_cache.delete_where(lambda key: key[1] == user_id)
+    else:
+        ids = set(article_ids)
+        _fragment_cache.delete_where(lambda key: key[1] == user_id and key[2] in ids)
+
+
+invalidation.subscribe("article", _evict_fragments)
+templates.env.globals["fragment"] = render_fragment
+
+# Part of page ETags, so a deploy with changed templates is not answered
+# with 304 for pages rendered by the old ones.
+TEMPLATE_VERSION = max(
+    (path.stat().st_mtime_ns for path in Path("templates").glob("*.html")), default=0
+)
+
+# Number of search results shown per dashboard page.
+SEARCH_PAGE_SIZE = 20
+
+# Past-tense verb shown in the flash message for each bulk action.
+BULK_ACTION_MESSAGES = {
+    "archive": "archived",
+    "unarchive": "unarchived",
+    "favorite": "added to favorites",
+    "unfavorite": "removed from favorites",
+    "tag": "tagged",
+    "untag": "untagged",
+    "delete": "deleted",
+}
+
 
 @router.get("/", response_class=HTMLResponse)
 async def index(request: Request):
@@ -50,11 +121,29 @@ async def login(request: Request):
 def dashboard(
     request: Request,
     filter: str = "all",
+    q: str = "",
+    page: int = 1,
+    tag: str | None = None,
     user: UserSession = Depends(require_login),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session, scope="function"),
 ):
-    """Main dashboard showing saved articles."""
-    articles = article_service.list_articles(session, user.id, filter)
+    """Main dashboard showing saved articles, or search results when q is set."""
+    q = q.strip()
+    page = max(page, 1)
+    search_total = 0
+    if q:
+        articles, search_total = article_service.search_articles(
+            session,
+            user.id,
+            q,
+            filter_type=filter,
+            limit=SEARCH_PAGE_SIZE,
+            offset=(page - 1) * SEARCH_PAGE_SIZE,
+        )
+    else:
+        articles = article_service.list_articles(
+            session, user.id, filter, tag=tag, with_content=False
+        )
 
     # Get flash messages
     flash_message = request.session.pop("flash_message", None)
@@ -65,7 +154,14 @@ def dashboard(
         "dashboard.html",
         {
             "articles": articles,
+            "counts": counts_service.get_counts(session, user.id),
+            "tags": tag_service.list_tags(session, user.id),
+            "current_tag": None if q else tag,
             "filter_type": filter,
+            "query": q,
+            "page": page,
+            "search_total": search_total,
+            "has_next_page": page * SEARCH_PAGE_SIZE < search_total,
             "session": {"user": user},
             "flash_message": flash_message,
             "flash_category": flash_category,
@@ -73,14 +169,43 @@ def dashboard(
     )
 
 
+@router.get("/dashboard/suggest", response_class=HTMLResponse)
+def dashboard_suggest(
+    request: Request,
+    q: str = "",
+    user: UserSession = Depends(require_login),
+    session: Session = Depends(get_read_session, scope="function"),
+):
+    """HTMX typeahead fragment for the dashboard search box."""
+    suggestions = article_service.suggest_articles(session, user.id, q[:100])
+    return templates.TemplateResponse(
+        request, "suggestions.html", {"suggestions": suggestions}
+    )
+
+
 @router.get("/article/{article_id}", response_class=HTMLResponse)
 def view_article(
     request: Request,
     article_id: int,
     user: UserSession = Depends(require_login),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session, scope="function"),
 ):
-    """View a single article."""
+    """
+    View a single article.
+
+    Revisits (including back-button navigation) revalidate with the ETag
+    and get 304 without the body being loaded, unless a flash message is
+    waiting to be shown.
+    """
+    version = article_service.get_article_version(session, article_id, user.id)
+    etag = weak_etag(TEMPLATE_VERSION, user.id, user.name, article_id, version)
+    if (
+        version is not None
+        and "flash_message" not in request.session
+        and etag_matches(request, etag)
+    ):
+        return not_modified(etag)
+
     article = article_service.get_article_by_id(session, article_id, user.id)
 
     if not article:
@@ -88,11 +213,21 @@ def view_article(
         request.session["flash_category"] = "error"
         return RedirectResponse(url="/dashboard", status_code=status.HTTP_303_SEE_OTHER)
 
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         request,
         "article.html",
-        {"article": article, "session": {"user": user}},
+        {
+            "article": article,
+            "session": {"user": user},
+            "flash_message": request.session.pop("flash_message", None),
+            "flash_category": request.session.pop("flash_category", None),
+        },
+    )
+    set_etag(
+        response,
+        weak_etag(TEMPLATE_VERSION, user.id, user.name, article.id, article.updated_at),
     )
+    return response
 
 
 @router.post("/article/save")
@@ -100,7 +235,7 @@ def save_article(
     request: Request,
     url: str = Form(...),
     user: UserSession = Depends(require_login),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Save a new article from URL."""
     url = url.strip()
@@ -122,6 +257,7 @@ def save_article(
         content=article_data.content,
         excerpt=article_data.excerpt,
         image_url=article_data.image_url,
+        content_html=article_data.content_html,
     )
 
     request.session["flash_message"] = "Article saved successfully!"
@@ -129,12 +265,76 @@ def save_article(
     return RedirectResponse(url="/dashboard", status_code=status.HTTP_303_SEE_OTHER)
 
 
+@router.post("/article/bulk")
+def bulk_update_articles(
+    request: Request,
+    action: str = Form(...),
+    article_ids: list[int] = Form(default=[]),
+    select_all: bool = Form(False),
+    filter: str = Form("all"),
+    older_than_days: int | None = Form(None),
+    tagged: str | None = Form(None),
+    tag: str | None = Form(None),
+    user: UserSession = Depends(require_login),
+    session: Session = Depends(get_session, scope="function"),
+):
+    """
+    Apply an action to the articles selected on the dashboard.
+
+    With select_all the action applies to every article in the current tab
+    via the filter, rather than to the checkbox IDs that happened to be
+    rendered, so it stays a single statement at any library size.
+    """
+    try:
+        if not select_all and not article_ids:
+            raise ValueError("No articles selected.")
+        if not select_all and len(article_ids) > MAX_BULK_IDS:
+            raise ValueError(
+                f"Too many articles selected (max {MAX_BULK_IDS}). "
+                "Use 'Select all' to act on the whole tab."
+            )
+        bulk_in = ArticleBulkUpdate(
+            action=action,
+            ids=None if select_all else article_ids,
+            filter=filter if select_all else None,
+            tagged=tagged if select_all else None,
+            older_than_days=older_than_days,
+            tag=tag,
+        )
+    except ValidationError:
+        request.session["flash_message"] = "Invalid bulk action."
+        request.session["flash_category"] = "error"
+    except ValueError as e:
+        request.session["flash_message"] = str(e)
+        request.session["flash_category"] = "error"
+    else:
+        count = article_service.bulk_update_articles(
+            session,
+            user.id,
+            bulk_in.action,
+            article_ids=bulk_in.ids,
+            filter_type=bulk_in.filter,
+            older_than_days=bulk_in.older_than_days,
+            tagged=bulk_in.tagged,
+            tag=bulk_in.tag,
+        )
+        request.session["flash_message"] = (
+            f"{count} article(s) {BULK_ACTION_MESSAGES[bulk_in.action]}."
+        )
+        request.session["flash_category"] = "success"
+
+    if request.headers.get("HX-Request"):
+        return HTMLResponse(content="", status_code=200, headers={"HX-Refresh": "true"})
+
+    return RedirectResponse(url="/dashboard", status_code=status.HTTP_303_SEE_OTHER)
+
+
 @router.post("/article/{article_id}/toggle-favorite")
 def toggle_favorite(
     request: Request,
     article_id: int,
     user: UserSession = Depends(require_login),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Toggle article favorite status."""
     article_service.toggle_favorite(session, article_id, user.id)
@@ -150,7 +350,7 @@ def toggle_archive(
     request: Request,
     article_id: int,
     user: UserSession = Depends(require_login),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Toggle article archive status."""
     article_service.toggle_archive(session, article_id, user.id)
@@ -161,12 +361,61 @@ def toggle_archive(
     return RedirectResponse(url="/dashboard", status_code=status.HTTP_303_SEE_OTHER)
 
 
+@router.post("/article/{article_id}/toggle-read")
+def toggle_read(
+    request: Request,
+    article_id: int,
+    user: UserSession = Depends(require_login),
+    session: Session = Depends(get_session, scope="function"),
+):
+    """Toggle article read status."""
+    article_service.toggle_read(session, article_id, user.id)
+
+    if request.headers.get("HX-Request"):
+        return HTMLResponse(content="", status_code=200, headers={"HX-Refresh": "true"})
+
+    return RedirectResponse(url="/dashboard", status_code=status.HTTP_303_SEE_OTHER)
+
+
+@router.post("/article/{article_id}/tags")
+def update_tags(
+    request: Request,
+    article_id: int,
+    tags: str = Form(""),
+    user: UserSession = Depends(require_login),
+    session: Session = Depends(get_session, scope="function"),
+):
+    """Replace an article's tags with the comma-separated list from the form."""
+    names = tag_service.parse_tags(tags)
+    if len(names) > MAX_TAGS or any(len(name) > MAX_TAG_LENGTH for name in names):
+        request.session["flash_message"] = (
+            f"Use at most {MAX_TAGS} tags of up to {MAX_TAG_LENGTH} characters."
+        )
+        request.session["flash_category"] = "error"
+    else:
+        article_service.update_article(session, article_id, user.id, tags=names)
+
+    return RedirectResponse(
+        url=f"/article/{article_id}", status_code=status.HTTP_303_SEE_OTHER
+    )
+
+
+@router.post("/article/{article_id}/progress", status_code=status.HTTP_204_NO_CONTENT)
+async def report_progress(
+    article_id: int,
+    progress: float = Form(..., ge=0, le=1),
+    user: UserSession = Depends(require_login),
+):
+    """Buffer the reading position sent by the article page (no DB access)."""
+    progress_service.record_progress(user.id, article_id, progress)
+
+
 @router.post("/article/{article_id}/delete")
 def delete_article(
     request: Request,
     article_id: int,
     user: UserSession = Depends(require_login),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Delete an article."""
     article_service.delete_article(session, article_id, user.id)
@@ -1,15 +1,19 @@
 """
 API v1 routes - JSON API for programmatic access.
 
-Provides versioned REST endpoints for articles and health checks.
+Provides versioned REST endpoints for articles, tags, sync, export and health
+checks.
 """
 
 from fastapi import APIRouter
 
-from api.routes.v1 import articles, health
+from api.routes.v1 import articles, export, health, sync, tags
 
 router = APIRouter(prefix="/api/v1")
 router.include_router(articles.router)
+router.include_router(tags.router)
+router.include_router(sync.router)
+router.include_router(export.router)
 router.include_router(health.router)
 
 __all__ = ["router"]
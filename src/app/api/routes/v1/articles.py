@@ -4,21 +4,40 @@ API v1 articles routes - JSON API for article operations.
 Provides RESTful endpoints for article CRUD operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlmodel import Session
 
 from api.routes.v1.deps import require_api_auth
-from core.database import get_session
+from core.conditional import etag_matches, not_modified, set_etag, weak_etag
+from core.config import get_settings
+from core.database import get_read_session, get_session
+from core.http_compression import precompressed_response
+from core.serialization import (
+    NegotiatedRoute,
+    negotiated_media_type,
+    schema_response,
+    wants_msgpack,
+)
 from schemas.article import (
+    ArticleBulkResponse,
+    ArticleBulkUpdate,
+    ArticleCountsResponse,
     ArticleCreate,
+    ArticleFilter,
     ArticleListResponse,
+    ArticleLookup,
+    ArticleLookupResponse,
+    ArticleProgress,
     ArticleResponse,
+    ArticleSearchResponse,
+    ArticleSuggestResponse,
     ArticleUpdate,
+    lookup_response_schema,
 )
 from schemas.user import UserSession
-from services import article_service
+from services import article_service, counts_service, progress_service
 
-router = APIRouter(prefix="/articles", tags=["articles"])
+router = APIRouter(prefix="/articles", tags=["articles"], route_class=NegotiatedRoute)
 
 
 @router.get(
@@ -28,28 +47,132 @@ router = APIRouter(prefix="/articles", tags=["articles"])
     description="Get all articles for the authenticated user with optional filtering.",
 )
 def list_articles(
+    request: Request,
     filter: str = "all",
+    tag: str | None = None,
     user: UserSession = Depends(require_api_auth),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session, scope="function"),
 ) -> ArticleListResponse:
     """
     List articles for the current user.
 
+    The ETag is the user's library version and the negotiated media type,
+    so a poll with a current If-None-Match gets 304 after one primary-key
+    lookup instead of the whole list. The list is validated and serialized in one pass (see
+    core.serialization).
+
+    Args:
+        request: Incoming request (for If-None-Match and Accept).
+        filter: Filter type - 'all', 'unread', 'favorites', or 'archived'.
+        tag: Only list articles carrying this tag.
+        user: Authenticated user from dependency.
+        session: Database session.
+
+    Returns:
+        List of articles matching the filter, or 304 if unchanged.
+    """
+    version = counts_service.get_library_version(session, user.id)
+    media_type = negotiated_media_type(request)
+    etag = None if version is None else weak_etag(user.id, version, media_type)
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+
+    articles = article_service.list_articles(session, user.id, filter, tag=tag)
+    response = schema_response(
+        request, ArticleListResponse, {"articles": articles, "count": len(articles)}
+    )
+    if etag:
+        set_etag(response, etag)
+    return response
+
+
+@router.get(
+    "/search",
+    response_model=ArticleSearchResponse,
+    summary="Search articles",
+    description="Full-text search over article titles, excerpts, and content.",
+)
+def search_articles(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    filter: ArticleFilter | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    user: UserSession = Depends(require_api_auth),
+    session: Session = Depends(get_read_session, scope="function"),
+) -> ArticleSearchResponse:
+    """
+    Search the current user's articles, best matches first.
+
     Args:
-        filter: Filter type - 'all', 'favorites', or 'archived'.
+        q: Search text. Supports "quoted phrases", -exclusions, and OR.
+        filter: Optionally restrict to 'all', 'unread', 'favorites', or 'archived'.
+        limit: Page size.
+        offset: Number of results to skip.
         user: Authenticated user from dependency.
         session: Database session.
 
     Returns:
-        List of articles matching the filter.
+        Ranked results with highlighted snippets and the total match count.
     """
-    articles = article_service.list_articles(session, user.id, filter)
-    return ArticleListResponse(
-        articles=[ArticleResponse.model_validate(a) for a in articles],
-        count=len(articles),
+    results, total = article_service.search_articles(
+        session, user.id, q, filter_type=filter, limit=limit, offset=offset
+    )
+    return ArticleSearchResponse(
+        query=q, results=results, total=total, limit=limit, offset=offset
     )
 
 
+@router.get(
+    "/suggest",
+    response_model=ArticleSuggestResponse,
+    summary="Suggest articles",
+    description="Typo-tolerant search-as-you-type over titles and URL hosts.",
+)
+def suggest_articles(
+    q: str = Query(..., max_length=100, description="Partial search text"),
+    limit: int = Query(8, ge=1, le=20),
+    user: UserSession = Depends(require_api_auth),
+    session: Session = Depends(get_read_session, scope="function"),
+) -> ArticleSuggestResponse:
+    """
+    Suggest articles whose title or site matches partial input.
+
+    Args:
+        q: Text typed so far; fewer than two characters returns nothing.
+        limit: Maximum number of suggestions.
+        user: Authenticated user from dependency.
+        session: Database session.
+
+    Returns:
+        Best-matching articles first.
+    """
+    suggestions = article_service.suggest_articles(session, user.id, q, limit=limit)
+    return ArticleSuggestResponse(query=q, suggestions=suggestions)
+
+
+@router.get(
+    "/counts",
+    response_model=ArticleCountsResponse,
+    summary="Get article counts",
+    description="Number of unread, favorite and archived articles.",
+)
+def get_article_counts(
+    user: UserSession = Depends(require_api_auth),
+    session: Session = Depends(get_read_session, scope="function"),
+) -> ArticleCountsResponse:
+    """
+    Get the current user's article totals.
+
+    Args:
+        user: Authenticated user from dependency.
+        session: Database session.
+
+    Returns:
+        Totals matching the dashboard tabs.
+    """
+    return counts_service.get_counts(session, user.id)
+
+
 @router.post(
     "",
     response_model=ArticleResponse,
@@ -60,7 +183,7 @@ def list_articles(
 def create_article(
     article_in: ArticleCreate,
     user: UserSession = Depends(require_api_auth),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ) -> ArticleResponse:
     """
     Create a new article from a URL.
@@ -89,11 +212,101 @@ def create_article(
         content=extracted.content,
         excerpt=extracted.excerpt,
         image_url=extracted.image_url,
+        content_html=extracted.content_html,
     )
 
     return ArticleResponse.model_validate(article)
 
 
+@router.post(
+    "/bulk",
+    response_model=ArticleBulkResponse,
+    summary="Bulk update articles",
+    description="Archive, favorite, tag, or delete many articles at once.",
+)
+def bulk_update_articles(
+    bulk_in: ArticleBulkUpdate,
+    user: UserSession = Depends(require_api_auth),
+    session: Session = Depends(get_session, scope="function"),
+) -> ArticleBulkResponse:
+    """
+    Apply an action to a set of articles in a single statement.
+
+    Articles can be selected by ID list, by filter (e.g. all archived
+    articles older than 30 days), by tag, or a combination.
+
+    Args:
+        bulk_in: Action and article selectors.
+        user: Authenticated user from dependency.
+        session: Database session.
+
+    Returns:
+        The action and number of articles affected.
+    """
+    count = article_service.bulk_update_articles(
+        session,
+        user.id,
+        bulk_in.action,
+        article_ids=bulk_in.ids,
+        filter_type=bulk_in.filter,
+        older_than_days=bulk_in.older_than_days,
+        tagged=bulk_in.tagged,
+        tag=bulk_in.tag,
+    )
+    return ArticleBulkResponse(action=bulk_in.action, count=count)
+
+
+@router.post(
+    "/lookup",
+    response_model=ArticleLookupResponse,
+    summary="Look up articles",
+    description=(
+        "Get many articles by ID in one request, optionally only some fields. "
+        "Unselected fields are left out of the response."
+    ),
+)
+def lookup_articles(
+    request: Request,
+    lookup_in: ArticleLookup,
+    user: UserSession = Depends(require_api_auth),
+    session: Session = Depends(get_read_session, scope="function"),
+) -> ArticleLookupResponse:
+    """
+    Get many articles by ID with a single query.
+
+    Replaces one GET /articles/{id} per article for clients holding a
+    set of IDs, e.g. after a sync. Without content among the selected
+    fields, bodies are not even loaded.
+
+    Args:
+        request: Incoming request (for Accept).
+        lookup_in: Article IDs and optional field selection.
+        user: Authenticated user from dependency.
+        session: Database session.
+
+    Returns:
+        Articles found in request order, and the IDs that were not found
+        or belong to other users.
+    """
+    article_ids = list(dict.fromkeys(lookup_in.ids))
+    fields = None if lookup_in.fields is None else frozenset({"id", *lookup_in.fields})
+    articles = article_service.lookup_articles(
+        session,
+        user.id,
+        article_ids,
+        with_content=fields is None or "content" in fields,
+    )
+    found = {article.id for article in articles}
+    return schema_response(
+        request,
+        lookup_response_schema(fields),
+        {
+            "articles": articles,
+            "missing": [i for i in article_ids if i not in found],
+        },
+    )
+
+
 @router.get(
     "/{article_id}",
     response_model=ArticleResponse,
@@ -101,47 +314,72 @@ def create_article(
     description="Get a specific article by ID.",
 )
 def get_article(
+    request: Request,
     article_id: int,
     user: UserSession = Depends(require_api_auth),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session, scope="function"),
 ) -> ArticleResponse:
     """
     Get a specific article.
 
+    Served from the in-process article cache when possible, so a hit
+    needs neither a query nor serialization, and a current If-None-Match
+    gets 304 from the cached version alone; the ETag also covers the
+    negotiated media type. Compressed copies are cached
+    with the JSON, so a hit is not recompressed either.
+
     Args:
+        request: Incoming request (for If-None-Match and Accept).
         article_id: ID of the article.
         user: Authenticated user from dependency.
         session: Database session.
 
     Returns:
-        The requested article.
+        The requested article, or 304 if unchanged.
 
     Raises:
         HTTPException: 404 if article not found or not owned by user.
     """
-    article = article_service.get_article_by_id(session, article_id, user.id)
-    if not article:
+    cached = article_service.get_article_payload(session, article_id, user.id)
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Article not found",
         )
-    return ArticleResponse.model_validate(article)
+    version, payload, variants = cached
+    etag = weak_etag(user.id, article_id, version, negotiated_media_type(request))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    if wants_msgpack(request):
+        # Re-encoded by NegotiatedRoute; the cached copies are JSON.
+        response = Response(payload, media_type="application/json")
+    else:
+        response = precompressed_response(
+            request,
+            payload,
+            variants,
+            media_type="application/json",
+            minimum_size=get_settings().compression_minimum_size,
+        )
+    set_etag(response, etag)
+    return response
 
 
 @router.patch(
     "/{article_id}",
     response_model=ArticleResponse,
     summary="Update article",
-    description="Update article fields (favorite/archive status).",
+    description="Update article fields (favorite/archive/read status, tags).",
 )
 def update_article(
     article_id: int,
     article_in: ArticleUpdate,
     user: UserSession = Depends(require_api_auth),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ) -> ArticleResponse:
     """
-    Update an article's favorite or archive status.
+    Update an article's favorite, archive or read status, or its tags.
 
     Args:
         article_id: ID of the article.
@@ -155,26 +393,49 @@ def update_article(
     Raises:
         HTTPException: 404 if article not found or not owned by user.
     """
-    # Check article exists
-    article = article_service.get_article_by_id(session, article_id, user.id)
+    # Apply all updates in one UPDATE ... RETURNING statement
+    article = article_service.update_article(
+        session,
+        article_id,
+        user.id,
+        is_favorite=article_in.is_favorite,
+        is_archived=article_in.is_archived,
+        is_read=article_in.is_read,
+        tags=article_in.tags,
+    )
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Article not found",
         )
+    return ArticleResponse.model_validate(article)
 
-    # Apply updates - toggle if the desired state differs from current
-    if article_in.is_favorite is not None:
-        if article.is_favorite != article_in.is_favorite:
-            article_service.toggle_favorite(session, article_id, user.id)
 
-    if article_in.is_archived is not None:
-        if article.is_archived != article_in.is_archived:
-            article_service.toggle_archive(session, article_id, user.id)
+@router.put(
+    "/{article_id}/progress",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Report reading progress",
+    description="Record how far the user has read; written in periodic batches.",
+)
+def report_progress(
+    article_id: int,
+    progress_in: ArticleProgress,
+    user: UserSession = Depends(require_api_auth),
+) -> None:
+    """
+    Buffer the user's reading position for an article.
 
-    # Return updated article
-    updated = article_service.get_article_by_id(session, article_id, user.id)
-    return ArticleResponse.model_validate(updated)
+    Nothing is read or written here; the position is stored with the next
+    batch (see services.progress_service), and an article reaching the end
+    is marked read then. Positions for articles the user does not own are
+    discarded at that point, so no 404 is raised.
+
+    Args:
+        article_id: ID of the article.
+        progress_in: Fraction of the article read.
+        user: Authenticated user from dependency.
+    """
+    progress_service.record_progress(user.id, article_id, progress_in.progress)
 
 
 @router.delete(
@@ -186,7 +447,7 @@ def update_article(
 def delete_article(
     article_id: int,
     user: UserSession = Depends(require_api_auth),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ) -> None:
     """
     Delete an article.
@@ -0,0 +1,67 @@
+"""
+API v1 export routes - download a user's whole library.
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from api.routes.v1.deps import require_api_auth
+from core.database import get_streaming_session
+from schemas.user import UserSession
+from services import export_service
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+# Media type and file extension of each export format.
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "zip": ("application/zip", "zip"),
+}
+
+
+@router.get(
+    "",
+    summary="Export library",
+    description=(
+        "Stream every article: NDJSON with one article object per line, "
+        "or a ZIP of HTML files."
+    ),
+    response_class=StreamingResponse,
+)
+def export_library(
+    format: Literal["ndjson", "zip"] = "ndjson",
+    user: UserSession = Depends(require_api_auth),
+    session: Session = Depends(get_streaming_session),
+) -> StreamingResponse:
+    """
+    Stream the current user's library as a download.
+
+    The session uses the request scope, so it stays open while the body
+    streams; articles are read and sent in batches (see
+    services.export_service).
+
+    Args:
+        format: 'ndjson' (default) or 'zip'.
+        user: Authenticated user from dependency.
+        session: Database session for the duration of the stream.
+
+    Returns:
+        Streaming response with a Content-Disposition attachment.
+    """
+    media_type, extension = EXPORT_FORMATS[format]
+    if format == "zip":
+        chunks = export_service.zip_chunks(session, user.id)
+    else:
+        chunks = export_service.ndjson_chunks(session, user.id)
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="timstapaper-export.{extension}"'
+            )
+        },
+    )
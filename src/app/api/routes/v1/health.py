@@ -4,7 +4,10 @@ API v1 health routes - Health check endpoint.
 
 from fastapi import APIRouter
 
-router = APIRouter(tags=["health"])
+from core.cache import cache_stats
+from core.serialization import NegotiatedRoute
+
+router = APIRouter(tags=["health"], route_class=NegotiatedRoute)
 
 
 @router.get(
@@ -20,3 +23,21 @@ async def health() -> dict:
         Status indicating the API is healthy.
     """
     return {"status": "healthy"}
+
+
+@router.get(
+    "/health/caches",
+    summary="Cache metrics",
+    description="Size and hit, miss and eviction counts of this worker's caches.",
+)
+async def caches() -> dict:
+    """
+    Report in-process cache counters.
+
+    Each uvicorn worker has its own caches, so the numbers describe only
+    the worker that answered.
+
+    Returns:
+        Stats per named cache.
+    """
+    return cache_stats()
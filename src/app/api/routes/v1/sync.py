@@ -0,0 +1,72 @@
+"""
+API v1 sync routes - delta sync for offline and mobile clients.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlmodel import Session
+
+from api.routes.v1.deps import require_api_auth
+from core.database import get_session
+from core.serialization import NegotiatedRoute, schema_response
+from schemas.sync import MAX_SYNC_LIMIT, SyncResponse
+from schemas.user import UserSession
+from services import sync_service
+
+router = APIRouter(prefix="/sync", tags=["sync"], route_class=NegotiatedRoute)
+
+
+@router.get(
+    "",
+    response_model=SyncResponse,
+    summary="Sync changes",
+    description="Articles changed and deleted since a sync token, one page at a time.",
+)
+def sync(
+    request: Request,
+    since: str | None = Query(None, description="Token from the previous sync"),
+    limit: int = Query(100, ge=1, le=MAX_SYNC_LIMIT),
+    user: UserSession = Depends(require_api_auth),
+    session: Session = Depends(get_session, scope="function"),
+) -> SyncResponse:
+    """
+    Get the user's changes since a sync token.
+
+    Omit since for the initial sync. Reads the primary rather than the
+    replica: a lagging replica could hand out a token past changes it has
+    not received yet, and the client would never see them.
+
+    Args:
+        request: Incoming request (for Accept).
+        since: Token from a previous response, or None.
+        limit: Maximum number of changed plus deleted items in this page.
+        user: Authenticated user from dependency.
+        session: Database session.
+
+    Returns:
+        Changed articles, deleted IDs and the token to sync from next.
+
+    Raises:
+        HTTPException: 400 if the token is malformed, 410 if it is too old
+            and the client must sync again without since.
+    """
+    try:
+        changed, deleted, next_token, has_more = sync_service.changes_since(
+            session, user.id, since, limit
+        )
+    except sync_service.SyncTokenExpired:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync token expired; sync again without since",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return schema_response(
+        request,
+        SyncResponse,
+        {
+            "changed": changed,
+            "deleted": deleted,
+            "next_token": next_token,
+            "has_more": has_more,
+        },
+    )
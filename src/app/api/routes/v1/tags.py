@@ -0,0 +1,42 @@
+"""
+API v1 tags routes - the user's article tags.
+"""
+
+from fastapi import APIRouter, Depends
+from sqlmodel import Session
+
+from api.routes.v1.deps import require_api_auth
+from core.database import get_read_session
+from core.serialization import NegotiatedRoute
+from schemas.tag import TagListResponse
+from schemas.user import UserSession
+from services import tag_service
+
+router = APIRouter(prefix="/tags", tags=["tags"], route_class=NegotiatedRoute)
+
+
+@router.get(
+    "",
+    response_model=TagListResponse,
+    summary="List tags",
+    description="All tags used on the user's articles, with article counts.",
+)
+def list_tags(
+    user: UserSession = Depends(require_api_auth),
+    session: Session = Depends(get_read_session, scope="function"),
+) -> TagListResponse:
+    """
+    List the current user's tags.
+
+    Counts are maintained as articles are tagged, so this does not scan
+    the user's articles. Use GET /api/v1/articles?tag=... to list the
+    articles carrying a tag.
+
+    Args:
+        user: Authenticated user from dependency.
+        session: Database session.
+
+    Returns:
+        Tags in alphabetical order with their article counts.
+    """
+    return TagListResponse(tags=tag_service.list_tags(session, user.id))
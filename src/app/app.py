@@ -3,15 +3,19 @@ Timstapaper - An Instapaper Clone
 Main FastAPI application initialization and configuration.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from api.routes import auth, pages
 from api.routes.v1 import router as api_v1_router
 from api.routes.v1 import health as health_router
+from core import invalidation
 from core.config import get_settings
-from core.database import init_db
-from fastapi import FastAPI
+from core.database import get_engine, init_db
+from core.http_compression import CompressionMiddleware
+from fastapi import FastAPI, Request
+from services import progress_service
 from starlette.middleware.sessions import SessionMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
@@ -26,8 +30,24 @@ async def lifespan(app: FastAPI):
     # Startup: Initialize database
     init_db()
     logger.info("Database initialized")
+    tasks = [
+        asyncio.create_task(
+            progress_service.flush_periodically(get_settings().progress_flush_seconds)
+        )
+    ]
+    # Keep this worker's caches coherent with writes made by the others
+    if get_engine().dialect.name == "postgresql":
+        tasks.append(asyncio.create_task(invalidation.listen(get_engine())))
     yield
-    # Shutdown: Cleanup (if needed)
+    # Shutdown: stop background tasks, then write reading progress still
+    # buffered in memory
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        progress_service.flush_pending()
+    except Exception:
+        logger.exception("Failed to write reading progress on shutdown")
     logger.info("Application shutdown")
 
 
@@ -46,12 +66,27 @@ def create_app() -> FastAPI:
     # Add proxy headers middleware (must be first to set scheme correctly)
     application.add_middleware(ProxyHeadersMiddleware, trusted_hosts=["*"])
 
+    @application.middleware("http")
+    async def server_timing(request: Request, call_next):
+        """Report how long the request held a database connection."""
+        response = await call_next(request)
+        db_seconds = getattr(request.state, "db_seconds", None)
+        if db_seconds is not None:
+            response.headers["Server-Timing"] = f"db;dur={db_seconds * 1000:.1f}"
+            logger.debug(f"{request.url.path} held a DB connection {db_seconds:.4f}s")
+        return response
+
     # Add session middleware
     application.add_middleware(
         SessionMiddleware,
         secret_key=settings.secret_key,
     )
 
+    # Outermost, so every response is compressed for clients that accept it
+    application.add_middleware(
+        CompressionMiddleware, minimum_size=settings.compression_minimum_size
+    )
+
     # Register routers
     application.include_router(auth.router)
     application.include_router(pages.router)
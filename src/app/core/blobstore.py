@@ -0,0 +1,132 @@
+"""
+Content-addressed file store for cold article bodies.
+
+Blobs are zstd-compressed and named by the SHA-256 of their plain text, so
+identical bodies are stored once and a key always refers to the same
+content. Files are fanned out by key prefix to keep directories small:
+
+    <root>/ab/cd/abcd...ef.zst
+"""
+
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from core.compression import compress_text, decompress_text
+from core.config import get_settings
+
+
+class BlobStore:
+    """Store and fetch compressed text blobs under a root directory."""
+
+    def __init__(self, root: str | Path):
+        """
+        Create a store rooted at a directory (created on first write).
+
+        Args:
+            root: Directory that holds the blobs, e.g. on the /data volume.
+        """
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        """Return the file path for a key."""
+        return self.root / key[:2] / key[2:4] / f"{key}.zst"
+
+    def put(self, text: str) -> str:
+        """
+        Store text and return its key.
+
+        Writes to a temporary file and renames it into place, so readers
+        never see a partial blob. Storing existing content only refreshes
+        the blob's modification time, which marks it as in use for
+        pruning (see begin_delete).
+
+        Args:
+            text: Plain text to store.
+
+        Returns:
+            Hex SHA-256 of the text.
+        """
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self.path(key)
+        try:
+            os.utime(path)
+            return key
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compress_text(text))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return key
+
+    def get(self, key: str) -> str:
+        """
+        Fetch the text stored under key.
+
+        Raises:
+            FileNotFoundError: If no blob exists for the key.
+        """
+        return decompress_text(self.path(key).read_bytes())
+
+    def delete(self, key: str) -> None:
+        """Remove a blob if present."""
+        self.path(key).unlink(missing_ok=True)
+
+    def keys(self):
+        """Yield (key, modification time) for every stored blob."""
+        for path in self.root.glob("*/*/*.zst"):
+            yield path.stem, path.stat().st_mtime
+
+    def begin_delete(self, key: str) -> float | None:
+        """
+        Set a blob aside for deletion, so it can no longer be read or refreshed.
+
+        A put() of the same text after this writes a new blob. Finish with
+        finish_delete() or undo with cancel_delete().
+
+        Returns:
+            The blob's modification time, or None if it does not exist.
+        """
+        path = self.path(key)
+        try:
+            os.replace(path, self._deleting_path(key))
+        except FileNotFoundError:
+            return None
+        return self._deleting_path(key).stat().st_mtime
+
+    def finish_delete(self, key: str) -> None:
+        """Remove a blob set aside by begin_delete()."""
+        self._deleting_path(key).unlink(missing_ok=True)
+
+    def cancel_delete(self, key: str) -> None:
+        """Put a blob set aside by begin_delete() back in place."""
+        os.replace(self._deleting_path(key), self.path(key))
+
+    def cancel_pending_deletes(self) -> int:
+        """Put back blobs left set aside by an interrupted deletion."""
+        restored = 0
+        for path in self.root.glob("*/*/*.deleting"):
+            os.replace(path, path.with_suffix(".zst"))
+            restored += 1
+        return restored
+
+    def _deleting_path(self, key: str) -> Path:
+        """Return where begin_delete() sets a blob aside."""
+        return self.path(key).with_suffix(".deleting")
+
+
+@lru_cache
+def get_blob_store() -> BlobStore:
+    """Return the cold-tier blob store configured by blob_store_path."""
+    return BlobStore(get_settings().blob_store_path)
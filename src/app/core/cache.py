@@ -0,0 +1,107 @@
+"""
+In-process caching utilities.
+
+Provides a small thread-safe LRU cache with per-entry expiry. Each uvicorn
+worker has its own instances, so cached values must be safe to serve for
+up to their TTL after the underlying data changes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+# Named caches, for metrics (see cache_stats()).
+CACHES: dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a fixed time-to-live.
+
+    Sync FastAPI routes run in a threadpool, so all access is guarded by a
+    lock. Hit, miss and eviction counts are kept for metrics.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, name: str | None = None):
+        """
+        Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries before the least recently
+                used one is evicted.
+            ttl: Seconds an entry stays valid after it is set.
+            name: Register the cache under this name in CACHES, so its
+                counters show up in cache_stats().
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if name is not None:
+            CACHES[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every key for which predicate returns True; return the count."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones not yet purged."""
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        """Return size and hit/miss/eviction counters."""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Return stats() of every named cache in this process."""
+    return {name: cache.stats() for name, cache in sorted(CACHES.items())}
@@ -0,0 +1,66 @@
+"""
+Zstandard compression for stored article bodies.
+
+Articles are individually small, so a dictionary trained on a sample of
+existing bodies is used when available: it holds the vocabulary shared
+across articles once, instead of every compressed body repeating it.
+"""
+
+import zstandard
+
+# Compression level; zstd's default balances speed and ratio well for text.
+COMPRESSION_LEVEL = 3
+
+# Target dictionary size in bytes (zstd's recommended ~110 KB).
+DICTIONARY_SIZE = 112_640
+
+
+def compress_text(text: str, dictionary: bytes | None = None) -> bytes:
+    """
+    Compress text to a zstd frame.
+
+    Args:
+        text: Text to compress.
+        dictionary: Raw trained dictionary, or None to compress without one.
+
+    Returns:
+        Compressed bytes.
+    """
+    dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+    compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dict_data)
+    return compressor.compress(text.encode("utf-8"))
+
+
+def decompress_text(data: bytes, dictionary: bytes | None = None) -> str:
+    """
+    Decompress a frame produced by compress_text().
+
+    Args:
+        data: Compressed bytes.
+        dictionary: The dictionary the frame was compressed with, if any.
+
+    Returns:
+        The original text.
+    """
+    dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+    decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+    return decompressor.decompress(data).decode("utf-8")
+
+
+def train_dictionary(samples: list[str], size: int = DICTIONARY_SIZE) -> bytes:
+    """
+    Train a compression dictionary from sample texts.
+
+    Args:
+        samples: Representative article bodies; zstd needs a few hundred
+            to produce a useful dictionary.
+        size: Maximum dictionary size in bytes.
+
+    Returns:
+        Raw dictionary bytes.
+
+    Raises:
+        zstandard.ZstdError: If the samples are too few or too small.
+    """
+    encoded = [sample.encode("utf-8") for sample in samples]
+    return zstandard.train_dictionary(size, encoded).as_bytes()
@@ -0,0 +1,67 @@
+"""
+Conditional GET helpers (ETag / If-None-Match).
+
+Routes derive a weak ETag from a cheap version check, such as an
+article's updated_at, before loading anything heavy. If the client
+already holds that version the route answers 304 Not Modified without
+loading or serializing the body. Responses are marked private and
+no-cache, so browsers keep them but revalidate on every use, including
+back-button navigation.
+"""
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: object) -> str:
+    """
+    Build a weak ETag from the values that determine a representation.
+
+    Args:
+        parts: Version components, e.g. user ID and updated_at.
+
+    Returns:
+        Quoted weak entity tag, e.g. W/"3f2a...".
+    """
+    key = "|".join(str(part) for part in parts).encode()
+    return f'W/"{hashlib.blake2b(key, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check If-None-Match against an ETag using weak comparison.
+
+    Args:
+        request: Incoming request.
+        etag: Current ETag of the resource.
+
+    Returns:
+        True if the client's cached copy is current.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response confirming the client's copy."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach validator headers to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
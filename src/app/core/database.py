@@ -1,53 +1,229 @@
 """
 Database connection and initialization.
 
-Provides database connection management using SQLModel with PostgreSQL.
+Provides database connection management using SQLModel with PostgreSQL,
+or SQLite for single-node installs (see core.sqlite). Writes always go to
+the primary; read-only routes can be served from an
+optional replica (see get_read_session).
 """
 
 import logging
+import time
 
+from fastapi import Depends, Request
+from sqlalchemy import event, inspect
 from sqlmodel import Session, SQLModel, create_engine
 
+from core import sqlite
 from core.config import get_settings
+from core.migrations import PendingMigrationsError, pending_migrations
 
 logger = logging.getLogger(__name__)
 
 engine = None
+replica_engine = None
+
+# Session key holding the time of the user's last committed write.
+LAST_WRITE_KEY = "db_last_write_at"
+
+
+def _create_engine(url: str):
+    """Create an engine with the application's pool settings."""
+    settings = get_settings()
+    if url.startswith("sqlite"):
+        # Connections are shared across the threadpool, one at a time.
+        new_engine = create_engine(
+            url,
+            echo=settings.debug,
+            connect_args={"check_same_thread": False},
+        )
+        sqlite.configure_engine(new_engine)
+        return new_engine
+
+    return create_engine(
+        url,
+        echo=settings.debug,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+    )
 
 
 def get_engine():
     """Get or create the database engine (singleton)."""
     global engine
     if engine is None:
-        settings = get_settings()
-        engine = create_engine(
-            settings.database_url,
-            echo=settings.debug,
-            pool_size=5,
-            max_overflow=10,
-            pool_pre_ping=True,
-        )
+        engine = _create_engine(get_settings().database_url)
     return engine
 
 
-def init_db() -> None:
+def get_replica_engine():
+    """Get or create the read replica engine, or None if not configured."""
+    global replica_engine
+    settings = get_settings()
+    if replica_engine is None and settings.database_replica_url:
+        replica_engine = _create_engine(settings.database_replica_url)
+    return replica_engine
+
+
+def init_db(check_migrations: bool = True) -> None:
     """
     Initialize database schema.
 
     Creates all tables defined in SQLModel models.
     Safe to call multiple times - only creates tables that don't exist.
+
+    Args:
+        check_migrations: Refuse to start when migrations are pending;
+            the migration command itself turns this off.
+
+    Raises:
+        PendingMigrationsError: If check_migrations is set and the
+            database is missing schema changes.
     """
     # Import models to register them with SQLModel.metadata
-    from core.models import Article, User  # noqa: F401
+    from core.models import (  # noqa: F401
+        Article,
+        ArticleCounts,
+        ArticleTombstone,
+        ContentDictionary,
+        User,
+        UserTag,
+    )
+
+    engine = get_engine()
+    scheme = get_settings().article_partitioning
+    if scheme and engine.dialect.name == "postgresql":
+        _create_partitioned_schema(engine, scheme)
+    SQLModel.metadata.create_all(engine)
+
+    # Schema changes to existing tables are not applied here: they can lock
+    # or rewrite large tables and every worker would race to run them. Nor
+    # is it safe to serve on the old schema, so fail the rollout instead.
+    pending = pending_migrations(engine) if check_migrations else []
+    if pending:
+        raise PendingMigrationsError(
+            f"Database is missing {', '.join(pending)}; "
+            "run `python -m core.migrations` to apply pending migrations"
+        )
 
-    SQLModel.metadata.create_all(get_engine())
     logger.info("Database schema initialized")
 
 
-def get_session():
-    """FastAPI dependency that provides a database session."""
+def _create_partitioned_schema(engine, scheme: str) -> None:
+    """Create a new database's article table partitioned (see core.partitioning)."""
+    from core.models import Article
+    from core.partitioning import create_partitioned_article
+
+    with engine.begin() as connection:
+        if inspect(connection).has_table("article"):
+            return
+        # Tables article references must exist first.
+        others = [
+            t for t in SQLModel.metadata.sorted_tables if t is not Article.__table__
+        ]
+        SQLModel.metadata.create_all(connection, tables=others)
+        create_partitioned_article(
+            connection, scheme, get_settings().article_hash_partitions
+        )
+
+
+def get_session(request: Request):
+    """
+    FastAPI dependency that provides a primary database session.
+
+    The session is lazy: a pool connection is only checked out when the
+    first query runs, and is returned at commit or when the session
+    closes. Routes declare it with scope="function" so it closes as soon
+    as the route returns rather than after the response has been sent.
+
+    Commits record the time in the user's cookie session, which
+    get_read_session() uses to keep that user on the primary while the
+    replica catches up.
+    """
     session = Session(get_engine())
+    _track_connection_time(session, request)
+
+    @event.listens_for(session, "after_commit")
+    def _record_write(session):
+        request.session[LAST_WRITE_KEY] = time.time()
+
     try:
         yield session
     finally:
         session.close()
+
+
+def get_read_session(
+    request: Request, primary: Session = Depends(get_session, scope="function")
+):
+    """
+    FastAPI dependency that provides a session for read-only routes.
+
+    Uses the replica when one is configured, unless the user committed a
+    write within replica_sticky_seconds (read-your-writes). Otherwise it
+    returns the primary session, which opens no connection until used.
+    Replica sessions have session.info["read_only"] set so services can
+    skip opportunistic writes.
+    """
+    replica = _replica_for(request)
+    if replica is None:
+        yield primary
+        return
+
+    session = Session(replica, info={"read_only": True})
+    _track_connection_time(session, request)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_streaming_session(request: Request):
+    """
+    FastAPI dependency that provides a read session for streamed responses.
+
+    Routes declare it with the default (request) scope, so the session stays
+    open until a StreamingResponse has sent its last chunk. It picks the
+    replica like get_read_session(), but opens its own primary session
+    instead of sharing get_session(), which closes when the route returns.
+    """
+    replica = _replica_for(request)
+    if replica is None:
+        session = Session(get_engine())
+    else:
+        session = Session(replica, info={"read_only": True})
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _replica_for(request: Request):
+    """Return the replica engine unless the user must read the primary."""
+    replica = get_replica_engine()
+    last_write = request.session.get(LAST_WRITE_KEY, 0)
+    sticky = time.time() - last_write < get_settings().replica_sticky_seconds
+    return None if sticky else replica
+
+
+def _track_connection_time(session: Session, request: Request) -> None:
+    """
+    Add the time session holds a connection to request.state.db_seconds.
+
+    A session holds a pool connection from the start of each transaction
+    to its commit, rollback or close. The total is reported in the
+    Server-Timing response header by the app's timing middleware.
+    """
+    request.state.db_seconds = getattr(request.state, "db_seconds", 0.0)
+
+    @event.listens_for(session, "after_begin")
+    def _checked_out(session, transaction, connection):
+        session.info.setdefault("db_checkout_at", time.perf_counter())
+
+    @event.listens_for(session, "after_transaction_end")
+    def _released(session, transaction):
+        started = session.info.get("db_checkout_at")
+        if transaction.parent is None and started is not None:
+            del session.info["db_checkout_at"]
+            request.state.db_seconds += time.perf_counter() - started
@@ -0,0 +1,230 @@
+"""
+Negotiated HTTP response compression (zstd or gzip).
+
+CompressionMiddleware compresses responses whose client sends a matching
+Accept-Encoding, preferring zstd, which compresses text about as well as
+gzip at a fraction of the CPU. Bodies under a size threshold, already
+encoded responses and formats that are compressed already are sent as
+they are. Streamed bodies are compressed chunk by chunk and each chunk is
+flushed, so clients receive data as soon as the app yields it.
+
+Routes serving cached, immutable bodies can use precompressed_response()
+to compress once per cached body instead of once per request; the
+middleware leaves such responses alone.
+"""
+
+import zlib
+from collections.abc import MutableMapping
+
+import zstandard
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Supported codings in order of preference.
+ENCODINGS = ("zstd", "gzip")
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Content types that are already compressed, or must not be buffered.
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "application/zip",
+    "application/gzip",
+    "application/zstd",
+    "image/",
+    "video/",
+    "audio/",
+)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """
+    Pick the preferred supported coding a client accepts.
+
+    Args:
+        accept_encoding: Accept-Encoding header value, possibly empty.
+
+    Returns:
+        'zstd', 'gzip', or None to send the body unencoded.
+    """
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for coding in ENCODINGS:
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def compress(encoding: str, body: bytes) -> bytes:
+    """Compress a complete body with the given coding."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return _GzipStream().compress(body, final=True)
+
+
+def precompressed_response(
+    request: Request,
+    body: bytes,
+    variants: MutableMapping[str, bytes],
+    media_type: str,
+    minimum_size: int,
+) -> Response:
+    """
+    Build a response from a cached body, reusing its compressed copies.
+
+    Args:
+        request: Incoming request (for Accept-Encoding).
+        body: Uncompressed body.
+        variants: Compressed copies of body by coding, stored alongside it
+            in a cache; a missing coding is compressed and added here.
+        media_type: Content type of body.
+        minimum_size: Bodies smaller than this are sent uncompressed.
+
+    Returns:
+        Response with Content-Encoding set when a copy was used.
+    """
+    if len(body) < minimum_size:
+        return Response(body, media_type=media_type)
+
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = negotiate(request.headers.get("accept-encoding", ""))
+    if encoding is None:
+        return Response(body, media_type=media_type, headers=headers)
+
+    data = variants.get(encoding)
+    if data is None:
+        data = variants[encoding] = compress(encoding, body)
+    headers["Content-Encoding"] = encoding
+    return Response(data, media_type=media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses for clients that accept it.
+
+    Args:
+        app: Wrapped application.
+        minimum_size: Complete bodies smaller than this many bytes are sent
+            uncompressed; streamed bodies are always compressed.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _Responder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    """Compresses one response as its messages pass through."""
+
+    def __init__(self, send: Send, encoding: str | None, minimum_size: int) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._stream: _GzipStream | _ZstdStream | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        """Pass one ASGI message on, compressing body messages if chosen."""
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            self._passthrough = (
+                "content-encoding" in headers
+                or message["status"] < 200
+                or message["status"] in (204, 304)
+                or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            # e.g. http.response.pathsend: file bodies are sent as they are.
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start is not None:
+            # First body message: decide, then send the start message.
+            if not self._passthrough and (more_body or len(body) >= self._minimum_size):
+                headers = MutableHeaders(raw=self._start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if self._encoding is not None:
+                    self._stream = _STREAMS[self._encoding]()
+                    headers["Content-Encoding"] = self._encoding
+                    if "content-length" in headers:
+                        del headers["content-length"]
+                    body = self._stream.compress(body, final=not more_body)
+                    if not more_body:
+                        headers["Content-Length"] = str(len(body))
+                    message = {**message, "body": body}
+            await self._flush_start()
+        elif self._stream is not None:
+            message = {
+                **message,
+                "body": self._stream.compress(body, final=not more_body),
+            }
+
+        await self._send(message)
+
+    async def _flush_start(self) -> None:
+        """Send the held start message, once."""
+        if self._start is not None:
+            start, self._start = self._start, None
+            await self._send(start)
+
+
+class _GzipStream:
+    """Incremental gzip encoder, flushed at each chunk boundary."""
+
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+class _ZstdStream:
+    """Incremental zstd encoder, flushed at each chunk boundary."""
+
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+_STREAMS = {"gzip": _GzipStream, "zstd": _ZstdStream}
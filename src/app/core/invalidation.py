@@ -0,0 +1,209 @@
+"""
+Cross-process cache invalidation over PostgreSQL LISTEN/NOTIFY.
+
+Each uvicorn worker (and each replica of the app) keeps its own in-process
+caches. A mutation publishes an event in its own transaction with
+pg_notify(), so PostgreSQL delivers it to every listening process when the
+transaction commits, and never if it rolls back. The publishing process
+applies the event itself right after the commit, without waiting for the
+round trip.
+
+Services subscribe a handler per event kind:
+
+    invalidation.subscribe("article", evict_articles)
+
+and each worker runs listen() in its lifespan. If the listening connection
+drops, events may have been missed, so every subscribed cache is reset
+when it reconnects. SQLite has no NOTIFY; there, events only reach the
+publishing process.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "timstapaper_invalidate"
+
+# NOTIFY payloads must stay under 8000 bytes; larger ID lists are dropped
+# and the event invalidates everything of its kind instead.
+MAX_PAYLOAD = 7500
+
+# Seconds to wait before reconnecting a dropped listener.
+RECONNECT_SECONDS = 1.0
+
+# A quiet listener checks its connection this often, so a silently
+# dropped one is noticed rather than waited on forever.
+HEALTHCHECK_SECONDS = 30.0
+
+# Handler(user_id, ids) per event kind. ids None means all of the user's
+# entries; user_id None means every entry of the kind.
+Handler = Callable[[int | None, list[int] | None], None]
+_handlers: dict[str, list[Handler]] = {}
+
+# Key in Session.info holding events to apply locally after commit.
+_PENDING = "invalidation_events"
+
+
+def subscribe(kind: str, handler: Handler) -> None:
+    """
+    Register a handler for events of a kind.
+
+    Args:
+        kind: Event kind, e.g. 'article'.
+        handler: Called with (user_id, ids). ids is None when all of the
+            user's entries must go, and user_id is None as well when every
+            entry of the kind must go.
+    """
+    _handlers.setdefault(kind, []).append(handler)
+
+
+def publish(
+    session: Session,
+    kind: str,
+    user_id: int | None,
+    ids: Iterable[int] | None = None,
+    notified: bool = False,
+) -> None:
+    """
+    Announce a change in the session's transaction (caller commits).
+
+    Args:
+        session: Session whose transaction makes the change.
+        kind: Event kind, e.g. 'article'.
+        user_id: ID of the user whose data changed, or None for every
+            user's (ids must then be None as well).
+        ids: IDs of the changed objects, or None for all of the user's.
+        notified: The statement making the change already selected
+            notification() for this event; only apply it locally.
+    """
+    ids = None if ids is None else list(ids)
+    session.info.setdefault(_PENDING, []).append((kind, user_id, ids))
+    if notified or session.get_bind().dialect.name != "postgresql":
+        return
+    session.execute(select(notification(kind, user_id, ids)))
+
+
+def notification(kind: str, user_id: int | None, ids: Iterable[int] | None = None):
+    """
+    pg_notify() call sending an event to other processes (PostgreSQL).
+
+    Select it in the statement making the change to save publish() a round
+    trip, then call publish() with notified=True.
+
+    Args:
+        kind: Event kind, e.g. 'article'.
+        user_id: ID of the user whose data changed, or None for every user's.
+        ids: IDs of the changed objects, or None for all of the user's.
+
+    Returns:
+        SQL function expression.
+    """
+    ids = None if ids is None else list(ids)
+    payload = json.dumps({"kind": kind, "user_id": user_id, "ids": ids})
+    if len(payload) > MAX_PAYLOAD:
+        payload = json.dumps({"kind": kind, "user_id": user_id, "ids": None})
+    return func.pg_notify(CHANNEL, payload)
+
+
+def dispatch(kind: str, user_id: int | None, ids: list[int] | None) -> None:
+    """Run the handlers subscribed to kind, logging rather than raising."""
+    for handler in _handlers.get(kind, []):
+        try:
+            handler(user_id, ids)
+        except Exception:
+            logger.exception(f"Invalidation handler for {kind} failed")
+
+
+def reset_all() -> None:
+    """Invalidate everything every handler covers (after missed events)."""
+    for kind in _handlers:
+        dispatch(kind, None, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    """Apply this session's events locally once they are committed."""
+    for kind, user_id, ids in session.info.pop(_PENDING, []):
+        dispatch(kind, user_id, ids)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction: SessionTransaction) -> None:
+    """Forget events of a transaction that ended without committing."""
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+async def listen(engine: Engine) -> None:
+    """
+    Apply events published by other processes until cancelled.
+
+    Holds one connection outside the engine's pool, woken by the event
+    loop when PostgreSQL delivers a notification.
+
+    Args:
+        engine: PostgreSQL engine of the primary database.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        connection = None
+        try:
+            connection = await asyncio.to_thread(_connect, engine)
+            # Anything published while we were not listening is lost.
+            reset_all()
+            wakeup = asyncio.Event()
+            loop.add_reader(connection.fileno(), wakeup.set)
+            try:
+                while True:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), HEALTHCHECK_SECONDS)
+                    except TimeoutError:
+                        await asyncio.to_thread(_ping, connection)
+                    wakeup.clear()
+                    connection.poll()
+                    while connection.notifies:
+                        _receive(connection.notifies.pop(0).payload)
+            finally:
+                loop.remove_reader(connection.fileno())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Invalidation listener failed; reconnecting")
+            await asyncio.sleep(RECONNECT_SECONDS)
+        finally:
+            if connection is not None:
+                connection.close()
+
+
+def _connect(engine: Engine):
+    """Open an autocommit DBAPI connection, outside the pool, on CHANNEL."""
+    args, kwargs = engine.dialect.create_connect_args(engine.url)
+    connection = engine.dialect.connect(*args, **kwargs)
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {CHANNEL}")
+    return connection
+
+
+def _ping(connection) -> None:
+    """Round-trip a query, raising if the connection is gone."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def _receive(payload: str) -> None:
+    """Dispatch one NOTIFY payload."""
+    try:
+        message = json.loads(payload)
+        kind, user_id, ids = message["kind"], message["user_id"], message["ids"]
+    except (ValueError, KeyError, TypeError):
+        logger.warning(f"Ignoring malformed invalidation event: {payload!r}")
+        return
+    dispatch(kind, user_id, ids)
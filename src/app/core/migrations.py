@@ -0,0 +1,652 @@
+"""
+One-off schema migrations for existing databases.
+
+SQLModel.metadata.create_all() only creates missing tables, so columns and
+indexes added after a table exists are applied here instead. Fresh tables
+get the same objects from after_create hooks in core.models, where they are
+cheap because the table is empty.
+
+Migrations are idempotent and are NOT run at application startup: some of
+them rewrite or lock large tables, and every uvicorn worker would race to
+run them. Run them once per deployment instead, before the new release
+starts serving (the Kubernetes deployment does this in an init container,
+docker compose in its migrate service):
+
+    cd src/app && python -m core.migrations
+
+The application refuses to start while migrations are pending (see
+core.database.init_db), since its queries would fail on the old schema.
+"""
+
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from core import sqlite
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration used for the article search vector.
+SEARCH_CONFIG = "english"
+
+SEARCH_VECTOR_DDL = (
+    "ALTER TABLE article ADD COLUMN IF NOT EXISTS search_vector tsvector"
+)
+
+# The search vector is maintained on write, weighted so title matches rank
+# above excerpt matches above body matches. The body is indexed from
+# content while it is stored plain; once it moves to content_zstd or the
+# cold tier (content is NULL), the body lexemes already in the vector are
+# kept. Writers storing a new body compressed pass its lexemes in
+# search_vector (see content_service.index_body).
+SEARCH_TRIGGER_DDL = [
+    f"""CREATE OR REPLACE FUNCTION article_search_vector() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.excerpt, '')), 'B') ||
+        CASE WHEN NEW.content IS NOT NULL
+            THEN setweight(to_tsvector('{SEARCH_CONFIG}', NEW.content), 'C')
+            ELSE ts_filter(coalesce(NEW.search_vector, ''), '{{c}}')
+        END;
+    RETURN NEW;
+END
+$$""",
+    (
+        "CREATE OR REPLACE TRIGGER article_search_vector "
+        "BEFORE INSERT OR UPDATE OF title, excerpt, content, search_vector "
+        "ON article FOR EACH ROW EXECUTE FUNCTION article_search_vector()"
+    ),
+]
+
+SEARCH_INDEX_NAME = "ix_article_user_search"
+
+TAG_INDEX_NAME = "ix_article_user_tags"
+
+# Partial index for the "unread" filter, declared on the model.
+UNREAD_INDEX_NAME = "ix_article_user_unread"
+
+# Delta sync indexes over each user's changes and deletes in change order,
+# declared on the models, and the updated_at index they replace.
+SYNC_INDEX_NAME = "ix_article_user_change"
+TOMBSTONE_SYNC_INDEX_NAME = "ix_article_tombstone_user_change"
+OLD_SYNC_INDEXES = {
+    "ix_article_user_updated": "article",
+    "ix_article_tombstone_user_deleted": "article_tombstone",
+}
+
+# Delta sync orders changes by the ID of the transaction that wrote them,
+# then by a sequence (see services.sync_service). Both are assigned by the
+# database on insert and whenever a writer bumps updated_at, so the order
+# does not depend on the app's clock or on how long a commit takes.
+CHANGE_SEQUENCE = "article_change_seq"
+
+CHANGE_TRIGGER_DDL = [
+    f"CREATE SEQUENCE IF NOT EXISTS {CHANGE_SEQUENCE}",
+    f"""CREATE OR REPLACE FUNCTION stamp_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    NEW.change_seq := nextval('{CHANGE_SEQUENCE}');
+    RETURN NEW;
+END
+$$""",
+]
+
+# Tables whose rows are stamped, and the writes that stamp them.
+CHANGE_TRIGGERS = {
+    "article": "INSERT OR UPDATE OF updated_at",
+    "article_tombstone": "INSERT",
+}
+
+# Lower-cased URL host without a leading "www.", for search-as-you-type.
+URL_HOST_DDL = (
+    "ALTER TABLE article ADD COLUMN IF NOT EXISTS url_host text "
+    "GENERATED ALWAYS AS (regexp_replace(lower(substring(url from "
+    "'^[A-Za-z][A-Za-z0-9+.-]*://(?:[^@/]*@)?([^/:?#]+)')), '^www\\.', '')) STORED"
+)
+
+# Trigram indexes serve both similarity (%>, <%) and ILIKE '%...%' lookups.
+TRIGRAM_INDEXES = {
+    "ix_article_title_trgm": "title gin_trgm_ops",
+    "ix_article_url_host_trgm": "url_host gin_trgm_ops",
+}
+
+
+def ensure_extension(connection: Connection, name: str) -> bool:
+    """
+    Create a PostgreSQL extension if the server ships it.
+
+    Runs in a savepoint inside a transaction, so a permission error does
+    not abort the surrounding DDL.
+
+    Args:
+        connection: Open database connection.
+        name: Extension name, e.g. 'btree_gin'.
+
+    Returns:
+        True if the extension is installed afterwards.
+    """
+    available = connection.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = :name"),
+        {"name": name},
+    ).first()
+    if not available:
+        return False
+
+    statement = text(f'CREATE EXTENSION IF NOT EXISTS "{name}"')
+    try:
+        if connection.get_execution_options().get("isolation_level") == "AUTOCOMMIT":
+            connection.execute(statement)
+        else:
+            with connection.begin_nested():
+                connection.execute(statement)
+    except DBAPIError as e:
+        logger.warning(f"Could not create extension {name}: {e}")
+        return False
+    return True
+
+
+def search_index_ddl(connection: Connection, concurrently: bool = False) -> str:
+    """
+    Build the CREATE INDEX statement for article search.
+
+    Every search filters on user_id as well as the tsquery. With btree_gin
+    both go into one GIN index, so a common term only yields the current
+    user's posting list instead of matching rows from every user and then
+    discarding them. Without btree_gin this falls back to a plain GIN index
+    on search_vector; the user_id btree index still narrows the results,
+    but ranking has to look at every user's matches first.
+
+    Args:
+        connection: Open database connection.
+        concurrently: Build without blocking writes (needs autocommit).
+
+    Returns:
+        SQL statement to execute.
+    """
+    columns = "user_id, search_vector"
+    if not ensure_extension(connection, "btree_gin"):
+        logger.warning("btree_gin unavailable; search index will not include user_id")
+        columns = "search_vector"
+    mode = "CONCURRENTLY " if concurrently else ""
+    return (
+        f"CREATE INDEX {mode}IF NOT EXISTS {SEARCH_INDEX_NAME} "
+        f"ON article USING GIN ({columns})"
+    )
+
+
+def tag_index_ddl(connection: Connection, concurrently: bool = False) -> str:
+    """
+    Build the CREATE INDEX statement for tag lookups.
+
+    Like the search index, it includes user_id when btree_gin is available,
+    so "articles tagged X" only visits the current user's matches.
+
+    Args:
+        connection: Open database connection.
+        concurrently: Build without blocking writes (needs autocommit).
+
+    Returns:
+        SQL statement to execute.
+    """
+    columns = "user_id, tags" if ensure_extension(connection, "btree_gin") else "tags"
+    mode = "CONCURRENTLY " if concurrently else ""
+    return (
+        f"CREATE INDEX {mode}IF NOT EXISTS {TAG_INDEX_NAME} "
+        f"ON article USING GIN ({columns})"
+    )
+
+
+def trigram_index_ddl(connection: Connection, concurrently: bool = False) -> list[str]:
+    """
+    Build CREATE INDEX statements for trigram suggest lookups.
+
+    Args:
+        connection: Open database connection.
+        concurrently: Build without blocking writes (needs autocommit).
+
+    Returns:
+        SQL statements to execute; empty if pg_trgm is unavailable, in which
+        case suggestions fall back to unindexed substring matching.
+    """
+    if not ensure_extension(connection, "pg_trgm"):
+        logger.warning("pg_trgm unavailable; suggest lookups will not be indexed")
+        return []
+    mode = "CONCURRENTLY " if concurrently else ""
+    return [
+        f"CREATE INDEX {mode}IF NOT EXISTS {name} ON article USING GIN ({expression})"
+        for name, expression in TRIGRAM_INDEXES.items()
+    ]
+
+
+def install_change_trigger(connection: Connection, table: str) -> None:
+    """Create or replace the trigger stamping a table's rows for delta sync."""
+    for statement in CHANGE_TRIGGER_DDL:
+        connection.execute(text(statement))
+    connection.execute(
+        text(
+            f"CREATE OR REPLACE TRIGGER {table}_change "
+            f"BEFORE {CHANGE_TRIGGERS[table]} ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION stamp_change()"
+        )
+    )
+
+
+def create_article_schema(connection: Connection) -> None:
+    """Add generated columns and indexes to a freshly created article table."""
+    connection.execute(text(SEARCH_VECTOR_DDL))
+    _install_search_trigger(connection)
+    install_change_trigger(connection, "article")
+    connection.execute(text(search_index_ddl(connection)))
+    connection.execute(text(URL_HOST_DDL))
+    for statement in trigram_index_ddl(connection):
+        connection.execute(text(statement))
+    connection.execute(text(tag_index_ddl(connection)))
+
+
+def migrate_search(connection: Connection) -> None:
+    """
+    Add full-text search to an existing article table.
+
+    Adding the column is catalog-only, but filling it rewrites every row,
+    so on a table without one this holds row locks for a while; run it in
+    a maintenance window on large installations. A search_vector that is
+    still a generated column keeps its values and becomes a regular one
+    maintained by the trigger; bodies compressed before that are missing
+    from it until `python -m jobs reindex-content` runs. The index is
+    then built CONCURRENTLY so writes are not blocked.
+    """
+    columns = {
+        column["name"]: column for column in inspect(connection).get_columns("article")
+    }
+    added = "search_vector" not in columns
+    if added:
+        logger.info("Adding article.search_vector")
+        connection.execute(text(SEARCH_VECTOR_DDL))
+    elif columns["search_vector"].get("computed"):
+        logger.info("Making article.search_vector a column maintained on write")
+        connection.execute(
+            text("ALTER TABLE article ALTER COLUMN search_vector DROP EXPRESSION")
+        )
+    _install_search_trigger(connection)
+    if added:
+        logger.info("Filling article.search_vector (rewrites the article table)")
+        connection.execute(text("UPDATE article SET search_vector = NULL"))
+
+    logger.info(f"Building {SEARCH_INDEX_NAME}")
+    concurrently = not _is_partitioned(connection)
+    connection.execute(text(search_index_ddl(connection, concurrently)))
+
+
+def _install_search_trigger(connection: Connection) -> None:
+    """Create or replace the trigger maintaining article.search_vector."""
+    for statement in SEARCH_TRIGGER_DDL:
+        connection.execute(text(statement))
+
+
+def migrate_suggest(connection: Connection) -> None:
+    """
+    Add the url_host column and trigram indexes to an existing article table.
+
+    Like migrate_search(), adding the generated column rewrites the table.
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("article")}
+    if "url_host" not in columns:
+        logger.info("Adding article.url_host (rewrites the article table)")
+        connection.execute(text(URL_HOST_DDL))
+
+    concurrently = not _is_partitioned(connection)
+    for statement in trigram_index_ddl(connection, concurrently):
+        logger.info(statement)
+        connection.execute(text(statement))
+
+
+def migrate_compression(connection: Connection) -> None:
+    """
+    Add the compressed body columns to an existing article table.
+
+    Nullable columns without defaults are a catalog-only change, so this
+    does not rewrite the table. Rows are compressed later, lazily or by
+    `python -m jobs compress-content`.
+    """
+    connection.execute(
+        text("ALTER TABLE article ADD COLUMN IF NOT EXISTS content_zstd bytea")
+    )
+    connection.execute(
+        text(
+            "ALTER TABLE article ADD COLUMN IF NOT EXISTS content_dictionary_id "
+            "integer REFERENCES content_dictionary (id)"
+        )
+    )
+
+
+def migrate_cold_tier(connection: Connection) -> None:
+    """
+    Add archive timestamps and cold-tier blob pointers to the article table.
+
+    Catalog-only like migrate_compression(). Articles archived before this
+    have no archived_at; the tiering job falls back to created_at for them.
+    """
+    connection.execute(
+        text("ALTER TABLE article ADD COLUMN IF NOT EXISTS archived_at timestamp")
+    )
+    connection.execute(
+        text("ALTER TABLE article ADD COLUMN IF NOT EXISTS content_blob varchar")
+    )
+
+
+def migrate_reading(connection: Connection) -> None:
+    """
+    Add reading progress columns and the unread index to the article table.
+
+    Adding NOT NULL columns with constant defaults is catalog-only on
+    PostgreSQL 11+, so existing rows read as unread without a rewrite.
+    """
+    connection.execute(
+        text(
+            "ALTER TABLE article ADD COLUMN IF NOT EXISTS read_progress "
+            "double precision NOT NULL DEFAULT 0"
+        )
+    )
+    connection.execute(
+        text(
+            "ALTER TABLE article ADD COLUMN IF NOT EXISTS is_read "
+            "boolean NOT NULL DEFAULT false"
+        )
+    )
+    _create_model_index(connection, UNREAD_INDEX_NAME)
+
+
+def migrate_tags(connection: Connection) -> None:
+    """
+    Add the tags column and its GIN index to an existing article table.
+
+    Catalog-only like migrate_reading(); the user_tag table holding
+    per-tag counts is created by init_db() and starts out empty, matching
+    the empty tag lists.
+    """
+    connection.execute(
+        text(
+            "ALTER TABLE article ADD COLUMN IF NOT EXISTS tags "
+            "text[] NOT NULL DEFAULT '{}'"
+        )
+    )
+    logger.info(f"Building {TAG_INDEX_NAME}")
+    concurrently = not _is_partitioned(connection)
+    connection.execute(text(tag_index_ddl(connection, concurrently)))
+
+
+def migrate_sync(connection: Connection) -> None:
+    """
+    Add article.updated_at to an existing article table.
+
+    timezone('utc', now()) is evaluated once, so like migrate_reading() this
+    is catalog-only. The article_tombstone table is created by init_db(),
+    and the sync indexes by migrate_changes().
+    """
+    connection.execute(
+        text(
+            "ALTER TABLE article ADD COLUMN IF NOT EXISTS updated_at "
+            "timestamp NOT NULL DEFAULT timezone('utc', now())"
+        )
+    )
+
+
+def migrate_reader_html(connection: Connection) -> None:
+    """
+    Add article.content_html for sanitized reader HTML.
+
+    Catalog-only like migrate_compression(). Existing articles keep NULL,
+    since their markup was not kept, and are rendered from plain text.
+    """
+    connection.execute(
+        text("ALTER TABLE article ADD COLUMN IF NOT EXISTS content_html text")
+    )
+
+
+def migrate_counts(connection: Connection) -> None:
+    """
+    Split the all and unread dashboard counts (PostgreSQL and SQLite).
+
+    unread_count used to count every unarchived article, which is what the
+    new all_count holds; it now excludes read articles. Both are rebuilt
+    from the article table when the column is added, in one UPDATE of the
+    small article_counts table.
+    """
+    columns = {c["name"] for c in inspect(connection).get_columns("article_counts")}
+    if "all_count" in columns:
+        return
+    connection.execute(
+        text(
+            "ALTER TABLE article_counts ADD COLUMN all_count integer NOT NULL DEFAULT 0"
+        )
+    )
+    connection.execute(
+        text(
+            "UPDATE article_counts SET "
+            "all_count = (SELECT count(*) FROM article a "
+            "WHERE a.user_id = article_counts.user_id AND a.is_archived = false), "
+            "unread_count = (SELECT count(*) FROM article a "
+            "WHERE a.user_id = article_counts.user_id AND a.is_archived = false "
+            "AND a.is_read = false)"
+        )
+    )
+
+
+def migrate_library_version(connection: Connection) -> None:
+    """
+    Add article_counts.library_version (PostgreSQL and SQLite).
+
+    Catalog-only like migrate_reading(). Every user starts at version 0,
+    which no list ETag issued before the migration carries.
+    """
+    columns = {c["name"] for c in inspect(connection).get_columns("article_counts")}
+    if "library_version" not in columns:
+        connection.execute(
+            text(
+                "ALTER TABLE article_counts ADD COLUMN library_version "
+                "bigint NOT NULL DEFAULT 0"
+            )
+        )
+
+
+def migrate_changes(connection: Connection) -> None:
+    """
+    Stamp article changes and tombstones with database-assigned positions.
+
+    Works on PostgreSQL and SQLite. The columns are added with a constant
+    default, which is catalog-only, so existing rows all sit at position
+    zero and are told apart by article ID; tokens issued before this are
+    rejected and their clients resync in full. The new sync indexes are
+    built concurrently, then the updated_at-based ones are dropped.
+    """
+    for table in CHANGE_TRIGGERS:
+        columns = {c["name"] for c in inspect(connection).get_columns(table)}
+        for name in ("change_xid", "change_seq"):
+            if name not in columns:
+                logger.info(f"Adding {table}.{name}")
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {table} ADD COLUMN {name} "
+                        "bigint NOT NULL DEFAULT 0"
+                    )
+                )
+        if connection.dialect.name == "sqlite":
+            sqlite.create_change_trigger(connection, table)
+        else:
+            install_change_trigger(connection, table)
+
+    _create_model_index(connection, SYNC_INDEX_NAME)
+    _create_model_index(connection, TOMBSTONE_SYNC_INDEX_NAME)
+    for name, table in OLD_SYNC_INDEXES.items():
+        concurrently = connection.dialect.name == "postgresql" and not (
+            table == "article" and _is_partitioned(connection)
+        )
+        mode = "CONCURRENTLY " if concurrently else ""
+        connection.execute(text(f"DROP INDEX {mode}IF EXISTS {name}"))
+
+
+def migrate_sqlite_search(connection: Connection) -> None:
+    """Make an SQLite FTS5 index see compressed and offloaded bodies."""
+    if not sqlite.has_search_view(connection):
+        logger.info("Rebuilding article_fts over article_search")
+        sqlite.rebuild_fts(connection)
+
+
+def _create_model_index(connection: Connection, name: str) -> None:
+    """Build an index declared on a model, concurrently if possible."""
+    from sqlalchemy.schema import CreateIndex
+    from sqlmodel import SQLModel
+
+    import core.models  # noqa: F401 - registers the tables
+
+    (index,) = [
+        i
+        for table in SQLModel.metadata.tables.values()
+        for i in table.indexes
+        if i.name == name
+    ]
+    statement = str(CreateIndex(index, if_not_exists=True).compile(connection))
+    if connection.dialect.name == "postgresql" and not (
+        index.table.name == "article" and _is_partitioned(connection)
+    ):
+        statement = statement.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+    logger.info(f"Building {name}")
+    connection.execute(text(statement))
+
+
+def _is_partitioned(connection: Connection) -> bool:
+    """
+    Return True if article is a partitioned table (see core.partitioning).
+
+    Indexes on a partitioned parent cannot be built CONCURRENTLY; they are
+    created with the table there, so the plain statement is a no-op.
+    """
+    relkind = connection.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass('article')")
+    ).scalar_one_or_none()
+    return relkind == "p"
+
+
+# Applied in order; each step must be idempotent.
+MIGRATIONS = [
+    migrate_search,
+    migrate_suggest,
+    migrate_compression,
+    migrate_cold_tier,
+    migrate_reading,
+    migrate_tags,
+    migrate_sync,
+    migrate_reader_html,
+    migrate_counts,
+    migrate_changes,
+    migrate_library_version,
+]
+
+# SQLite databases have had every column above since SQLite support was
+# added, except those listed here.
+SQLITE_MIGRATIONS = [
+    migrate_sqlite_search,
+    migrate_counts,
+    migrate_changes,
+    migrate_library_version,
+]
+
+
+# Columns each migrated table must have; a missing one means a pending migration.
+EXPECTED_COLUMNS = {
+    "article": (
+        "search_vector",
+        "url_host",
+        "content_zstd",
+        "archived_at",
+        "content_blob",
+        "is_read",
+        "tags",
+        "updated_at",
+        "content_html",
+        "change_seq",
+    ),
+    "article_counts": ("all_count", "library_version"),
+    "article_tombstone": ("change_seq",),
+}
+
+# Columns PostgreSQL has and SQLite replaces (see core.sqlite).
+POSTGRESQL_ONLY_COLUMNS = {"article.search_vector", "article.url_host"}
+
+
+class PendingMigrationsError(RuntimeError):
+    """Raised at startup when the database schema is behind the code."""
+
+
+def pending_migrations(engine: Engine) -> list[str]:
+    """
+    List schema changes an existing database is missing.
+
+    Only inspects the catalog, so it takes no table locks and is safe to
+    call at startup.
+
+    Args:
+        engine: Database engine.
+
+    Returns:
+        Human-readable names of missing schema objects.
+    """
+    if engine.dialect.name not in ("postgresql", "sqlite"):
+        return []
+    inspector = inspect(engine)
+    if not inspector.has_table("article"):
+        return []
+
+    pending = []
+    for table, expected in EXPECTED_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        columns = {c["name"]: c for c in inspector.get_columns(table)}
+        pending += [f"{table}.{name}" for name in expected if name not in columns]
+        # Once generated from content, now maintained by a trigger.
+        if columns.get("search_vector", {}).get("computed"):
+            pending.append("article.search_vector trigger")
+
+    if engine.dialect.name == "sqlite":
+        pending = [name for name in pending if name not in POSTGRESQL_ONLY_COLUMNS]
+        if "article_search" not in inspector.get_view_names():
+            pending.append("article_search view")
+    return pending
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Apply all migrations to a PostgreSQL or SQLite database.
+
+    Uses an autocommit connection so CREATE INDEX CONCURRENTLY can run.
+
+    Args:
+        engine: Database engine.
+    """
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            for migration in SQLITE_MIGRATIONS:
+                logger.info(f"Running migration {migration.__name__}")
+                migration(connection)
+        return
+    if engine.dialect.name != "postgresql":
+        logger.info(f"No migrations for dialect {engine.dialect.name}")
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for migration in MIGRATIONS:
+            logger.info(f"Running migration {migration.__name__}")
+            migration(connection)
+
+
+if __name__ == "__main__":
+    from core.database import get_engine, init_db
+
+    logging.basicConfig(level=logging.INFO)
+    init_db(check_migrations=False)
+    run_migrations(get_engine())
@@ -6,14 +6,103 @@ Defines the database tables using SQLModel for PostgreSQL.
 
 from datetime import UTC, datetime
 
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    Index,
+    Text,
+    event,
+    false,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from sqlmodel import Field, SQLModel
 
+from core import sqlite
+from core.migrations import (
+    CHANGE_SEQUENCE,
+    SYNC_INDEX_NAME,
+    TOMBSTONE_SYNC_INDEX_NAME,
+    UNREAD_INDEX_NAME,
+    create_article_schema,
+    install_change_trigger,
+)
+
 
 def utc_now() -> datetime:
     """Return current UTC time (timezone-aware)."""
     return datetime.now(UTC)
 
 
+# Article tags: text[] on PostgreSQL, a JSON array on SQLite.
+TagList = ARRAY(Text).with_variant(JSON(), "sqlite")
+
+
+class empty_tags(FunctionElement):
+    """Empty TagList literal, for the column's server default."""
+
+    type = TagList
+    inherit_cache = True
+
+
+@compiles(empty_tags)
+def _empty_tags(element, compiler, **kw) -> str:
+    return "'{}'"
+
+
+@compiles(empty_tags, "sqlite")
+def _empty_tags_sqlite(element, compiler, **kw) -> str:
+    return "'[]'"
+
+
+class utc_timestamp(FunctionElement):
+    """Current UTC time as a naive timestamp, like utc_now() is stored."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_timestamp)
+def _utc_timestamp(element, compiler, **kw) -> str:
+    return "timezone('utc', now())"
+
+
+@compiles(utc_timestamp, "sqlite")
+def _utc_timestamp_sqlite(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+class change_version(FunctionElement):
+    """
+    Version number for rows changed by the current transaction.
+
+    Draws from the sync change sequence on PostgreSQL. On SQLite it is the
+    sync_clock value, which the transaction's article writes just bumped.
+    """
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(change_version)
+def _change_version(element, compiler, **kw) -> str:
+    return f"nextval('{CHANGE_SEQUENCE}')"
+
+
+@compiles(change_version, "sqlite")
+def _change_version_sqlite(element, compiler, **kw) -> str:
+    return "(SELECT seq FROM sync_clock)"
+
+
+def _change_column() -> Column:
+    """Column for a database-assigned delta sync position."""
+    return Column(BigInteger, nullable=False, server_default=text("0"))
+
+
 class User(SQLModel, table=True):
     """User account from OAuth authentication."""
 
@@ -36,3 +125,146 @@ class Article(SQLModel, table=True):
     is_archived: bool = False
     is_favorite: bool = False
     created_at: datetime = Field(default_factory=utc_now, index=True)
+    archived_at: datetime | None = None
+    # Compressed body; when set, content is NULL (see services.content_service).
+    content_zstd: bytes | None = None
+    content_dictionary_id: int | None = Field(
+        default=None, foreign_key="content_dictionary.id"
+    )
+    # Key of the body in the cold-tier blob store; when set, the row holds
+    # no body at all (see services.content_service.offload_archived).
+    content_blob: str | None = None
+    # Sanitized reader HTML built at extraction (see core.sanitize); NULL
+    # for articles saved before it, which the reader renders from content.
+    content_html: str | None = None
+    # Reading position as a fraction of the body, reported by the reader
+    # page and written in batches (see services.progress_service).
+    read_progress: float = Field(
+        default=0.0, sa_column_kwargs={"server_default": text("0")}
+    )
+    is_read: bool = Field(default=False, sa_column_kwargs={"server_default": false()})
+    # Normalized tag names (see services.tag_service).
+    tags: list[str] = Field(
+        default_factory=list,
+        sa_column=Column(TagList, nullable=False, server_default=empty_tags()),
+    )
+    # Bumped by every change a client can see (not by storage moves like
+    # compression), which also restamps the change position below.
+    updated_at: datetime = Field(
+        default_factory=utc_now, sa_column_kwargs={"server_default": utc_timestamp()}
+    )
+    # Position in the delta sync stream, assigned by the database on insert
+    # and on every updated_at bump (see core.migrations.CHANGE_TRIGGER_DDL).
+    change_xid: int = Field(default=0, sa_column=_change_column())
+    change_seq: int = Field(default=0, sa_column=_change_column())
+
+
+# Serves the "unread" dashboard filter; the predicate must match the
+# query's conditions for the planner to use it.
+Index(
+    UNREAD_INDEX_NAME,
+    Article.user_id,
+    Article.created_at.desc(),
+    postgresql_where=(Article.is_read == False) & (Article.is_archived == False),
+    sqlite_where=(Article.is_read == False) & (Article.is_archived == False),
+)
+
+
+# Serves delta sync: a user's articles in change order.
+Index(
+    SYNC_INDEX_NAME, Article.user_id, Article.change_xid, Article.change_seq, Article.id
+)
+
+
+class ArticleTombstone(SQLModel, table=True):
+    """
+    Record of a deleted article, so sync clients learn about the delete.
+
+    Kept for sync_tombstone_days; older sync tokens must resync in full.
+    """
+
+    __tablename__ = "article_tombstone"
+    __table_args__ = (
+        Index(
+            TOMBSTONE_SYNC_INDEX_NAME,
+            "user_id",
+            "change_xid",
+            "change_seq",
+            "article_id",
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    article_id: int
+    # Only decides when the tombstone is pruned; sync reads the position.
+    deleted_at: datetime = Field(default_factory=utc_now, index=True)
+    change_xid: int = Field(default=0, sa_column=_change_column())
+    change_seq: int = Field(default=0, sa_column=_change_column())
+
+
+class ContentDictionary(SQLModel, table=True):
+    """Trained zstd dictionary shared by compressed article bodies."""
+
+    __tablename__ = "content_dictionary"
+
+    id: int | None = Field(default=None, primary_key=True)
+    data: bytes
+    created_at: datetime = Field(default_factory=utc_now)
+
+
+class UserTag(SQLModel, table=True):
+    """
+    A user's tag and the number of articles carrying it.
+
+    Maintained alongside article tag changes, like ArticleCounts, so listing
+    tags with counts never scans the article table.
+    """
+
+    __tablename__ = "user_tag"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    tag: str = Field(primary_key=True)
+    article_count: int = 0
+
+
+class ArticleCounts(SQLModel, table=True):
+    """
+    Per-user article totals for the dashboard tabs.
+
+    Maintained incrementally by article mutations so reading the counts is
+    a primary-key lookup; services.counts_service can rebuild them.
+    """
+
+    __tablename__ = "article_counts"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    all_count: int = 0
+    unread_count: int = 0
+    favorite_count: int = 0
+    archived_count: int = 0
+    # Moves forward with every change to the user's articles, so listings
+    # can be revalidated with this one row (see change_version).
+    library_version: int = Field(default=0, sa_column=_change_column())
+
+
+# Search and suggest support (generated columns and GIN indexes on
+# PostgreSQL, an FTS5 index on SQLite) is not part of the SQLModel fields,
+# so it is added after the table is created. Existing PostgreSQL tables get
+# it from core.migrations.
+@event.listens_for(Article.__table__, "after_create")
+def _create_article_extras(target, connection, **kw) -> None:
+    """Add search columns and indexes when the article table is created."""
+    if connection.dialect.name == "postgresql":
+        create_article_schema(connection)
+    elif connection.dialect.name == "sqlite":
+        sqlite.create_article_schema(connection)
+
+
+@event.listens_for(ArticleTombstone.__table__, "after_create")
+def _create_tombstone_extras(target, connection, **kw) -> None:
+    """Stamp tombstones with their delta sync position as they are written."""
+    if connection.dialect.name == "postgresql":
+        install_change_trigger(connection, "article_tombstone")
+    elif connection.dialect.name == "sqlite":
+        sqlite.create_change_trigger(connection, "article_tombstone")
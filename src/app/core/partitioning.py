@@ -0,0 +1,329 @@
+"""
+Optional declarative partitioning of the article table (PostgreSQL).
+
+Two schemes are supported, chosen with the ARTICLE_PARTITIONING setting:
+
+- "hash": partitions by hash of user_id. Every per-user query filters on
+  user_id, so it only touches one partition and its (small) indexes.
+- "range": monthly partitions by created_at. Age-based purges become
+  partition drops, and queries with a created_at bound skip old months.
+
+PostgreSQL requires the partition key in the primary key, so a
+partitioned article table has PRIMARY KEY (id, <key>); ids still come
+from one sequence and stay unique.
+
+New databases get a partitioned table from init_db(). Existing tables
+are converted once, offline, and range partitions need periodic upkeep:
+
+    cd src/app && python -m core.partitioning convert
+    cd src/app && python -m core.partitioning maintain
+    cd src/app && python -m core.partitioning retire --before 2024-01
+"""
+
+import argparse
+import logging
+import re
+from datetime import date
+
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from core.migrations import create_article_schema
+
+logger = logging.getLogger(__name__)
+
+SCHEMES = {"hash": ("HASH", "user_id"), "range": ("RANGE", "created_at")}
+
+_UPPER_BOUND = re.compile(r"TO \('(\d{4}-\d{2}-\d{2})")
+
+# Name of the pre-conversion table kept by convert() until dropped by hand.
+UNPARTITIONED_TABLE = "article_unpartitioned"
+
+
+def partitioned_article_ddl(scheme: str) -> list[str]:
+    """
+    Build CREATE statements for a partitioned article parent table.
+
+    Args:
+        scheme: 'hash' or 'range'.
+
+    Returns:
+        CREATE TABLE and CREATE INDEX statements (partitions not included).
+    """
+    from core.models import Article
+
+    method, key = SCHEMES[scheme]
+    dialect = postgresql.dialect()
+    table = str(CreateTable(Article.__table__).compile(dialect=dialect)).strip()
+    table = table.replace("PRIMARY KEY (id)", f"PRIMARY KEY (id, {key})")
+    statements = [f"{table} PARTITION BY {method} ({key})"]
+    statements.extend(
+        str(CreateIndex(index).compile(dialect=dialect))
+        for index in Article.__table__.indexes
+    )
+    return statements
+
+
+def month_partition_ddl(month: date) -> str:
+    """CREATE statement for the range partition holding one calendar month."""
+    start = month.replace(day=1)
+    end = _add_months(start, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS article_{start:%Y_%m} PARTITION OF article "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def create_partitioned_article(
+    connection: Connection,
+    scheme: str,
+    hash_partitions: int = 16,
+    months_ahead: int = 3,
+) -> None:
+    """
+    Create a partitioned article table with its partitions and extras.
+
+    Range tables get partitions from the current month to months_ahead,
+    plus a DEFAULT partition so inserts outside them never fail.
+
+    Args:
+        connection: Open database connection (inside a transaction).
+        scheme: 'hash' or 'range'.
+        hash_partitions: Number of hash partitions.
+        months_ahead: Future monthly partitions to create up front.
+    """
+    for statement in partitioned_article_ddl(scheme):
+        connection.execute(text(statement))
+
+    if scheme == "hash":
+        for remainder in range(hash_partitions):
+            connection.execute(
+                text(
+                    f"CREATE TABLE article_p{remainder} PARTITION OF article "
+                    f"FOR VALUES WITH (MODULUS {hash_partitions}, "
+                    f"REMAINDER {remainder})"
+                )
+            )
+    else:
+        connection.execute(
+            text("CREATE TABLE article_default PARTITION OF article DEFAULT")
+        )
+        create_month_partitions(connection, months_ahead=months_ahead)
+
+    # Generated columns and GIN indexes on the parent cascade to partitions.
+    create_article_schema(connection)
+    logger.info(f"Created article table partitioned by {scheme}")
+
+
+def create_month_partitions(
+    connection: Connection, months_ahead: int = 3, since: date | None = None
+) -> None:
+    """
+    Ensure monthly range partitions exist up to months_ahead from today.
+
+    Args:
+        connection: Open database connection.
+        months_ahead: Number of future months to cover.
+        since: First month to create; defaults to the current month.
+    """
+    month = (since or date.today()).replace(day=1)
+    last = _add_months(date.today().replace(day=1), months_ahead)
+    while month <= last:
+        connection.execute(text(month_partition_ddl(month)))
+        month = _add_months(month, 1)
+
+
+def partition_scheme(connection: Connection) -> str | None:
+    """Return 'hash' or 'range' if article is partitioned, else None."""
+    strategy = connection.execute(
+        text(
+            "SELECT p.partstrat FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = 'article' AND pg_table_is_visible(c.oid)"
+        )
+    ).scalar_one_or_none()
+    return {"h": "hash", "r": "range"}.get(strategy)
+
+
+def convert(connection: Connection, scheme: str, hash_partitions: int = 16) -> None:
+    """
+    Convert an existing article table to a partitioned one.
+
+    Renames the table (and its indexes) to article_unpartitioned, creates
+    the partitioned table and copies every row. Holds an ACCESS EXCLUSIVE
+    lock throughout, so run it in a maintenance window. Drop the old
+    table by hand once the result is verified.
+
+    Args:
+        connection: Open database connection (inside a transaction).
+        scheme: 'hash' or 'range'.
+        hash_partitions: Number of hash partitions.
+    """
+    if partition_scheme(connection):
+        logger.info("article is already partitioned")
+        return
+
+    connection.execute(text(f"ALTER TABLE article RENAME TO {UNPARTITIONED_TABLE}"))
+    for index in inspect(connection).get_indexes(UNPARTITIONED_TABLE):
+        name = index["name"]
+        connection.execute(text(f"ALTER INDEX {name} RENAME TO {name}_unpartitioned"))
+    connection.execute(
+        text(
+            f"ALTER TABLE {UNPARTITIONED_TABLE} "
+            "RENAME CONSTRAINT article_pkey TO article_unpartitioned_pkey"
+        )
+    )
+
+    first_month = connection.execute(
+        text(f"SELECT min(created_at) FROM {UNPARTITIONED_TABLE}")
+    ).scalar()
+    create_partitioned_article(connection, scheme, hash_partitions)
+    if scheme == "range" and first_month is not None:
+        create_month_partitions(connection, since=first_month.date())
+
+    # Generated columns are recomputed, so copy only the regular ones. The
+    # search vector is copied too: it holds the lexemes of bodies that are
+    # no longer stored in content.
+    from core.models import Article
+
+    columns = ", ".join(
+        [column.name for column in Article.__table__.columns] + ["search_vector"]
+    )
+    copied = connection.execute(
+        text(
+            f"INSERT INTO article ({columns}) "
+            f"SELECT {columns} FROM {UNPARTITIONED_TABLE}"
+        )
+    ).rowcount
+    connection.execute(
+        text(
+            "SELECT setval(pg_get_serial_sequence('article', 'id'), "
+            "coalesce((SELECT max(id) FROM article), 0) + 1, false)"
+        )
+    )
+    logger.info(f"Copied {copied} articles into the partitioned table")
+
+
+def retire_months(connection: Connection, before: date) -> list[str]:
+    """
+    Drop range partitions whose month ends on or before a date.
+
+    This deletes every article in them, leaving tombstones for delta
+    sync. In the same transaction, the affected users' article and tag
+    counts are rebuilt and cached articles are invalidated in every
+    worker.
+
+    Args:
+        connection: Open database connection (inside a transaction).
+        before: First month to keep.
+
+    Returns:
+        Names of the dropped partitions.
+    """
+    partitions = connection.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'article' AND pg_table_is_visible(p.oid)"
+        )
+    ).all()
+
+    first_kept = before.replace(day=1)
+    dropped = []
+    user_ids = set()
+    for name, bound in partitions:
+        # e.g. FOR VALUES FROM ('2024-01-01 00:00:00') TO ('2024-02-01 00:00:00')
+        match = _UPPER_BOUND.search(bound)
+        if match and date.fromisoformat(match.group(1)) <= first_kept:
+            # Tell sync clients about the articles going away.
+            user_ids.update(
+                connection.execute(
+                    text(
+                        "INSERT INTO article_tombstone "
+                        "(user_id, article_id, deleted_at) "
+                        f"SELECT user_id, id, timezone('utc', now()) FROM {name} "
+                        "RETURNING user_id"
+                    )
+                ).scalars()
+            )
+            connection.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+
+    if user_ids:
+        _reconcile_users(connection, sorted(user_ids))
+    logger.info(f"Dropped {len(dropped)} partitions: {', '.join(dropped)}")
+    return dropped
+
+
+def _reconcile_users(connection: Connection, user_ids: list[int]) -> None:
+    """
+    Rebuild counts of users who lost articles and invalidate article caches.
+
+    Also moves each user's library version, so their list ETags change.
+    """
+    from sqlmodel import Session
+
+    from core import invalidation
+    from services import counts_service, tag_service
+
+    # The session joins the connection's transaction without committing it.
+    with Session(bind=connection) as session:
+        for user_id in user_ids:
+            counts_service.reconcile_counts(session, user_id)
+            tag_service.reconcile_tags(session, user_id)
+            counts_service.apply_delta(session, user_id, {})
+        # One event for every user rather than a notification each.
+        invalidation.publish(session, "article", None)
+
+
+def _add_months(month: date, count: int) -> date:
+    """Return the first day of the month count months after month."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point for partition conversion and upkeep."""
+    from core.config import get_settings
+    from core.database import get_engine, init_db
+
+    parser = argparse.ArgumentParser(description="Manage article partitions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("convert", help="partition an existing article table")
+    commands.add_parser("maintain", help="create upcoming monthly partitions")
+    retire = commands.add_parser("retire", help="drop monthly partitions")
+    retire.add_argument(
+        "--before",
+        required=True,
+        type=lambda value: date.fromisoformat(f"{value}-01"),
+        help="first month to keep, as YYYY-MM",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    settings = get_settings()
+    init_db()
+
+    with get_engine().begin() as connection:
+        if args.command == "convert":
+            if not settings.article_partitioning:
+                parser.error("set ARTICLE_PARTITIONING to 'hash' or 'range' first")
+            convert(
+                connection,
+                settings.article_partitioning,
+                settings.article_hash_partitions,
+            )
+        elif partition_scheme(connection) != "range":
+            parser.error(f"{args.command} needs a range-partitioned article table")
+        elif args.command == "maintain":
+            create_month_partitions(connection)
+        else:
+            retire_months(connection, args.before)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Sanitized reader HTML for extracted articles.
+
+newspaper4k keeps the extracted article's markup (headings, lists, links,
+images). It comes from arbitrary pages, so it is cleaned once when the
+article is saved: only a whitelist of structural tags and attributes
+survives, links and images are made absolute and stripped of unsafe
+schemes, and links open without handing the page a referrer. The reader
+then embeds the stored result as is.
+"""
+
+from urllib.parse import urljoin, urlparse
+
+import lxml.html
+from lxml.etree import ParserError
+from lxml.html.clean import Cleaner
+
+# Tags kept in reader HTML; anything else is unwrapped to its text.
+ALLOWED_TAGS = frozenset(
+    {
+        "a", "abbr", "b", "blockquote", "br", "caption", "cite", "code", "dd",
+        "del", "div", "dl", "dt", "em", "figcaption", "figure", "h1", "h2",
+        "h3", "h4", "h5", "h6", "hr", "i", "img", "ins", "kbd", "li", "mark",
+        "ol", "p", "pre", "q", "s", "small", "span", "strong", "sub", "sup",
+        "table", "tbody", "td", "tfoot", "th", "thead", "time", "tr", "u", "ul",
+    }
+)  # fmt: skip
+
+# Attributes kept on allowed tags.
+ALLOWED_ATTRIBUTES = frozenset(
+    {"alt", "colspan", "datetime", "height", "href", "rowspan", "src", "title", "width"}
+)
+
+# URL schemes allowed in href and src.
+ALLOWED_SCHEMES = frozenset({"http", "https", "mailto"})
+
+_cleaner = Cleaner(
+    scripts=True,
+    javascript=True,
+    comments=True,
+    style=True,
+    inline_style=True,
+    links=True,
+    meta=True,
+    page_structure=True,
+    processing_instructions=True,
+    embedded=True,
+    frames=True,
+    forms=True,
+    annoying_tags=True,
+    kill_tags={"noscript", "template"},
+    allow_tags=ALLOWED_TAGS,
+    remove_unknown_tags=False,
+    safe_attrs_only=True,
+    safe_attrs=ALLOWED_ATTRIBUTES,
+)
+
+
+def sanitize_html(html: str, base_url: str) -> str:
+    """
+    Clean extracted article markup for embedding in the reader.
+
+    Args:
+        html: Article markup from the extractor.
+        base_url: URL the article was fetched from, for relative links.
+
+    Returns:
+        Sanitized HTML wrapped in a <div>, or an empty string if no text
+        or image remains.
+    """
+    if not html or not html.strip():
+        return ""
+    try:
+        root = lxml.html.fragment_fromstring(html, create_parent="div")
+    except ParserError:
+        return ""
+
+    root = _cleaner.clean_html(root)
+    for element in list(root.iter("a", "img")):
+        attribute = "href" if element.tag == "a" else "src"
+        url = _absolute_url(element.get(attribute), base_url)
+        if url is None:
+            element.attrib.pop(attribute, None)
+        else:
+            element.set(attribute, url)
+        if element.tag == "a":
+            element.set("rel", "nofollow noopener noreferrer")
+        elif element.get("src") is None:
+            element.drop_tree()
+        else:
+            element.set("loading", "lazy")
+
+    if not root.text_content().strip() and root.find(".//img") is None:
+        return ""
+    return lxml.html.tostring(root, encoding="unicode")
+
+
+def _absolute_url(url: str | None, base_url: str) -> str | None:
+    """Resolve a link against the article URL; None if empty or unsafe."""
+    if not url or not url.strip():
+        return None
+    url = urljoin(base_url, url.strip())
+    return url if urlparse(url).scheme in ALLOWED_SCHEMES else None
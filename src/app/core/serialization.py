@@ -0,0 +1,216 @@
+"""
+Fast JSON and MessagePack responses for API schemas.
+
+Returning a Pydantic model from a route makes FastAPI validate it against
+the response_model and serialize it again. For large article lists that
+doubles the CPU cost after the query. schema_response() instead validates
+the ORM objects once, in a single pydantic-core call through a cached
+TypeAdapter, dumps straight to bytes and returns them as a raw response.
+Routes keep response_model for the OpenAPI schema.
+
+The v1 API also speaks MessagePack, with the same shapes as JSON:
+routers use NegotiatedRoute, which decodes application/msgpack request
+bodies and, for clients that send Accept: application/msgpack, re-encodes
+JSON responses. schema_response() encodes MessagePack directly instead.
+Errors stay JSON.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any
+
+import msgpack
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Media types accepted as MessagePack in Accept and Content-Type.
+MSGPACK_MEDIA_TYPES = frozenset(
+    {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+)
+
+
+@lru_cache
+def get_adapter(schema: Any) -> TypeAdapter:
+    """Return the shared TypeAdapter for a schema type (building one is slow)."""
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: Any, data: Any) -> bytes:
+    """
+    Validate data as schema and serialize it to JSON bytes.
+
+    Args:
+        schema: Schema type, e.g. ArticleListResponse or list[ArticleResponse].
+        data: Matching data; ORM objects are read through their attributes.
+
+    Returns:
+        UTF-8 JSON document.
+    """
+    adapter = get_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def dump_msgpack(schema: Any, data: Any) -> bytes:
+    """
+    Validate data as schema and serialize it to MessagePack.
+
+    Values are dumped in JSON mode first, so datetimes are ISO strings and
+    the document has exactly the shape of the JSON one.
+
+    Args:
+        schema: Schema type, e.g. ArticleListResponse.
+        data: Matching data; ORM objects are read through their attributes.
+
+    Returns:
+        MessagePack document.
+    """
+    adapter = get_adapter(schema)
+    model = adapter.validate_python(data, from_attributes=True)
+    return msgpack.packb(adapter.dump_python(model, mode="json"))
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    Check whether the client prefers MessagePack to JSON.
+
+    Args:
+        request: Incoming request (for Accept).
+
+    Returns:
+        True if Accept lists a MessagePack type with a quality at least
+        that of application/json.
+    """
+    accept = request.headers.get("accept", "")
+    if "msgpack" not in accept:
+        return False
+
+    msgpack_quality = json_quality = 0.0
+    for item in accept.split(","):
+        media_type, _, params = item.partition(";")
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type == JSON_MEDIA_TYPE:
+            json_quality = max(json_quality, quality)
+    return msgpack_quality > 0 and msgpack_quality >= json_quality
+
+
+def negotiated_media_type(request: Request) -> str:
+    """
+    Media type a negotiated route answers this request with.
+
+    Validators of negotiated responses include it, so a cached JSON body
+    is never confirmed to a client asking for MessagePack or vice versa.
+
+    Args:
+        request: Incoming request (for Accept).
+
+    Returns:
+        MSGPACK_MEDIA_TYPE if the client prefers it, else JSON_MEDIA_TYPE.
+    """
+    return MSGPACK_MEDIA_TYPE if wants_msgpack(request) else JSON_MEDIA_TYPE
+
+
+def schema_response(
+    request: Request, schema: Any, data: Any, status_code: int = status.HTTP_200_OK
+) -> Response:
+    """
+    Build a response for data validated once as schema.
+
+    Args:
+        request: Incoming request (for Accept).
+        schema: Schema type of the response body.
+        data: Matching data, e.g. a dict holding ORM articles.
+        status_code: HTTP status of the response.
+
+    Returns:
+        MessagePack response if the client prefers it, else JSON.
+        NegotiatedRoute adds the Vary header.
+    """
+    if wants_msgpack(request):
+        body, media_type = dump_msgpack(schema, data), MSGPACK_MEDIA_TYPE
+    else:
+        body, media_type = dump_json(schema, data), JSON_MEDIA_TYPE
+    return Response(body, status_code=status_code, media_type=media_type)
+
+
+class MsgPackRequest(Request):
+    """Request whose MessagePack body is parsed as if it were JSON."""
+
+    async def json(self) -> Any:
+        """Decode the body as MessagePack, once."""
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route class adding MessagePack to a router's JSON endpoints.
+
+    Request bodies sent as application/msgpack are decoded into the same
+    values FastAPI would get from JSON. JSON responses are re-encoded as
+    MessagePack when the client prefers it; routes on hot paths use
+    schema_response() to skip the JSON round trip.
+    """
+
+    def get_route_handler(self):
+        """Wrap FastAPI's handler with MessagePack decoding and encoding."""
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type", "")
+            if content_type.split(";")[0].strip().lower() in MSGPACK_MEDIA_TYPES:
+                request = _as_json_request(request)
+
+            response = await handler(request)
+            if response.status_code == status.HTTP_304_NOT_MODIFIED:
+                # Confirms a body that was chosen by Accept, like the 200.
+                response.headers.add_vary_header("Accept")
+                return response
+            if response.media_type not in (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE):
+                return response
+            if response.media_type == JSON_MEDIA_TYPE and wants_msgpack(request):
+                response = _to_msgpack(response)
+            response.headers.add_vary_header("Accept")
+            return response
+
+        return negotiated_handler
+
+
+def _as_json_request(request: Request) -> MsgPackRequest:
+    """Wrap a MessagePack request so FastAPI parses its body (see class)."""
+    headers = [
+        (name, value)
+        for name, value in request.scope["headers"]
+        if name != b"content-type"
+    ]
+    headers.append((b"content-type", JSON_MEDIA_TYPE.encode()))
+    return MsgPackRequest({**request.scope, "headers": headers}, request.receive)
+
+
+def _to_msgpack(response: Response) -> Response:
+    """Re-encode a buffered, unencoded JSON response as MessagePack."""
+    converted = Response(
+        msgpack.packb(json.loads(response.body)),
+        status_code=response.status_code,
+        media_type=MSGPACK_MEDIA_TYPE,
+        background=response.background,
+    )
+    converted.raw_headers += [
+        (name, value)
+        for name, value in response.raw_headers
+        if name not in (b"content-length", b"content-type")
+    ]
+    return converted
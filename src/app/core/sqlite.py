@@ -0,0 +1,205 @@
+"""
+Embedded SQLite support for single-node deployments.
+
+Set DATABASE_URL=sqlite:////data/timstapaper.db to keep the database on the
+/data volume next to the app instead of running PostgreSQL. The database
+runs in WAL mode, so uvicorn workers read concurrently while one writes;
+writers wait on busy_timeout rather than failing. Only run one replica
+against a given file: SQLite locking does not work across network storage.
+
+PostgreSQL features used elsewhere have SQLite counterparts here: an FTS5
+index replaces the tsvector search column, a url_host() SQL function
+registered on each connection replaces the generated url_host column, and
+a sync_clock counter replaces the change sequence.
+"""
+
+import logging
+from urllib.parse import urlparse
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from core.blobstore import get_blob_store
+from core.compression import decompress_text
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection. synchronous=NORMAL is durable in WAL
+# mode except for the last transactions on power loss, not on app crash.
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "busy_timeout": "5000",
+    "cache_size": "-65536",  # KiB, i.e. 64 MiB per connection
+    "mmap_size": "268435456",
+    "temp_store": "MEMORY",
+}
+
+# Plain article body from whichever column holds it (see article_body()).
+_BODY = (
+    "article_body({row}.content, {row}.content_zstd, (SELECT data FROM "
+    "content_dictionary WHERE id = {row}.content_dictionary_id), "
+    "{row}.content_blob)"
+)
+_OLD_BODY = _BODY.format(row="old")
+_NEW_BODY = _BODY.format(row="new")
+
+# External-content FTS5 index over article text, kept in sync by triggers.
+# It reads through the article_search view, so bodies are indexed (and
+# snippets shown) whether they are stored plain, compressed or offloaded.
+FTS_DDL = [
+    (
+        "CREATE VIEW IF NOT EXISTS article_search AS SELECT id, title, excerpt, "
+        f"{_BODY.format(row='article')} AS content FROM article"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5("
+        "title, excerpt, content, content='article_search', content_rowid='id', "
+        "tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS article_fts_insert AFTER INSERT ON article "
+        "BEGIN INSERT INTO article_fts (rowid, title, excerpt, content) "
+        f"VALUES (new.id, new.title, new.excerpt, {_NEW_BODY}); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS article_fts_delete AFTER DELETE ON article "
+        "BEGIN INSERT INTO article_fts (article_fts, rowid, title, excerpt, content) "
+        f"VALUES ('delete', old.id, old.title, old.excerpt, {_OLD_BODY}); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS article_fts_update AFTER UPDATE OF "
+        "title, excerpt, content, content_zstd, content_blob ON article BEGIN "
+        "INSERT INTO article_fts (article_fts, rowid, title, excerpt, content) "
+        f"VALUES ('delete', old.id, old.title, old.excerpt, {_OLD_BODY}); "
+        "INSERT INTO article_fts (rowid, title, excerpt, content) "
+        f"VALUES (new.id, new.title, new.excerpt, {_NEW_BODY}); END"
+    ),
+]
+
+# Delta sync positions (see services.sync_service). SQLite has one writer
+# at a time, so a counter bumped inside the writing transaction already
+# runs in commit order; change_xid stays 0.
+SYNC_CLOCK_DDL = [
+    "CREATE TABLE IF NOT EXISTS sync_clock (seq integer NOT NULL)",
+    "INSERT INTO sync_clock SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM sync_clock)",
+]
+
+# Writes that stamp each table's rows, like core.migrations.CHANGE_TRIGGERS.
+CHANGE_EVENTS = {
+    "article": {"insert": "INSERT", "update": "UPDATE OF updated_at"},
+    "article_tombstone": {"insert": "INSERT"},
+}
+
+# FTS objects created before article_search existed, dropped by rebuild_fts().
+_OLD_FTS_OBJECTS = [
+    "DROP TRIGGER IF EXISTS article_fts_insert",
+    "DROP TRIGGER IF EXISTS article_fts_delete",
+    "DROP TRIGGER IF EXISTS article_fts_update",
+    "DROP TABLE IF EXISTS article_fts",
+]
+
+
+def url_host(url: str | None) -> str | None:
+    """Lower-cased URL host without a leading 'www.' (like article.url_host)."""
+    if not url:
+        return None
+    host = (urlparse(url).hostname or "").lower()
+    return host.removeprefix("www.") or None
+
+
+def article_body(
+    content: str | None,
+    data: bytes | None,
+    dictionary: bytes | None,
+    blob_key: str | None,
+) -> str | None:
+    """
+    Plain article body from its stored columns (see services.content_service).
+
+    Registered as the article_body() SQL function so FTS triggers can index
+    compressed and offloaded bodies. A missing blob reads as no body.
+    """
+    if content is not None:
+        return content
+    if data is not None:
+        return decompress_text(data, dictionary)
+    if blob_key is not None:
+        try:
+            return get_blob_store().get(blob_key)
+        except FileNotFoundError:
+            logger.warning(f"Blob {blob_key} is missing; not indexing its body")
+    return None
+
+
+def configure_engine(engine: Engine) -> None:
+    """Apply pragmas and register SQL functions on every new connection."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        dbapi_connection.create_function("url_host", 1, url_host, deterministic=True)
+        dbapi_connection.create_function(
+            "article_body", 4, article_body, deterministic=True
+        )
+        cursor = dbapi_connection.cursor()
+        for name, value in PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_article_schema(connection: Connection) -> None:
+    """Add the FTS5 search index and sync stamps to a new article table."""
+    for statement in FTS_DDL:
+        connection.execute(text(statement))
+    create_change_trigger(connection, "article")
+
+
+def create_change_trigger(connection: Connection, table: str) -> None:
+    """Stamp a table's rows with the next sync_clock value as they change."""
+    for statement in SYNC_CLOCK_DDL:
+        connection.execute(text(statement))
+    for name, event_ in CHANGE_EVENTS[table].items():
+        connection.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_change_{name} "
+                f"AFTER {event_} ON {table} BEGIN "
+                "UPDATE sync_clock SET seq = seq + 1; "
+                f"UPDATE {table} SET change_seq = (SELECT seq FROM sync_clock) "
+                "WHERE id = new.id; END"
+            )
+        )
+
+
+def has_search_view(connection) -> bool:
+    """Return True if the FTS5 index reads through article_search."""
+    return "article_search" in inspect(connection).get_view_names()
+
+
+def rebuild_fts(connection: Connection) -> None:
+    """
+    Re-create the FTS5 index over article_search and rebuild it.
+
+    Replaces an index created before article_search existed, which did not
+    see compressed or offloaded bodies.
+    """
+    for statement in _OLD_FTS_OBJECTS + FTS_DDL:
+        connection.execute(text(statement))
+    connection.execute(text("INSERT INTO article_fts (article_fts) VALUES ('rebuild')"))
+
+
+def fts_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query that matches all words.
+
+    Each word is quoted so punctuation and FTS5 operators in user input are
+    matched literally instead of raising syntax errors.
+
+    Args:
+        query: Search text typed by the user.
+
+    Returns:
+        FTS5 MATCH expression, empty if query has no words.
+    """
+    words = [word.replace('"', '""') for word in query.split()]
+    return " ".join(f'"{word}"' for word in words)
@@ -0,0 +1,104 @@
+"""
+Periodic maintenance jobs.
+
+Run from cron or a scheduler, one job per invocation:
+
+    cd src/app && python -m jobs reconcile-counts
+"""
+
+import argparse
+import logging
+
+from sqlmodel import Session
+
+from core.config import get_settings
+from core.database import get_engine, init_db
+from services import content_service, counts_service, sync_service, tag_service
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_counts() -> None:
+    """Rebuild every user's article and tag counts from the article table."""
+    with Session(get_engine()) as session:
+        updated = counts_service.reconcile_counts(session)
+        tags = tag_service.reconcile_tags(session)
+        session.commit()
+    logger.info(f"Reconciled counts for {updated} user(s) and {tags} tag(s)")
+
+
+def train_dictionary() -> None:
+    """Train a new compression dictionary from recent article bodies."""
+    with Session(get_engine()) as session:
+        content_service.train(session)
+
+
+def compress_content() -> None:
+    """Compress every plain-text article body, one batch per transaction."""
+    total = 0
+    with Session(get_engine()) as session:
+        while compressed := content_service.compress_existing(session):
+            total += compressed
+    logger.info(f"Compressed {total} article bodies")
+
+
+def reindex_content() -> None:
+    """Add compressed and offloaded bodies missing from the search vector."""
+    with Session(get_engine()) as session:
+        last_id = content_service.reindex_bodies(session)
+        while last_id is not None:
+            last_id = content_service.reindex_bodies(session, last_id)
+    logger.info("Indexed stored article bodies")
+
+
+def offload_archived() -> None:
+    """
+    Move bodies of articles archived over cold_tier_days ago to disk,
+    and bodies of articles unarchived since back into the database.
+    """
+    days = get_settings().cold_tier_days
+    total = restored = 0
+    with Session(get_engine()) as session:
+        while moved := content_service.restore_unarchived(session):
+            restored += moved
+        while moved := content_service.offload_archived(session, days):
+            total += moved
+    logger.info(f"Moved {total} article bodies to the cold tier and {restored} back")
+
+
+def prune_blobs() -> None:
+    """Delete cold-tier blobs no longer referenced by any article."""
+    with Session(get_engine()) as session:
+        content_service.prune_blobs(session)
+
+
+def prune_tombstones() -> None:
+    """Delete sync tombstones older than sync_tombstone_days."""
+    with Session(get_engine()) as session:
+        sync_service.prune_tombstones(session, get_settings().sync_tombstone_days)
+
+
+JOBS = {
+    "reconcile-counts": reconcile_counts,
+    "train-dictionary": train_dictionary,
+    "compress-content": compress_content,
+    "reindex-content": reindex_content,
+    "offload-archived": offload_archived,
+    "prune-blobs": prune_blobs,
+    "prune-tombstones": prune_tombstones,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse the job name from the command line and run it."""
+    parser = argparse.ArgumentParser(description="Run a maintenance job.")
+    parser.add_argument("job", choices=sorted(JOBS))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    JOBS[args.job]()
+
+
+if __name__ == "__main__":
+    main()
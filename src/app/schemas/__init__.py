@@ -6,12 +6,24 @@ Import schemas from here for convenience:
 """
 
 from schemas.article import (
+    ArticleBulkResponse,
+    ArticleBulkUpdate,
+    ArticleCountsResponse,
     ArticleCreate,
     ArticleExtracted,
     ArticleListResponse,
+    ArticleLookup,
+    ArticleLookupResponse,
+    ArticleProgress,
     ArticleResponse,
+    ArticleSearchResponse,
+    ArticleSearchResult,
+    ArticleSuggestion,
+    ArticleSuggestResponse,
     ArticleUpdate,
 )
+from schemas.sync import SyncResponse
+from schemas.tag import TagCount, TagListResponse
 from schemas.user import UserCreate, UserResponse, UserSession
 
 __all__ = [
@@ -24,5 +36,20 @@ __all__ = [
     "ArticleCreate",
     "ArticleResponse",
     "ArticleListResponse",
+    "ArticleLookup",
+    "ArticleLookupResponse",
     "ArticleUpdate",
+    "ArticleProgress",
+    "ArticleBulkUpdate",
+    "ArticleBulkResponse",
+    "ArticleCountsResponse",
+    "ArticleSearchResult",
+    "ArticleSearchResponse",
+    "ArticleSuggestion",
+    "ArticleSuggestResponse",
+    # Tag schemas
+    "TagCount",
+    "TagListResponse",
+    # Sync schemas
+    "SyncResponse",
 ]
@@ -6,8 +6,33 @@ used in API requests and responses.
 """
 
 from datetime import datetime
+from functools import lru_cache
+from typing import Literal
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    create_model,
+    model_validator,
+)
+
+from schemas.tag import MAX_TAGS, TagName
+
+# Upper bound on explicit IDs in one bulk request; larger selections
+# should use a filter instead.
+MAX_BULK_IDS = 1000
+
+# Upper bound on IDs in one lookup request.
+MAX_LOOKUP_IDS = 500
+
+BulkAction = Literal[
+    "archive", "unarchive", "favorite", "unfavorite", "tag", "untag", "delete"
+]
+
+# Dashboard tabs; "all" means every article that is not archived.
+ArticleFilter = Literal["all", "unread", "favorites", "archived"]
 
 
 class ArticleExtracted(BaseModel):
@@ -17,6 +42,7 @@ class ArticleExtracted(BaseModel):
     content: str
     excerpt: str
     image_url: str | None = None
+    content_html: str | None = None
 
 
 class ArticleCreate(BaseModel):
@@ -37,11 +63,34 @@ class ArticleResponse(BaseModel):
     image_url: str | None = None
     is_archived: bool = False
     is_favorite: bool = False
+    is_read: bool = False
+    read_progress: float = 0.0
+    tags: list[str] = []
     created_at: datetime | None = None
+    updated_at: datetime | None = None
 
     model_config = {"from_attributes": True}
 
 
+# ArticleResponse fields a lookup can select.
+ArticleField = Literal[
+    "id",
+    "user_id",
+    "url",
+    "title",
+    "content",
+    "excerpt",
+    "image_url",
+    "is_archived",
+    "is_favorite",
+    "is_read",
+    "read_progress",
+    "tags",
+    "created_at",
+    "updated_at",
+]
+
+
 class ArticleListResponse(BaseModel):
     """Response containing a list of articles."""
 
@@ -54,3 +103,157 @@ class ArticleUpdate(BaseModel):
 
     is_archived: bool | None = None
     is_favorite: bool | None = None
+    is_read: bool | None = None
+    tags: list[TagName] | None = Field(default=None, max_length=MAX_TAGS)
+
+
+class ArticleProgress(BaseModel):
+    """Reading position reported while an article is open."""
+
+    progress: float = Field(..., ge=0, le=1, description="Fraction read, 0 to 1")
+
+
+class ArticleSearchResult(BaseModel):
+    """
+    A single full-text search hit.
+
+    Content is omitted; snippet holds an HTML-escaped excerpt of the
+    matching text with matched terms wrapped in <mark> tags.
+    """
+
+    id: int
+    url: str
+    title: str | None = None
+    excerpt: str | None = None
+    image_url: str | None = None
+    is_archived: bool = False
+    is_favorite: bool = False
+    created_at: datetime | None = None
+    rank: float
+    snippet: str
+
+
+class ArticleSearchResponse(BaseModel):
+    """Paginated full-text search results."""
+
+    query: str
+    results: list[ArticleSearchResult]
+    total: int
+    limit: int
+    offset: int
+
+
+class ArticleSuggestion(BaseModel):
+    """A search-as-you-type match on title or URL host."""
+
+    id: int
+    url: str
+    title: str | None = None
+    host: str | None = None
+
+
+class ArticleSuggestResponse(BaseModel):
+    """Typeahead suggestions for a partial query."""
+
+    query: str
+    suggestions: list[ArticleSuggestion]
+
+
+class ArticleCountsResponse(BaseModel):
+    """Per-user article totals, one per dashboard tab."""
+
+    all: int
+    unread: int
+    favorites: int
+    archived: int
+
+
+class ArticleBulkUpdate(BaseModel):
+    """
+    Bulk action applied to many articles in one statement.
+
+    Articles are selected by explicit IDs, by a filter, by tag, by age, or
+    a combination (all given selectors must match). At least one selector
+    is required, and delete additionally needs ids or a filter, so that no
+    request can touch the whole library by accident. The tag and untag
+    actions add or remove the tag given in tag.
+    """
+
+    action: BulkAction
+    ids: list[int] | None = Field(default=None, max_length=MAX_BULK_IDS)
+    filter: ArticleFilter | None = None
+    tagged: TagName | None = None
+    older_than_days: int | None = Field(default=None, ge=1)
+    tag: TagName | None = None
+
+    @model_validator(mode="after")
+    def require_selector(self) -> "ArticleBulkUpdate":
+        """Reject requests that do not narrow down which articles to touch."""
+        selectors = (self.ids, self.filter, self.tagged, self.older_than_days)
+        if all(selector is None for selector in selectors):
+            raise ValueError("Provide ids, filter, tagged, or older_than_days")
+        if self.action == "delete" and self.ids is None and self.filter is None:
+            raise ValueError("Delete requires ids or filter")
+        if self.action in ("tag", "untag") and self.tag is None:
+            raise ValueError(f"{self.action} requires tag")
+        return self
+
+
+class ArticleBulkResponse(BaseModel):
+    """Result of a bulk action."""
+
+    action: BulkAction
+    count: int
+
+
+class ArticleLookup(BaseModel):
+    """
+    Articles to fetch by ID in one request.
+
+    When fields is given, only those fields (and id) are returned, and the
+    body is not loaded unless content is among them.
+    """
+
+    ids: list[int] = Field(..., min_length=1, max_length=MAX_LOOKUP_IDS)
+    fields: list[ArticleField] | None = Field(
+        default=None, min_length=1, description="Fields to return; all if omitted"
+    )
+
+
+class ArticleLookupResponse(BaseModel):
+    """Articles found by a lookup, in request order, and the IDs that were not."""
+
+    articles: list[ArticleResponse]
+    missing: list[int]
+
+
+@lru_cache
+def lookup_response_schema(fields: frozenset[str] | None) -> type[BaseModel]:
+    """
+    Return the lookup response schema limited to some article fields.
+
+    The articles are validated against a model with only those fields, so
+    unselected attributes are never read from the ORM objects.
+
+    Args:
+        fields: Selected ArticleResponse field names, or None for all.
+
+    Returns:
+        ArticleLookupResponse, or an equivalent model with fewer fields.
+    """
+    if fields is None:
+        return ArticleLookupResponse
+    article = create_model(
+        "ArticleSubset",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (info.annotation, info)
+            for name, info in ArticleResponse.model_fields.items()
+            if name in fields
+        },
+    )
+    return create_model(
+        "ArticleSubsetLookupResponse",
+        articles=(list[article], ...),
+        missing=(list[int], ...),
+    )
@@ -0,0 +1,27 @@
+"""
+Sync schemas for request/response validation.
+
+Used by the delta sync endpoint; see services.sync_service for how
+tokens and pages work.
+"""
+
+from pydantic import BaseModel
+
+from schemas.article import ArticleResponse
+
+# Largest page a client may ask for; bodies make sync pages heavy.
+MAX_SYNC_LIMIT = 500
+
+
+class SyncResponse(BaseModel):
+    """
+    One page of changes since a sync token.
+
+    Clients upsert changed articles, drop deleted IDs, store next_token,
+    and request again while has_more is true.
+    """
+
+    changed: list[ArticleResponse]
+    deleted: list[int]
+    next_token: str
+    has_more: bool
@@ -0,0 +1,29 @@
+"""
+Tag schemas for request/response validation.
+
+Tags are short user-defined labels; services.tag_service normalizes them
+(trimmed, lower-case, single spaces) before they are stored.
+"""
+
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+# Limits per article, keeping tag arrays and their index entries small.
+MAX_TAGS = 20
+MAX_TAG_LENGTH = 50
+
+TagName = Annotated[str, Field(min_length=1, max_length=MAX_TAG_LENGTH)]
+
+
+class TagCount(BaseModel):
+    """A tag and the number of the user's articles carrying it."""
+
+    tag: str
+    count: int
+
+
+class TagListResponse(BaseModel):
+    """All of a user's tags, alphabetically."""
+
+    tags: list[TagCount]
@@ -4,14 +4,42 @@ Article service - business logic for article operations.
 Handles article extraction, CRUD operations, and filtering.
 """
 
+import html
 import logging
+from collections.abc import Iterable
+from datetime import datetime, timedelta
 from urllib.parse import urlparse
 
 from newspaper import Article as NewspaperArticle
+from sqlalchemy import (
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    literal_column,
+    not_,
+    or_,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import defer
 from sqlmodel import Session, select
 
-from core.models import Article
-from schemas.article import ArticleExtracted
+from core import invalidation, sqlite
+from core.cache import TTLCache
+from core.migrations import SEARCH_CONFIG
+from core.models import Article, utc_now
+from core.sanitize import sanitize_html
+from schemas.article import (
+    ArticleExtracted,
+    ArticleResponse,
+    ArticleSearchResult,
+    ArticleSuggestion,
+)
+from services import content_service, counts_service, sync_service, tag_service
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +93,8 @@ def extract_article_content(url: str) -> ArticleExtracted:
         url: The URL to fetch and extract content from.
 
     Returns:
-        ArticleExtracted with title, content, excerpt, and image_url.
+        ArticleExtracted with title, content, excerpt, image_url, and
+        sanitized content_html.
     """
     parsed = urlparse(url)
 
@@ -81,7 +110,7 @@ def extract_article_content(url: str) -> ArticleExtracted:
         )
 
     try:
-        article = NewspaperArticle(url)
+        article = NewspaperArticle(url, keep_article_html=True)
         article.download()
         article.parse()
 
@@ -97,11 +126,15 @@ def extract_article_content(url: str) -> ArticleExtracted:
         # Create excerpt (first 200 characters)
         excerpt = content[:200] + "..." if len(content) > 200 else content
 
+        # Keep the article's structure for the reader, sanitized once here
+        content_html = sanitize_html(article.article_html or "", url) or None
+
         return ArticleExtracted(
             title=title,
             content=content,
             excerpt=excerpt,
             image_url=image_url,
+            content_html=content_html,
         )
     except Exception as e:
         logger.error(f"Error extracting content from URL: {e}")
@@ -121,10 +154,14 @@ def create_article(
     content: str,
     excerpt: str,
     image_url: str | None,
+    content_html: str | None = None,
 ) -> Article:
     """
     Create a new article in the database.
 
+    The body is stored compressed when content compression is enabled; the
+    returned Article still has the plain content.
+
     Args:
         session: Database session.
         user_id: ID of the user saving the article.
@@ -133,6 +170,7 @@ def create_article(
         content: Full article content.
         excerpt: Short excerpt/summary.
         image_url: URL of the article's main image.
+        content_html: Sanitized reader HTML (see core.sanitize), if any.
 
     Returns:
         The newly created Article.
@@ -144,15 +182,103 @@ def create_article(
         content=content,
         excerpt=excerpt,
         image_url=image_url,
+        content_html=content_html,
     )
+    compressed = bool(content) and content_service.compression_enabled()
+    if compressed:
+        article.content = None
+        article.content_zstd, article.content_dictionary_id = content_service.pack(
+            session, content
+        )
     session.add(article)
+    if compressed:
+        session.flush()
+        content_service.index_body(session, article, content)
+    counts_service.apply_delta(
+        session, user_id, counts_service.count_delta(None, _buckets(article))
+    )
     session.commit()
     session.refresh(article)
 
-    return article
+    return content_service.inflate(session, article)
+
+
+# Serialized ArticleResponse JSON, its updated_at and its compressed copies
+# (filled by core.http_compression) per (user_id, article_id).
+# Mutations below publish the articles they touch, which evicts them here
+# on commit and in other workers via core.invalidation; a read racing a
+# write can still re-cache the old version, for at most the TTL.
+_article_cache = TTLCache(maxsize=256, ttl=60.0, name="article")
+
+
+def get_article_payload(
+    session: Session, article_id: int, user_id: int
+) -> tuple[datetime, bytes, dict[str, bytes]] | None:
+    """
+    Get an article serialized as ArticleResponse JSON, from cache if possible.
+
+    A hit touches neither the database nor Pydantic.
+
+    Args:
+        session: Database session (only used on a miss).
+        article_id: ID of the article.
+        user_id: ID of the user (for ownership check).
+
+    Returns:
+        Tuple of (updated_at, JSON bytes, compressed copies of the JSON by
+        content coding), or None if not found or not owned by user.
+    """
+    key = (user_id, article_id)
+    cached = _article_cache.get(key)
+    if cached is not None:
+        return cached
+
+    article = get_article_by_id(session, article_id, user_id)
+    if article is None:
+        return None
+    entry = (
+        article.updated_at,
+        ArticleResponse.model_validate(article).model_dump_json().encode(),
+        {},
+    )
+    _article_cache.set(key, entry)
+    return entry
+
+
+def invalidate_articles(
+    session: Session, user_id: int, article_ids: Iterable[int]
+) -> None:
+    """
+    Evict cached payloads of changed or deleted articles once committed.
+
+    Call inside the transaction making the change; every worker evicts
+    the articles when it commits (see core.invalidation).
+
+    Args:
+        session: Session whose transaction changes the articles.
+        user_id: ID of the articles' owner.
+        article_ids: IDs of the changed articles.
+    """
+    invalidation.publish(session, "article", user_id, article_ids)
+
+
+def _evict_articles(user_id: int | None, article_ids: list[int] | None) -> None:
+    """Invalidation handler for the article cache."""
+    if user_id is None:
+        _article_cache.clear()
+    elif article_ids is None:
+        _article_cache.delete_where(lambda key: key[0] == user_id)
+    else:
+        for article_id in article_ids:
+            _article_cache.delete((user_id, article_id))
 
 
-def get_article_by_id(session: Session, article_id: int, user_id: int) -> Article | None:
+invalidation.subscribe("article", _evict_articles)
+
+
+def get_article_by_id(
+    session: Session, article_id: int, user_id: int
+) -> Article | None:
     """
     Get an article by ID, ensuring it belongs to the user.
 
@@ -164,41 +290,446 @@ def get_article_by_id(session: Session, article_id: int, user_id: int) -> Articl
     Returns:
         Article if found and owned by user, None otherwise.
     """
-    return session.exec(
+    article = session.exec(
         select(Article).where(Article.id == article_id, Article.user_id == user_id)
     ).first()
+    return content_service.inflate(session, article)
 
 
-def list_articles(session: Session, user_id: int, filter_type: str = "all") -> list[Article]:
+def list_articles(
+    session: Session,
+    user_id: int,
+    filter_type: str = "all",
+    tag: str | None = None,
+    with_content: bool = True,
+) -> list[Article]:
     """
     List articles for a user with optional filtering.
 
     Args:
         session: Database session.
         user_id: ID of the user.
-        filter_type: One of 'all', 'favorites', or 'archived'.
+        filter_type: One of 'all', 'unread', 'favorites', or 'archived'.
+        tag: Only list articles carrying this tag.
+        with_content: Load and inflate bodies; when False, body columns
+            are deferred and must not be read.
 
     Returns:
         List of Articles.
     """
-    query = select(Article).where(Article.user_id == user_id)
+    query = select(Article).where(
+        Article.user_id == user_id, *_filter_conditions(filter_type)
+    )
+    if tag is not None:
+        query = query.where(tag_service.tag_condition(session, tag))
+    query = query.order_by(Article.created_at.desc())
+    if not with_content:
+        return list(session.exec(_without_bodies(query)).all())
 
-    if filter_type == "favorites":
-        query = query.where(Article.is_archived == False, Article.is_favorite == True)
-    elif filter_type == "archived":
-        query = query.where(Article.is_archived == True)
+    return [content_service.inflate(session, a) for a in session.exec(query).all()]
+
+
+def lookup_articles(
+    session: Session, user_id: int, article_ids: list[int], with_content: bool = True
+) -> list[Article]:
+    """
+    Get many of a user's articles by ID in one query.
+
+    IDs that do not exist or belong to other users are skipped.
+
+    Args:
+        session: Database session.
+        user_id: ID of the user (for ownership check).
+        article_ids: IDs of the articles, without duplicates.
+        with_content: Load and inflate bodies; when False, body columns
+            are deferred and must not be read.
+
+    Returns:
+        Articles found, in the order of article_ids.
+    """
+    query = select(Article).where(
+        Article.user_id == user_id, Article.id.in_(article_ids)
+    )
+    if not with_content:
+        query = _without_bodies(query)
+    found = {article.id: article for article in session.exec(query).all()}
+    articles = [found[i] for i in article_ids if i in found]
+    if with_content:
+        articles = [content_service.inflate(session, a) for a in articles]
+    return articles
+
+
+def _without_bodies(query):
+    """Defer the body columns of a query's articles, which are not inflated."""
+    return query.options(
+        defer(Article.content),
+        defer(Article.content_zstd),
+        defer(Article.content_html),
+    )
+
+
+def get_article_version(
+    session: Session, article_id: int, user_id: int
+) -> datetime | None:
+    """
+    Get when an article last changed, without loading its body.
+
+    Args:
+        session: Database session.
+        article_id: ID of the article.
+        user_id: ID of the user (for ownership check).
+
+    Returns:
+        The article's updated_at, or None if not found or not owned by user.
+    """
+    return session.exec(
+        select(Article.updated_at).where(
+            Article.id == article_id, Article.user_id == user_id
+        )
+    ).first()
+
+
+# ts_headline() marks matches with these sentinels rather than HTML so the
+# snippet can be escaped safely before <mark> tags are substituted in.
+_HIGHLIGHT_START = "\x02"
+_HIGHLIGHT_STOP = "\x03"
+_HEADLINE_OPTIONS = (
+    f"StartSel={_HIGHLIGHT_START}, StopSel={_HIGHLIGHT_STOP}, "
+    'MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" ... "'
+)
+
+
+def search_articles(
+    session: Session,
+    user_id: int,
+    query: str,
+    filter_type: str | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[ArticleSearchResult], int]:
+    """
+    Full-text search over a user's articles.
+
+    Matches against the GIN-indexed search_vector column (title, excerpt
+    and content, weighted in that order), ranks with ts_rank, and builds
+    highlighted snippets with ts_headline. Snippets are only generated for
+    the rows on the requested page, since ts_headline has to re-parse the
+    article body.
+
+    On SQLite the FTS5 index is used instead (see _search_articles_fts).
+
+    Args:
+        session: Database session.
+        user_id: ID of the user.
+        query: Search text in web search syntax ("quoted phrases", -exclude, or).
+        filter_type: Optionally restrict to 'all', 'unread', 'favorites', or
+            'archived'.
+        limit: Maximum number of results to return.
+        offset: Number of results to skip.
+
+    Returns:
+        Tuple of (results for this page, total number of matches).
+    """
+    query = query.strip()
+    if not query:
+        return [], 0
+    if _dialect(session) == "sqlite":
+        return _search_articles_fts(session, user_id, query, filter_type, limit, offset)
+
+    config = cast(SEARCH_CONFIG, REGCONFIG)
+    ts_query = func.websearch_to_tsquery(config, query)
+    search_vector = literal_column("article.search_vector")
+    rank = func.ts_rank(search_vector, ts_query)
+
+    conditions = [Article.user_id == user_id, search_vector.op("@@")(ts_query)]
+    if filter_type is not None:
+        conditions.extend(_filter_conditions(filter_type))
+
+    # Rank and paginate first, counting all matches with a window function,
+    # then join back for the snippets of just this page.
+    page = (
+        select(
+            Article.id,
+            rank.label("rank"),
+            func.count().over().label("total"),
+        )
+        .where(*conditions)
+        .order_by(rank.desc(), Article.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    snippet = func.ts_headline(
+        config,
+        func.coalesce(Article.content, Article.excerpt, ""),
+        ts_query,
+        _HEADLINE_OPTIONS,
+    )
+    statement = (
+        select(
+            Article.id,
+            Article.url,
+            Article.title,
+            Article.excerpt,
+            Article.image_url,
+            Article.is_archived,
+            Article.is_favorite,
+            Article.created_at,
+            page.c.rank,
+            page.c.total,
+            snippet.label("snippet"),
+        )
+        .join(page, page.c.id == Article.id)
+        .order_by(page.c.rank.desc(), Article.created_at.desc())
+    )
+    rows = session.execute(statement).all()
+
+    if not rows:
+        # Past the last page the window count is unavailable; recount.
+        total = 0
+        if offset:
+            total = session.execute(
+                select(func.count()).select_from(Article).where(*conditions)
+            ).scalar_one()
+        return [], total
+
+    results = [
+        ArticleSearchResult(
+            id=row.id,
+            url=row.url,
+            title=row.title,
+            excerpt=row.excerpt,
+            image_url=row.image_url,
+            is_archived=row.is_archived,
+            is_favorite=row.is_favorite,
+            created_at=row.created_at,
+            rank=row.rank,
+            snippet=_highlight_snippet(row.snippet),
+        )
+        for row in rows
+    ]
+    return results, rows[0].total
+
+
+def _search_articles_fts(
+    session: Session,
+    user_id: int,
+    query: str,
+    filter_type: str | None,
+    limit: int,
+    offset: int,
+) -> tuple[list[ArticleSearchResult], int]:
+    """
+    SQLite version of search_articles() using the article_fts FTS5 index.
+
+    All words must match; web search operators are treated as plain words.
+    Ranked by bm25 with the same title > excerpt > content weighting.
+    """
+    match = sqlite.fts_query(query)
+    if not match:
+        return [], 0
+
+    fts = table("article_fts", column("rowid"))
+    bm25 = literal_column("bm25(article_fts, 10.0, 5.0, 1.0)")
+    snippet = literal_column(
+        f"snippet(article_fts, -1, '{_HIGHLIGHT_START}', '{_HIGHLIGHT_STOP}', "
+        "' ... ', 35)"
+    )
+    conditions = [
+        Article.user_id == user_id,
+        literal_column("article_fts").op("MATCH")(match),
+    ]
+    if filter_type is not None:
+        conditions.extend(_filter_conditions(filter_type))
+
+    # FTS5 auxiliary functions (bm25, snippet) cannot be combined with a
+    # window function, so the total is counted separately; both queries
+    # are in-process and cheap on SQLite.
+    total = session.execute(
+        select(func.count())
+        .select_from(Article)
+        .join(fts, fts.c.rowid == Article.id)
+        .where(*conditions)
+    ).scalar_one()
+    statement = (
+        select(
+            Article.id,
+            Article.url,
+            Article.title,
+            Article.excerpt,
+            Article.image_url,
+            Article.is_archived,
+            Article.is_favorite,
+            Article.created_at,
+            (-bm25).label("rank"),
+            snippet.label("snippet"),
+        )
+        .select_from(Article)
+        .join(fts, fts.c.rowid == Article.id)
+        .where(*conditions)
+        .order_by(bm25, Article.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    rows = session.execute(statement).all()
+
+    results = [
+        ArticleSearchResult(
+            id=row.id,
+            url=row.url,
+            title=row.title,
+            excerpt=row.excerpt,
+            image_url=row.image_url,
+            is_archived=row.is_archived,
+            is_favorite=row.is_favorite,
+            created_at=row.created_at,
+            rank=row.rank,
+            snippet=_highlight_snippet(row.snippet or row.excerpt or ""),
+        )
+        for row in rows
+    ]
+    return results, total
+
+
+def _highlight_snippet(snippet: str) -> str:
+    """Escape a ts_headline() snippet and turn match sentinels into <mark> tags."""
+    return (
+        html.escape(snippet)
+        .replace(_HIGHLIGHT_START, "<mark>")
+        .replace(_HIGHLIGHT_STOP, "</mark>")
+    )
+
+
+# Typeahead fires on every keystroke, so identical prefixes from the same
+# user are served from memory for a few seconds. New or deleted articles
+# may take up to the TTL to show up in suggestions.
+_suggest_cache = TTLCache(maxsize=2048, ttl=30.0, name="suggest")
+
+# Whether pg_trgm is installed; looked up once per process.
+_trigram_available: bool | None = None
+
+SUGGEST_MIN_LENGTH = 2
+
+
+def suggest_articles(
+    session: Session, user_id: int, query: str, limit: int = 8
+) -> list[ArticleSuggestion]:
+    """
+    Fuzzy search-as-you-type over article titles and URL hosts.
+
+    With pg_trgm this matches partial words and typos ("arstecnica") using
+    the trigram GIN indexes on title and url_host, ranked by word
+    similarity. Without it, falls back to case-insensitive substring
+    matching, newest first.
+
+    Args:
+        session: Database session.
+        user_id: ID of the user.
+        query: Partial text typed by the user.
+        limit: Maximum number of suggestions.
+
+    Returns:
+        Matching articles, best first. Empty for queries shorter than
+        SUGGEST_MIN_LENGTH characters.
+    """
+    query = " ".join(query.split()).lower()
+    if len(query) < SUGGEST_MIN_LENGTH:
+        return []
+
+    cache_key = (user_id, query, limit)
+    cached = _suggest_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if _dialect(session) == "sqlite":
+        url_host = func.url_host(Article.url)
     else:
-        query = query.where(Article.is_archived == False)
+        url_host = literal_column("article.url_host")
+    pattern = "%" + _escape_like(query) + "%"
+    conditions = [
+        Article.title.ilike(pattern, escape="\\"),
+        url_host.ilike(pattern, escape="\\"),
+    ]
 
-    query = query.order_by(Article.created_at.desc())
+    if _has_trigram(session):
+        # %> is "word similarity above threshold", served by gin_trgm_ops.
+        conditions += [Article.title.op("%>")(query), url_host.op("%>")(query)]
+        score = func.greatest(
+            func.word_similarity(query, func.coalesce(Article.title, "")),
+            func.word_similarity(query, func.coalesce(url_host, "")),
+        )
+        order_by = [score.desc(), Article.created_at.desc()]
+    else:
+        order_by = [Article.created_at.desc()]
+
+    statement = (
+        select(Article.id, Article.url, Article.title, url_host.label("host"))
+        .where(Article.user_id == user_id, or_(*conditions))
+        .order_by(*order_by)
+        .limit(limit)
+    )
+    suggestions = [
+        ArticleSuggestion(id=row.id, url=row.url, title=row.title, host=row.host)
+        for row in session.execute(statement)
+    ]
+    _suggest_cache.set(cache_key, suggestions)
+    return suggestions
+
+
+def _has_trigram(session: Session) -> bool:
+    """Return True if the pg_trgm extension is installed (cached per process)."""
+    global _trigram_available
+    if _dialect(session) != "postgresql":
+        return False
+    if _trigram_available is None:
+        _trigram_available = (
+            session.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).first()
+            is not None
+        )
+    return _trigram_available
+
+
+def _dialect(session: Session) -> str:
+    """Return the database dialect name, e.g. 'postgresql' or 'sqlite'."""
+    return session.get_bind().dialect.name
 
-    return list(session.exec(query).all())
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _filter_conditions(filter_type: str) -> list:
+    """
+    Build WHERE conditions for a dashboard filter.
+
+    Args:
+        filter_type: One of 'all', 'unread', 'favorites', or 'archived'.
+
+    Returns:
+        List of SQL expressions to AND together.
+    """
+    if filter_type == "unread":
+        # Matches the predicate of the ix_article_user_unread partial index.
+        return [Article.is_read == False, Article.is_archived == False]
+    if filter_type == "favorites":
+        return [Article.is_archived == False, Article.is_favorite == True]
+    if filter_type == "archived":
+        return [Article.is_archived == True]
+    return [Article.is_archived == False]
 
 
 def toggle_favorite(session: Session, article_id: int, user_id: int) -> bool:
     """
     Toggle the favorite status of an article.
 
+    Flips the flag in a single UPDATE ... RETURNING statement that also
+    moves the counts and announces the change (see _toggle_flag()), so
+    the ownership check, the write and its side effects take one round
+    trip, and concurrent toggles cannot lose each other's updates.
+
     Args:
         session: Database session.
         article_id: ID of the article.
@@ -207,21 +738,15 @@ def toggle_favorite(session: Session, article_id: int, user_id: int) -> bool:
     Returns:
         True if the operation succeeded.
     """
-    article = get_article_by_id(session, article_id, user_id)
-    if not article:
-        return False
-
-    article.is_favorite = not article.is_favorite
-    session.add(article)
-    session.commit()
-
-    return True
+    return _toggle_flag(session, article_id, user_id, "is_favorite")
 
 
 def toggle_archive(session: Session, article_id: int, user_id: int) -> bool:
     """
     Toggle the archive status of an article.
 
+    See toggle_favorite() for why this is a single statement.
+
     Args:
         session: Database session.
         article_id: ID of the article.
@@ -230,21 +755,205 @@ def toggle_archive(session: Session, article_id: int, user_id: int) -> bool:
     Returns:
         True if the operation succeeded.
     """
-    article = get_article_by_id(session, article_id, user_id)
-    if not article:
-        return False
+    return _toggle_flag(session, article_id, user_id, "is_archived")
 
-    article.is_archived = not article.is_archived
-    session.add(article)
+
+def toggle_read(session: Session, article_id: int, user_id: int) -> bool:
+    """
+    Toggle the read status of an article.
+
+    See toggle_favorite() for why this is a single statement.
+
+    Args:
+        session: Database session.
+        article_id: ID of the article.
+        user_id: ID of the user (for ownership check).
+
+    Returns:
+        True if the operation succeeded.
+    """
+    return _toggle_flag(session, article_id, user_id, "is_read")
+
+
+def _toggle_flag(session: Session, article_id: int, user_id: int, field: str) -> bool:
+    """
+    Flip a boolean column on one article with UPDATE ... RETURNING.
+
+    On PostgreSQL the counts update and the invalidation notice ride along
+    as data-modifying CTEs of the same statement, so a toggle costs one
+    round trip plus the commit. SQLite runs them one by one; its
+    statements are local calls.
+    """
+    column = getattr(Article, field)
+    values = {field: not_(column), "updated_at": utc_now()}
+    if field == "is_archived":
+        values["archived_at"] = case((column == True, None), else_=utc_now())
+    statement = (
+        update(Article)
+        .where(Article.id == article_id, Article.user_id == user_id)
+        .values(values)
+        .returning(
+            Article.user_id, Article.is_favorite, Article.is_archived, Article.is_read
+        )
+    )
+
+    if _dialect(session) == "sqlite":
+        row = session.execute(statement).first()
+        if row is not None:
+            new = dict(row._mapping)
+            old = {**new, field: not new[field]}
+            counts_service.apply_delta(
+                session,
+                user_id,
+                counts_service.count_delta(_buckets(old), _buckets(new)),
+            )
+            invalidate_articles(session, user_id, [article_id])
+    else:
+        toggled = statement.cte("toggled")
+        flags = [toggled.c.is_favorite, toggled.c.is_archived, toggled.c.is_read]
+        old_flags = [not_(flag) if flag.name == field else flag for flag in flags]
+        # Joining toggled means no counts change unless the article did.
+        counted = counts_service.delta_update(
+            toggled.c.user_id,
+            counts_service.bucket_conditions(*old_flags),
+            counts_service.bucket_conditions(*flags),
+        )
+        row = session.execute(
+            select(
+                *flags, invalidation.notification("article", user_id, [article_id])
+            ).add_cte(counted.cte("counted"))
+        ).first()
+        if row is not None:
+            invalidation.publish(
+                session, "article", user_id, [article_id], notified=True
+            )
     session.commit()
 
-    return True
+    return row is not None
+
+
+def update_article(
+    session: Session,
+    article_id: int,
+    user_id: int,
+    is_favorite: bool | None = None,
+    is_archived: bool | None = None,
+    is_read: bool | None = None,
+    tags: list[str] | None = None,
+) -> Article | None:
+    """
+    Set article fields in a single UPDATE ... RETURNING statement.
+
+    Fields left as None are not touched. If no fields are given this
+    falls back to a plain lookup. The returned Article is built from the
+    RETURNING row and is not attached to the session, so reading it after
+    the commit does not trigger a refresh query. The previous flags come
+    back in the same row (via a locked self-join) to adjust the counters
+    and tag counts.
+
+    Args:
+        session: Database session.
+        article_id: ID of the article.
+        user_id: ID of the user (for ownership check).
+        is_favorite: New favorite status, if changing.
+        is_archived: New archive status, if changing.
+        is_read: New read status, if changing.
+        tags: New tags, replacing the current ones, if changing.
+
+    Returns:
+        The updated Article, or None if not found or not owned by user.
+    """
+    values = {}
+    if is_favorite is not None:
+        values["is_favorite"] = is_favorite
+    if is_archived is not None:
+        values["is_archived"] = is_archived
+        values["archived_at"] = _archived_at(is_archived)
+    if is_read is not None:
+        values["is_read"] = is_read
+    if tags is not None:
+        values["tags"] = tag_service.normalize_tags(tags)
+
+    if not values:
+        return get_article_by_id(session, article_id, user_id)
+    values["updated_at"] = utc_now()
+
+    ownership = [Article.id == article_id, Article.user_id == user_id]
+    columns = Article.__table__.columns
+    if _dialect(session) == "sqlite":
+        # SQLite's RETURNING cannot see UPDATE ... FROM tables, so read the
+        # old flags first; with a single writer the window is tiny and the
+        # reconcile job repairs any drift.
+        old_flags = session.execute(
+            select(
+                Article.is_favorite, Article.is_archived, Article.is_read, Article.tags
+            ).where(*ownership)
+        ).first()
+        previous = dict(old_flags._mapping) if old_flags else None
+        statement = update(Article).where(*ownership).values(values).returning(*columns)
+    else:
+        old = (
+            select(
+                Article.id,
+                Article.is_favorite,
+                Article.is_archived,
+                Article.is_read,
+                Article.tags,
+            )
+            .where(*ownership)
+            .with_for_update()
+            .subquery("old")
+        )
+        statement = (
+            update(Article)
+            .where(Article.id == old.c.id, Article.user_id == user_id)
+            .values(values)
+            .returning(
+                *columns,
+                old.c.is_favorite.label("old_is_favorite"),
+                old.c.is_archived.label("old_is_archived"),
+                old.c.is_read.label("old_is_read"),
+                old.c.tags.label("old_tags"),
+            )
+        )
+    row = session.execute(statement).first()
+    if row is None:
+        session.commit()
+        return None
+
+    fields = row._mapping
+    article = content_service.inflate(
+        session, Article(**{c.key: fields[c] for c in columns})
+    )
+    if _dialect(session) != "sqlite":
+        previous = {
+            "is_favorite": fields["old_is_favorite"],
+            "is_archived": fields["old_is_archived"],
+            "is_read": fields["old_is_read"],
+            "tags": fields["old_tags"],
+        }
+    counts_service.apply_delta(
+        session,
+        user_id,
+        counts_service.count_delta(_buckets(previous), _buckets(article)),
+    )
+    tag_service.apply_delta(
+        session, user_id, tag_service.tag_delta(previous["tags"], article.tags)
+    )
+    invalidate_articles(session, user_id, [article_id])
+    session.commit()
+
+    return article
 
 
 def delete_article(session: Session, article_id: int, user_id: int) -> bool:
     """
     Delete an article.
 
+    Uses DELETE ... RETURNING so the removed article's flags and tags are
+    known for the counters without loading it first. A tombstone is left
+    for delta sync.
+
     Args:
         session: Database session.
         article_id: ID of the article.
@@ -253,11 +962,153 @@ def delete_article(session: Session, article_id: int, user_id: int) -> bool:
     Returns:
         True if the article was deleted.
     """
-    article = get_article_by_id(session, article_id, user_id)
-    if not article:
+    statement = (
+        delete(Article)
+        .where(Article.id == article_id, Article.user_id == user_id)
+        .returning(
+            Article.is_favorite, Article.is_archived, Article.is_read, Article.tags
+        )
+    )
+    row = session.execute(statement).first()
+    if row is None:
+        session.commit()
         return False
 
-    session.delete(article)
+    sync_service.record_deletes(session, user_id, [article_id])
+    counts_service.apply_delta(
+        session, user_id, counts_service.count_delta(_buckets(row._mapping), None)
+    )
+    tag_service.apply_delta(session, user_id, tag_service.tag_delta(row.tags, []))
+    invalidate_articles(session, user_id, [article_id])
     session.commit()
 
     return True
+
+
+def _archived_at(is_archived: bool):
+    """archived_at value to write alongside is_archived (keeps earlier stamps)."""
+    if not is_archived:
+        return None
+    return case((Article.is_archived == True, Article.archived_at), else_=utc_now())
+
+
+# Column values written by each bulk action (tag, untag and delete are
+# handled separately).
+_BULK_ACTION_VALUES = {
+    "archive": lambda: {"is_archived": True, "archived_at": _archived_at(True)},
+    "unarchive": lambda: {"is_archived": False, "archived_at": None},
+    "favorite": lambda: {"is_favorite": True},
+    "unfavorite": lambda: {"is_favorite": False},
+}
+
+
+def bulk_update_articles(
+    session: Session,
+    user_id: int,
+    action: str,
+    article_ids: list[int] | None = None,
+    filter_type: str | None = None,
+    older_than_days: int | None = None,
+    tagged: str | None = None,
+    tag: str | None = None,
+) -> int:
+    """
+    Apply an action to many articles in one set-based statement.
+
+    Selectors are combined with AND, and ownership is always enforced, so
+    IDs belonging to other users are silently ignored.
+
+    Args:
+        session: Database session.
+        user_id: ID of the user (for ownership check).
+        action: One of 'archive', 'unarchive', 'favorite', 'unfavorite',
+            'tag', 'untag', 'delete'.
+        article_ids: Restrict to these article IDs.
+        filter_type: Restrict to a dashboard filter ('all', 'unread', 'favorites',
+            'archived').
+        older_than_days: Restrict to articles saved more than this many days ago.
+        tagged: Restrict to articles carrying this tag.
+        tag: Tag to add or remove, for the tag and untag actions.
+
+    Returns:
+        Number of articles affected.
+
+    Raises:
+        ValueError: If the action is unknown or tag is missing.
+    """
+    tag_actions = ("tag", "untag")
+    if action not in ("delete", *tag_actions, *_BULK_ACTION_VALUES):
+        raise ValueError(f"Unknown bulk action: {action}")
+    if action in tag_actions:
+        normalized = tag_service.normalize_tags([tag or ""])
+        if not normalized:
+            raise ValueError(f"Bulk {action} requires a tag")
+        tag = normalized[0]
+
+    conditions = [Article.user_id == user_id]
+    if article_ids is not None:
+        if not article_ids:
+            return 0
+        conditions.append(Article.id.in_(article_ids))
+    if filter_type is not None:
+        conditions.extend(_filter_conditions(filter_type))
+    if older_than_days is not None:
+        conditions.append(
+            Article.created_at < utc_now() - timedelta(days=older_than_days)
+        )
+    if tagged is not None:
+        conditions.append(tag_service.tag_condition(session, tagged))
+
+    if action == "delete":
+        statement = delete(Article).where(*conditions)
+    elif action in tag_actions:
+        # Only touch articles whose tags change, so the row count is the delta.
+        has_tag = tag_service.tag_condition(session, tag)
+        if action == "tag":
+            conditions.append(not_(has_tag))
+            tags = tag_service.with_tag(session, tag)
+        else:
+            conditions.append(has_tag)
+            tags = tag_service.without_tag(session, tag)
+        statement = (
+            update(Article).where(*conditions).values(tags=tags, updated_at=utc_now())
+        )
+    else:
+        statement = (
+            update(Article)
+            .where(*conditions)
+            .values({**_BULK_ACTION_VALUES[action](), "updated_at": utc_now()})
+        )
+
+    touched_ids = session.execute(statement.returning(Article.id)).scalars().all()
+    affected = len(touched_ids)
+    if action == "delete":
+        sync_service.record_deletes(session, user_id, touched_ids)
+    if action in tag_actions:
+        sign = 1 if action == "tag" else -1
+        tag_service.apply_delta(session, user_id, {tag: sign * affected})
+    elif affected:
+        # Per-row deltas would need every old flag back; one aggregate over
+        # the user's articles is cheaper and also repairs any drift.
+        counts_service.reconcile_counts(session, user_id)
+        if action == "delete":
+            tag_service.reconcile_tags(session, user_id)
+    if affected:
+        # Moves the library version, also where no count changed.
+        counts_service.apply_delta(session, user_id, {})
+    invalidate_articles(session, user_id, touched_ids)
+    session.commit()
+
+    logger.info(f"Bulk {action} affected {affected} articles for user {user_id}")
+    return affected
+
+
+def _buckets(article) -> dict[str, int]:
+    """Counter buckets for an Article, RETURNING row mapping, or flag dict."""
+    if isinstance(article, Article):
+        return counts_service.count_buckets(
+            article.is_favorite, article.is_archived, article.is_read
+        )
+    return counts_service.count_buckets(
+        article["is_favorite"], article["is_archived"], article["is_read"]
+    )
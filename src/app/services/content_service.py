@@ -0,0 +1,424 @@
+"""
+Content service - transparent compressed storage for article bodies.
+
+With CONTENT_COMPRESSION enabled, article bodies are stored zstd-compressed
+in article.content_zstd (using the newest trained dictionary) and
+article.content is NULL. Services call inflate() on loaded articles so
+callers always see plain article.content; reads never rewrite storage.
+Rows saved before compression was enabled are compressed in batches by
+`python -m jobs compress-content`.
+
+Bodies of long-archived articles can also be moved out of the table into
+a content-addressed blob store on disk (offload_archived); the row keeps
+only article.content_blob and inflate() fetches the body on demand.
+Articles unarchived since are moved back by the same job
+(restore_unarchived).
+
+Bodies stay searchable in any storage: on PostgreSQL the search vector
+keeps a body's lexemes when it leaves the content column (see
+core.migrations.SEARCH_TRIGGER_DDL and index_body), and on SQLite the FTS5
+index reads bodies through article_body() (see core.sqlite).
+"""
+
+import logging
+import threading
+import time
+from datetime import timedelta
+
+import zstandard
+from sqlalchemy import cast, column, func, table, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session, select
+
+from core.blobstore import get_blob_store
+from core.compression import compress_text, decompress_text, train_dictionary
+from core.config import get_settings
+from core.migrations import SEARCH_CONFIG
+from core.models import Article, ContentDictionary, utc_now
+
+logger = logging.getLogger(__name__)
+
+# Dictionaries never change once stored, so they are cached per process.
+_dictionaries: dict[int, bytes] = {}
+_dictionaries_lock = threading.Lock()
+
+
+def compression_enabled() -> bool:
+    """Return True if new article bodies should be stored compressed."""
+    return get_settings().content_compression
+
+
+def get_dictionary(session: Session, dictionary_id: int) -> bytes:
+    """
+    Get a stored dictionary's bytes.
+
+    Args:
+        session: Database session.
+        dictionary_id: ID of the dictionary.
+
+    Returns:
+        Raw dictionary bytes.
+    """
+    with _dictionaries_lock:
+        data = _dictionaries.get(dictionary_id)
+    if data is None:
+        data = session.get(ContentDictionary, dictionary_id).data
+        with _dictionaries_lock:
+            _dictionaries[dictionary_id] = data
+    return data
+
+
+def latest_dictionary_id(session: Session) -> int | None:
+    """Return the ID of the newest dictionary, or None if none is trained."""
+    return session.exec(select(func.max(ContentDictionary.id))).one()
+
+
+def pack(session: Session, content: str) -> tuple[bytes, int | None]:
+    """
+    Compress an article body with the newest dictionary.
+
+    Args:
+        session: Database session.
+        content: Plain article body.
+
+    Returns:
+        Tuple of (compressed bytes, dictionary ID or None).
+    """
+    dictionary_id = latest_dictionary_id(session)
+    dictionary = get_dictionary(session, dictionary_id) if dictionary_id else None
+    return compress_text(content, dictionary), dictionary_id
+
+
+def inflate(session: Session, article: Article | None) -> Article | None:
+    """
+    Make article.content hold the plain body, whatever its storage.
+
+    The decompressed body is set as the committed value, so it is not
+    written back on the next flush.
+
+    Args:
+        session: Database session.
+        article: Loaded article, or None.
+
+    Returns:
+        The same article, for chaining.
+    """
+    if article is None:
+        return None
+
+    if article.content_blob is not None:
+        body = get_blob_store().get(article.content_blob)
+        set_committed_value(article, "content", body)
+    elif article.content_zstd is not None:
+        body = _unpack(session, article.content_zstd, article.content_dictionary_id)
+        set_committed_value(article, "content", body)
+
+    return article
+
+
+def index_body(session: Session, article, body: str) -> None:
+    """
+    Add the lexemes of a body not stored in article.content to its search vector.
+
+    The PostgreSQL search trigger indexes plain content itself and keeps
+    body lexemes when content is emptied, so this is only needed for a
+    body written compressed to begin with, or indexed before the trigger
+    existed. Does nothing on SQLite, whose FTS5 index reads any storage.
+
+    Args:
+        session: Database session (not committed).
+        article: Anything with id and user_id.
+        body: Plain article body.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    search = table("article", column("id"), column("user_id"), column("search_vector"))
+    vector = func.to_tsvector(cast(SEARCH_CONFIG, REGCONFIG), body)
+    session.execute(
+        update(search)
+        .where(search.c.id == article.id, search.c.user_id == article.user_id)
+        .values(search_vector=func.setweight(vector, "C"))
+    )
+
+
+def compress_existing(session: Session, batch_size: int = 500) -> int:
+    """
+    Compress one batch of plain-text article bodies.
+
+    Args:
+        session: Database session.
+        batch_size: Maximum number of articles to compress.
+
+    Returns:
+        Number of articles compressed; 0 when none are left.
+    """
+    rows = session.exec(
+        select(Article.id, Article.user_id, Article.content)
+        .where(Article.content.is_not(None), Article.content_zstd.is_(None))
+        .order_by(Article.id)
+        .limit(batch_size)
+    ).all()
+    for row in rows:
+        _store_row(session, row, row.content, content=row.content)
+    session.commit()
+
+    logger.info(f"Compressed {len(rows)} article bodies")
+    return len(rows)
+
+
+def reindex_bodies(
+    session: Session, after_id: int = 0, batch_size: int = 200
+) -> int | None:
+    """
+    Re-add one batch of compressed or offloaded bodies to the search vector.
+
+    Needed once on PostgreSQL databases whose search vector was generated
+    from content, which dropped bodies as they were compressed.
+
+    Args:
+        session: Database session.
+        after_id: Only articles with a greater ID (the previous return value).
+        batch_size: Maximum number of articles to index.
+
+    Returns:
+        ID of the last article indexed, or None when none are left.
+    """
+    articles = session.exec(
+        select(Article)
+        .where(Article.id > after_id, Article.content.is_(None))
+        .where(Article.content_zstd.is_not(None) | Article.content_blob.is_not(None))
+        .order_by(Article.id)
+        .limit(batch_size)
+    ).all()
+    for article in articles:
+        index_body(session, article, inflate(session, article).content)
+    session.commit()
+
+    logger.info(f"Indexed {len(articles)} stored article bodies")
+    return articles[-1].id if articles else None
+
+
+def train(session: Session, sample_size: int = 1000) -> int | None:
+    """
+    Train and store a new dictionary from recent article bodies.
+
+    Compressed bodies keep the dictionary they were written with; only new
+    writes use the new one.
+
+    Args:
+        session: Database session.
+        sample_size: Number of recent articles to sample.
+
+    Returns:
+        ID of the new dictionary, or None if there were too few samples.
+    """
+    rows = session.exec(
+        select(Article.content, Article.content_zstd, Article.content_dictionary_id)
+        .where(Article.content.is_not(None) | Article.content_zstd.is_not(None))
+        .order_by(Article.created_at.desc())
+        .limit(sample_size)
+    ).all()
+    samples = [
+        content if data is None else _unpack(session, data, dictionary_id)
+        for content, data, dictionary_id in rows
+    ]
+    try:
+        data = train_dictionary(samples)
+    except zstandard.ZstdError as e:
+        logger.warning(f"Could not train dictionary from {len(samples)} samples: {e}")
+        return None
+
+    dictionary = ContentDictionary(data=data)
+    session.add(dictionary)
+    session.commit()
+    session.refresh(dictionary)
+
+    logger.info(f"Trained dictionary {dictionary.id} ({len(data)} bytes)")
+    return dictionary.id
+
+
+def offload_archived(
+    session: Session, older_than_days: int, batch_size: int = 200
+) -> int:
+    """
+    Move one batch of long-archived bodies to the cold-tier blob store.
+
+    Blobs are written before the rows are updated, so a crash leaves at
+    worst an unreferenced blob, never a row pointing at a missing file.
+
+    Args:
+        session: Database session.
+        older_than_days: Only articles archived at least this long ago
+            (saved this long ago, for rows archived before archived_at
+            existed).
+        batch_size: Maximum number of articles to move.
+
+    Returns:
+        Number of articles moved; 0 when none are left.
+    """
+    cutoff = utc_now() - timedelta(days=older_than_days)
+    articles = session.exec(
+        select(Article)
+        .where(
+            Article.is_archived == True,
+            Article.content_blob.is_(None),
+            Article.content.is_not(None) | Article.content_zstd.is_not(None),
+            func.coalesce(Article.archived_at, Article.created_at) < cutoff,
+        )
+        .order_by(Article.id)
+        .limit(batch_size)
+    ).all()
+
+    store = get_blob_store()
+    for article in articles:
+        key = store.put(inflate(session, article).content)
+        session.execute(
+            update(Article)
+            .where(
+                Article.id == article.id,
+                Article.user_id == article.user_id,
+                Article.is_archived == True,
+            )
+            .values(content=None, content_zstd=None, content_blob=key)
+            .execution_options(synchronize_session=False)
+        )
+    session.commit()
+
+    logger.info(f"Moved {len(articles)} archived article bodies to the cold tier")
+    return len(articles)
+
+
+def restore_unarchived(session: Session, batch_size: int = 200) -> int:
+    """
+    Move one batch of unarchived articles' bodies back from the cold tier.
+
+    Bodies are stored in the hot table's current format; their blobs are
+    left for prune_blobs().
+
+    Args:
+        session: Database session.
+        batch_size: Maximum number of articles to move.
+
+    Returns:
+        Number of articles moved; 0 when none are left.
+    """
+    rows = session.exec(
+        select(Article.id, Article.user_id, Article.content_blob)
+        .where(Article.is_archived == False, Article.content_blob.is_not(None))
+        .order_by(Article.id)
+        .limit(batch_size)
+    ).all()
+    store = get_blob_store()
+    for row in rows:
+        body = store.get(row.content_blob)
+        _store_row(session, row, body, content_blob=row.content_blob)
+    session.commit()
+
+    logger.info(f"Moved {len(rows)} unarchived article bodies back from the cold tier")
+    return len(rows)
+
+
+def prune_blobs(
+    session: Session, min_age_seconds: float = 86400, batch_size: int = 500
+) -> int:
+    """
+    Delete blobs that no article points at any more.
+
+    Blobs written or re-stored (BlobStore.put refreshes the modification
+    time) within min_age_seconds are kept, so a blob whose offload has not
+    committed yet is never removed. Each old candidate is set aside before
+    its references are checked again, so an offload that stores it in the
+    meantime either writes a new copy or refreshed it first and the
+    candidate is put back.
+
+    Args:
+        session: Database session.
+        min_age_seconds: Minimum age of a blob before it can be deleted.
+        batch_size: Candidates re-checked per query.
+
+    Returns:
+        Number of blobs deleted.
+    """
+    store = get_blob_store()
+    if restored := store.cancel_pending_deletes():
+        logger.warning(f"Restored {restored} blobs left by an interrupted prune")
+
+    referenced = set(
+        session.exec(
+            select(Article.content_blob).where(Article.content_blob.is_not(None))
+        ).all()
+    )
+    cutoff = time.time() - min_age_seconds
+    candidates = [
+        key
+        for key, modified in store.keys()
+        if key not in referenced and modified < cutoff
+    ]
+
+    deleted = 0
+    for start in range(0, len(candidates), batch_size):
+        aside = {}
+        for key in candidates[start : start + batch_size]:
+            modified = store.begin_delete(key)
+            if modified is not None:
+                aside[key] = modified
+        # End the read transaction so the check sees offloads committed since.
+        session.commit()
+        still_referenced = set(
+            session.exec(
+                select(Article.content_blob).where(Article.content_blob.in_(aside))
+            ).all()
+        )
+        for key, modified in aside.items():
+            if key in still_referenced or modified >= cutoff:
+                store.cancel_delete(key)
+            else:
+                store.finish_delete(key)
+                deleted += 1
+
+    logger.info(f"Pruned {deleted} unreferenced blobs")
+    return deleted
+
+
+def _unpack(session: Session, data: bytes, dictionary_id: int | None) -> str:
+    """Decompress a stored body with the dictionary it was written with."""
+    dictionary = get_dictionary(session, dictionary_id) if dictionary_id else None
+    return decompress_text(data, dictionary)
+
+
+def _store_row(
+    session: Session,
+    article,
+    body: str,
+    content: str | None = None,
+    content_blob: str | None = None,
+) -> None:
+    """
+    Rewrite one article's body in the preferred hot-table format (no commit).
+
+    article is anything with id and user_id; user_id is matched so the
+    UPDATE prunes to one partition of a hash-partitioned table. The
+    expected current content or content_blob guards against overwriting a
+    concurrent change.
+    """
+    values = {"content": body, "content_zstd": None, "content_dictionary_id": None}
+    if compression_enabled():
+        data, dictionary_id = pack(session, body)
+        values = {
+            "content": None,
+            "content_zstd": data,
+            "content_dictionary_id": dictionary_id,
+        }
+
+    guard = (
+        Article.content == content
+        if content is not None
+        else Article.content_blob == content_blob
+    )
+    session.execute(
+        update(Article)
+        .where(Article.id == article.id, Article.user_id == article.user_id, guard)
+        .values(content_blob=None, **values)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,282 @@
+"""
+Counts service - per-user article totals for dashboard tabs and the API.
+
+Counts live in the article_counts table and are adjusted by article_service
+in the same transaction as each mutation, so reading them is a single
+primary-key lookup instead of COUNT(*) over the user's library. The same
+row carries a library version that every mutation moves forward, which
+list ETags are built from. reconcile_counts() rebuilds them from the article table and is used for
+users without a counts row, after bulk operations, and by the periodic
+reconciliation job (python -m jobs reconcile-counts).
+"""
+
+import logging
+from typing import Any
+
+from sqlalchemy import Integer, and_, case, cast, func, not_, tuple_, update
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from core.models import Article, ArticleCounts, User, change_version
+from schemas.article import ArticleCountsResponse
+
+logger = logging.getLogger(__name__)
+
+
+# Counter columns of article_counts, one per dashboard tab.
+COUNT_COLUMNS = ("all_count", "unread_count", "favorite_count", "archived_count")
+
+
+def count_buckets(
+    is_favorite: bool, is_archived: bool, is_read: bool
+) -> dict[str, int]:
+    """
+    Return which counters an article with these flags contributes to.
+
+    Mirrors the dashboard tabs and their filters: all is every unarchived
+    article, unread every unarchived one not read yet, and favorites only
+    counts unarchived favorites.
+
+    Args:
+        is_favorite: The article's favorite flag.
+        is_archived: The article's archive flag.
+        is_read: The article's read flag.
+
+    Returns:
+        Mapping of counter column to 0 or 1.
+    """
+    return {
+        "all_count": int(not is_archived),
+        "unread_count": int(not is_read and not is_archived),
+        "favorite_count": int(is_favorite and not is_archived),
+        "archived_count": int(is_archived),
+    }
+
+
+def bucket_conditions(is_favorite, is_archived, is_read) -> dict[str, Any]:
+    """
+    SQL counterpart of count_buckets() over boolean columns or expressions.
+
+    Args:
+        is_favorite: Favorite flag column.
+        is_archived: Archive flag column.
+        is_read: Read flag column.
+
+    Returns:
+        Mapping of counter column to the condition for counting in it.
+    """
+    return {
+        "all_count": not_(is_archived),
+        "unread_count": and_(not_(is_read), not_(is_archived)),
+        "favorite_count": and_(is_favorite, not_(is_archived)),
+        "archived_count": is_archived,
+    }
+
+
+def count_delta(
+    old: dict[str, int] | None, new: dict[str, int] | None
+) -> dict[str, int]:
+    """
+    Difference between two count_buckets() results.
+
+    Args:
+        old: Buckets before the change, or None for an inserted article.
+        new: Buckets after the change, or None for a deleted article.
+
+    Returns:
+        Mapping of counter column to the amount it changes by.
+    """
+    return {
+        column: (new or {}).get(column, 0) - (old or {}).get(column, 0)
+        for column in COUNT_COLUMNS
+    }
+
+
+def apply_delta(session: Session, user_id: int, delta: dict[str, int]) -> None:
+    """
+    Adjust a user's counts in the current transaction (caller commits).
+
+    Also moves the user's library version forward, so call it after every
+    change to the user's articles, with an empty delta if no count moves.
+    Users without a counts row are left alone; their counts are built from
+    scratch by reconcile_counts() on first read.
+
+    Args:
+        session: Database session.
+        user_id: ID of the user.
+        delta: Amount to add to each counter column.
+    """
+    session.execute(
+        update(ArticleCounts)
+        .where(ArticleCounts.user_id == user_id)
+        .values(
+            {
+                **{
+                    column: getattr(ArticleCounts, column) + amount
+                    for column, amount in delta.items()
+                    if amount
+                },
+                "library_version": change_version(),
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delta_update(user_id, old: dict[str, Any], new: dict[str, Any]) -> Update:
+    """
+    Build an apply_delta() UPDATE for an article whose flags move in SQL.
+
+    For flags only known inside a statement, e.g. the RETURNING columns
+    of an UPDATE used as a CTE, so the counts move in the same statement.
+
+    Args:
+        user_id: ID of the user, or a column holding it.
+        old: bucket_conditions() of the article before the change.
+        new: bucket_conditions() of the article after it.
+
+    Returns:
+        UPDATE of the user's counts row, including the library version.
+    """
+    return (
+        update(ArticleCounts)
+        .where(ArticleCounts.user_id == user_id)
+        .values(
+            {
+                **{
+                    column: getattr(ArticleCounts, column)
+                    + cast(new[column], Integer)
+                    - cast(old[column], Integer)
+                    for column in COUNT_COLUMNS
+                },
+                "library_version": change_version(),
+            }
+        )
+    )
+
+
+def get_counts(session: Session, user_id: int) -> ArticleCountsResponse:
+    """
+    Get a user's article totals.
+
+    Args:
+        session: Database session.
+        user_id: ID of the user.
+
+    Returns:
+        Totals for the all, unread, favorites and archived tabs.
+    """
+    counts = session.get(ArticleCounts, user_id)
+    if counts is None:
+        if session.info.get("read_only"):
+            # Replica sessions cannot write; count directly until the row
+            # exists (the reconcile job creates rows for every user).
+            counts = session.execute(_aggregate(user_id)).first()
+        else:
+            reconcile_counts(session, user_id)
+            session.commit()
+            counts = session.get(ArticleCounts, user_id)
+    if counts is None:
+        return ArticleCountsResponse(all=0, unread=0, favorites=0, archived=0)
+
+    return ArticleCountsResponse(
+        all=counts.all_count,
+        unread=counts.unread_count,
+        favorites=counts.favorite_count,
+        archived=counts.archived_count,
+    )
+
+
+def get_library_version(session: Session, user_id: int) -> int | None:
+    """
+    Get a version of a user's whole library.
+
+    It changes whenever any listing of the library could, and is read with
+    a primary-key lookup. Builds the counts row on first use like
+    get_counts().
+
+    Args:
+        session: Database session.
+        user_id: ID of the user.
+
+    Returns:
+        The version, or None on a replica before the user has a counts row.
+    """
+    version = session.scalar(
+        select(ArticleCounts.library_version).where(ArticleCounts.user_id == user_id)
+    )
+    if version is None and not session.info.get("read_only"):
+        reconcile_counts(session, user_id)
+        session.commit()
+        version = session.scalar(
+            select(ArticleCounts.library_version).where(
+                ArticleCounts.user_id == user_id
+            )
+        )
+    return version
+
+
+def reconcile_counts(session: Session, user_id: int | None = None) -> int:
+    """
+    Recompute counts from the article table (caller commits).
+
+    Repairs any drift, e.g. from articles written outside article_service;
+    a user's library version only moves if their counts were off.
+
+    Args:
+        session: Database session.
+        user_id: Only rebuild this user's counts; all users if None.
+
+    Returns:
+        Number of counts rows written.
+    """
+    aggregate = _aggregate(user_id)
+    dialect = sqlite if session.get_bind().dialect.name == "sqlite" else postgresql
+    statement = dialect.insert(ArticleCounts).from_select(
+        ["user_id", *COUNT_COLUMNS, "library_version"], aggregate
+    )
+    drifted = tuple_(*(getattr(ArticleCounts, c) for c in COUNT_COLUMNS)) != tuple_(
+        *(statement.excluded[c] for c in COUNT_COLUMNS)
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[ArticleCounts.user_id],
+        set_={
+            **{column: statement.excluded[column] for column in COUNT_COLUMNS},
+            "library_version": case(
+                (drifted, statement.excluded.library_version),
+                else_=ArticleCounts.library_version,
+            ),
+        },
+    )
+    result = session.execute(statement.execution_options(synchronize_session=False))
+    # Drop stale identity-map copies so the next get() sees the new values.
+    session.expire_all()
+
+    logger.info(f"Reconciled article counts for {result.rowcount} user(s)")
+    return result.rowcount
+
+
+def _aggregate(user_id: int | None):
+    """SELECT of per-user counts computed from the article table."""
+    conditions = bucket_conditions(
+        Article.is_favorite, Article.is_archived, Article.is_read
+    )
+    statement = (
+        select(
+            User.id.label("user_id"),
+            *(_count_where(conditions[c]).label(c) for c in COUNT_COLUMNS),
+            change_version().label("library_version"),
+        )
+        .select_from(User)
+        .outerjoin(Article, Article.user_id == User.id)
+        .group_by(User.id)
+    )
+    if user_id is not None:
+        statement = statement.where(User.id == user_id)
+    return statement
+
+
+def _count_where(condition):
+    """COUNT of article rows matching condition (0 for users with none)."""
+    return func.count(case((condition, Article.id)))
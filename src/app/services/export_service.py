@@ -0,0 +1,162 @@
+"""
+Export service - stream a user's whole library.
+
+Articles are read in id order with yield_per, which uses a server-side
+cursor on PostgreSQL, and each batch is serialized, handed to the client
+and dropped from the session before the next is fetched. Memory stays at
+one batch whatever the library size, and the first bytes are sent as soon
+as the first batch is read.
+
+Two formats are offered: NDJSON, one ArticleResponse object per line, and
+a ZIP of one standalone HTML file per article.
+"""
+
+import re
+import zipfile
+from collections.abc import Iterator
+from html import escape
+
+from sqlmodel import Session, select
+
+from core.models import Article
+from core.serialization import get_adapter
+from schemas.article import ArticleResponse
+from services import content_service
+
+# Articles fetched, serialized and released at a time.
+EXPORT_BATCH_SIZE = 200
+
+_HTML_DOCUMENT = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+<h1>{title}</h1>
+<p><a href="{url}">{url}</a></p>
+{body}
+</body>
+</html>
+"""
+
+
+def iter_batches(
+    session: Session, user_id: int, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[list[Article]]:
+    """
+    Yield a user's articles in id order, one batch at a time.
+
+    Bodies are inflated, whatever their storage. Each batch is expunged
+    from the session once the caller asks for the next, so it can be
+    garbage collected.
+
+    Args:
+        session: Database session, open for the whole iteration.
+        user_id: ID of the user whose library is exported.
+        batch_size: Number of articles per batch.
+
+    Yields:
+        Lists of up to batch_size articles.
+    """
+    result = session.exec(
+        select(Article)
+        .where(Article.user_id == user_id)
+        .order_by(Article.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for batch in result.partitions():
+        yield [content_service.inflate(session, article) for article in batch]
+        for article in batch:
+            session.expunge(article)
+
+
+def ndjson_chunks(session: Session, user_id: int) -> Iterator[bytes]:
+    """
+    Stream a user's library as NDJSON, one chunk per batch.
+
+    Args:
+        session: Database session, open for the whole iteration.
+        user_id: ID of the user whose library is exported.
+
+    Yields:
+        Newline-terminated ArticleResponse JSON lines.
+    """
+    articles = get_adapter(list[ArticleResponse])
+    article = get_adapter(ArticleResponse)
+    for batch in iter_batches(session, user_id):
+        models = articles.validate_python(batch, from_attributes=True)
+        yield b"".join(article.dump_json(model) + b"\n" for model in models)
+
+
+def zip_chunks(session: Session, user_id: int) -> Iterator[bytes]:
+    """
+    Stream a user's library as a ZIP of standalone HTML files.
+
+    Args:
+        session: Database session, open for the whole iteration.
+        user_id: ID of the user whose library is exported.
+
+    Yields:
+        Consecutive pieces of the ZIP archive.
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for batch in iter_batches(session, user_id):
+            for article in batch:
+                info = zipfile.ZipInfo(
+                    export_filename(article),
+                    date_time=article.created_at.timetuple()[:6],
+                )
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, render_html(article))
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def export_filename(article: Article) -> str:
+    """Return a unique, readable file name, e.g. '42-some-title.html'."""
+    slug = re.sub(r"[^a-z0-9]+", "-", (article.title or "").lower()).strip("-")
+    return f"{article.id}-{slug[:60].rstrip('-') or 'article'}.html"
+
+
+def render_html(article: Article) -> str:
+    """
+    Render an article as a standalone HTML document.
+
+    Uses the sanitized reader HTML when the article has it, and the
+    escaped plain text otherwise, like the reader page.
+    """
+    body = article.content_html or escape(article.content or "").replace("\n", "<br>")
+    return _HTML_DOCUMENT.format(
+        title=escape(article.title or article.url),
+        url=escape(article.url),
+        body=body,
+    )
+
+
+class _StreamBuffer:
+    """
+    Write-only file object that ZipFile streams into.
+
+    It has no tell() or seek(), so ZipFile writes sizes after each entry
+    instead of seeking back, and drain() can hand out what was written so
+    far.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        """Keep a copy of data until the next drain()."""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """Nothing to flush; drain() hands data out."""
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
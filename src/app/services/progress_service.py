@@ -0,0 +1,208 @@
+"""
+Progress service - reading position tracking.
+
+The reader page reports its scroll position every few seconds while open.
+Committing each report would cost a transaction per ping per reader, so
+reports are buffered in memory instead: repeated reports for an article
+overwrite each other, and flush() writes everything pending in one UPDATE.
+The app flushes every progress_flush_seconds and on shutdown; a crashed
+worker loses at most one interval of positions.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import Counter
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import (
+    Float,
+    Integer,
+    bindparam,
+    column,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlmodel import Session
+
+from core.database import get_engine
+from core.models import Article, utc_now
+from services import article_service, counts_service
+
+logger = logging.getLogger(__name__)
+
+# Progress at which an article counts as read.
+READ_THRESHOLD = 0.95
+
+# Latest reported progress per (user_id, article_id), waiting to be written.
+_pending: dict[tuple[int, int], float] = {}
+_lock = threading.Lock()
+
+
+def record_progress(user_id: int, article_id: int, progress: float) -> None:
+    """
+    Buffer a reading position report.
+
+    Args:
+        user_id: ID of the reporting user.
+        article_id: ID of the article being read.
+        progress: Fraction of the article read, from 0 to 1.
+    """
+    with _lock:
+        _pending[(user_id, article_id)] = min(max(progress, 0.0), 1.0)
+
+
+def pending_count() -> int:
+    """Return the number of buffered positions not yet written."""
+    return len(_pending)
+
+
+def flush(session: Session) -> int:
+    """
+    Write all buffered positions in one statement and commit.
+
+    Articles reaching READ_THRESHOLD are marked read, and leave their
+    owner's unread count; read articles stay read when the user scrolls
+    back up. Reports for articles the user does
+    not own (or that were deleted meanwhile) match no row and are dropped.
+    If the write fails, the batch is put back for the next flush unless
+    newer reports have replaced it.
+
+    Args:
+        session: Database session.
+
+    Returns:
+        Number of positions written.
+    """
+    global _pending
+    with _lock:
+        batch, _pending = _pending, {}
+    if not batch:
+        return 0
+
+    try:
+        newly_read = _write(session, batch)
+        by_user: dict[int, list[int]] = {}
+        for user_id, article_id in batch:
+            by_user.setdefault(user_id, []).append(article_id)
+        for user_id, article_ids in by_user.items():
+            counts_service.apply_delta(
+                session, user_id, {"unread_count": -newly_read[user_id]}
+            )
+            article_service.invalidate_articles(session, user_id, article_ids)
+        session.commit()
+    except Exception:
+        with _lock:
+            for key, progress in batch.items():
+                _pending.setdefault(key, progress)
+        raise
+
+    return len(batch)
+
+
+def _write(session: Session, batch: dict[tuple[int, int], float]) -> Counter[int]:
+    """
+    Apply a batch of positions to the article table.
+
+    Returns:
+        Number of unarchived articles per user that became read.
+    """
+    newly_read = Counter()
+    if session.get_bind().dialect.name == "sqlite":
+        # SQLite cannot alias VALUES columns; executemany is local anyway.
+        # With a single writer, the flags read first cannot change meanwhile.
+        unread = session.execute(
+            select(Article.user_id, Article.id).where(
+                tuple_(Article.user_id, Article.id).in_(list(batch)),
+                Article.is_read == False,
+                Article.is_archived == False,
+            )
+        ).all()
+        for user_id, article_id in unread:
+            if batch[(user_id, article_id)] >= READ_THRESHOLD:
+                newly_read[user_id] += 1
+        statement = (
+            update(Article.__table__)
+            .where(
+                Article.id == bindparam("article_id"),
+                Article.user_id == bindparam("owner_id"),
+            )
+            .values(
+                read_progress=bindparam("progress"),
+                is_read=or_(Article.is_read, bindparam("progress") >= READ_THRESHOLD),
+                updated_at=utc_now(),
+            )
+        )
+        session.execute(
+            statement,
+            [
+                {"owner_id": user_id, "article_id": article_id, "progress": progress}
+                for (user_id, article_id), progress in batch.items()
+            ],
+        )
+        return newly_read
+
+    rows = values(
+        column("user_id", Integer),
+        column("article_id", Integer),
+        column("progress", Float),
+        name="progress",
+    ).data([(user_id, article_id, p) for (user_id, article_id), p in batch.items()])
+    # The previous read flags come back through a locked self-join, like
+    # article_service.update_article().
+    old = (
+        select(Article.id, Article.user_id, Article.is_read)
+        .where(tuple_(Article.user_id, Article.id).in_(list(batch)))
+        .with_for_update()
+        .subquery("old")
+    )
+    result = session.execute(
+        update(Article)
+        .where(
+            Article.id == rows.c.article_id,
+            Article.user_id == rows.c.user_id,
+            Article.id == old.c.id,
+            Article.user_id == old.c.user_id,
+        )
+        .values(
+            read_progress=rows.c.progress,
+            is_read=or_(Article.is_read, rows.c.progress >= READ_THRESHOLD),
+            updated_at=utc_now(),
+        )
+        .returning(Article.user_id, Article.is_read, Article.is_archived, old.c.is_read)
+        .execution_options(synchronize_session=False)
+    )
+    for user_id, is_read, is_archived, was_read in result:
+        if is_read and not was_read and not is_archived:
+            newly_read[user_id] += 1
+    return newly_read
+
+
+def flush_pending() -> int:
+    """Flush buffered positions using a session of its own."""
+    with Session(get_engine()) as session:
+        return flush(session)
+
+
+async def flush_periodically(interval: float) -> None:
+    """
+    Flush buffered positions every interval seconds until cancelled.
+
+    Runs as a background task for the application's lifetime; errors are
+    logged and retried on the next tick.
+
+    Args:
+        interval: Seconds between flushes.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            written = await run_in_threadpool(flush_pending)
+        except Exception:
+            logger.exception("Failed to write reading progress")
+        else:
+            if written:
+                logger.debug(f"Wrote reading progress for {written} article(s)")
@@ -0,0 +1,253 @@
+"""
+Sync service - delta sync for offline and mobile clients.
+
+Every change a client can see bumps article.updated_at, and deletes leave
+a row in article_tombstone. Either way the database stamps the row with a
+change position: the ID of the writing transaction, then a sequence value
+(see core.migrations.CHANGE_TRIGGER_DDL). A client keeps the token from
+its last sync and asks only for what happened after it. Changes and
+deletes are read as one stream ordered by (transaction, sequence, kind,
+article id), kind 0 for a change and 1 for a delete; a token is the
+position of the last item returned, so pages can end anywhere and the
+next page resumes right after it. Both sides are keyset reads on
+(user_id, change_xid, change_seq, id) indexes.
+
+A transaction ID is taken before its writes commit, so a slow commit can
+make a change visible behind one a client has already seen. Only changes
+from transactions older than every transaction still running (the
+snapshot's xmin) are handed out, and once a client is caught up its
+token moves up to that horizon, so it does not go stale while nothing
+changes. On SQLite, writers take turns and the sequence alone orders them.
+"""
+
+import base64
+import binascii
+import heapq
+import json
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, insert, or_, select, text, true, tuple_
+from sqlmodel import Session
+
+from core.config import get_settings
+from core.models import Article, ArticleTombstone, utc_now
+from services import content_service
+
+logger = logging.getLogger(__name__)
+
+# Tombstones outlive the token retention by this much, since a delete can
+# commit a little after a token that does not cover it was issued.
+PRUNE_GRACE = timedelta(hours=1)
+
+# Position in the sync stream: (transaction, sequence, kind, article id).
+_CHANGED, _DELETED = 0, 1
+
+
+class SyncTokenExpired(Exception):
+    """The token is older than tombstones are kept; resync from scratch."""
+
+
+def encode_token(position: tuple[int, int, int, int]) -> str:
+    """Turn a stream position into an opaque URL-safe token issued now."""
+    issued_at = int(utc_now().timestamp())
+    payload = json.dumps([*position, issued_at])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> tuple[tuple[int, int, int, int], datetime]:
+    """
+    Turn a token from encode_token() back into a stream position.
+
+    Returns:
+        Tuple of (position, time the token was issued).
+
+    Raises:
+        ValueError: If the token is malformed.
+        SyncTokenExpired: If the token predates change positions.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(values, list) and len(values) == 3:
+            # (updated_at, kind, article id) from before change positions.
+            datetime.fromisoformat(values[0])
+            raise SyncTokenExpired(token)
+        *position, issued_at = (int(value) for value in values)
+        xid, seq, kind, article_id = position
+        issued = datetime.fromtimestamp(issued_at, UTC)
+    except (binascii.Error, TypeError, ValueError, OverflowError) as e:
+        raise ValueError("Invalid sync token") from e
+    if kind not in (_CHANGED, _DELETED):
+        raise ValueError("Invalid sync token")
+    return (xid, seq, kind, article_id), issued
+
+
+def record_deletes(session: Session, user_id: int, article_ids: list[int]) -> None:
+    """
+    Leave tombstones for deleted articles (caller commits).
+
+    Args:
+        session: Database session.
+        user_id: ID of the articles' owner.
+        article_ids: IDs of the deleted articles.
+    """
+    if not article_ids:
+        return
+    now = utc_now()
+    session.execute(
+        insert(ArticleTombstone),
+        [
+            {"user_id": user_id, "article_id": article_id, "deleted_at": now}
+            for article_id in article_ids
+        ],
+    )
+
+
+def changes_since(
+    session: Session, user_id: int, token: str | None, limit: int
+) -> tuple[list[Article], list[int], str, bool]:
+    """
+    Get one page of a user's changes after a sync token.
+
+    Without a token this is the initial sync: every article, and no
+    deletes since the client has nothing to delete yet.
+
+    Args:
+        session: Database session.
+        user_id: ID of the user.
+        token: Token from the previous page or sync, or None.
+        limit: Maximum number of items (changes plus deletes) to return.
+
+    Returns:
+        Tuple of (changed articles, deleted article IDs, next token,
+        has_more). Once caught up, the next token points at the horizon,
+        so it stays fresh even if nothing changed.
+
+    Raises:
+        ValueError: If the token is malformed.
+        SyncTokenExpired: If tombstones after the token may have been pruned.
+    """
+    since = None
+    if token:
+        since, issued = decode_token(token)
+        kept_after = utc_now() - timedelta(days=get_settings().sync_tombstone_days)
+        if issued < kept_after:
+            raise SyncTokenExpired(token)
+
+    horizon, settled = _horizon(session)
+    positions = _changed_positions(session, user_id, since, settled, limit + 1)
+    if since is not None:
+        deleted = _deleted_positions(session, user_id, since, settled, limit + 1)
+        positions = list(heapq.merge(positions, deleted))
+    page = positions[:limit]
+    has_more = len(positions) > limit
+
+    changed_ids = [article_id for *_, kind, article_id in page if kind == _CHANGED]
+    articles = {}
+    if changed_ids:
+        articles = {
+            article.id: article
+            for article in session.scalars(
+                select(Article).where(
+                    Article.user_id == user_id, Article.id.in_(changed_ids)
+                )
+            )
+        }
+    changed = [
+        content_service.inflate(session, articles[article_id])
+        for article_id in changed_ids
+        if article_id in articles
+    ]
+    deleted_ids = [article_id for *_, kind, article_id in page if kind == _DELETED]
+
+    # Everything before the horizon has been handed out unless a page ended
+    # early; a page can also run past it with the session's own writes.
+    if has_more:
+        next_position = page[-1]
+    else:
+        last = page[-1] if page else since
+        next_position = horizon if last is None else max(horizon, last)
+    return changed, deleted_ids, encode_token(next_position), has_more
+
+
+def prune_tombstones(session: Session, days: int) -> int:
+    """
+    Delete tombstones older than days, plus PRUNE_GRACE (commits).
+
+    Args:
+        session: Database session.
+        days: Age in days after which tombstones are dropped.
+
+    Returns:
+        Number of tombstones deleted.
+    """
+    cutoff = utc_now() - timedelta(days=days) - PRUNE_GRACE
+    result = session.execute(
+        delete(ArticleTombstone).where(ArticleTombstone.deleted_at < cutoff)
+    )
+    session.commit()
+    logger.info(f"Pruned {result.rowcount} tombstone(s) older than {days} days")
+    return result.rowcount
+
+
+def _horizon(session):
+    """
+    Find the stream position up to which changes are final.
+
+    Returns:
+        Tuple of (horizon position, function building the condition that
+        a change_xid column is settled).
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        seq = session.execute(text("SELECT seq FROM sync_clock")).scalar_one()
+        return (0, seq, _CHANGED, 0), lambda xid: true()
+
+    xmin, own_xid = session.execute(
+        text(
+            "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint, "
+            "pg_current_xact_id_if_assigned()::text::bigint"
+        )
+    ).one()
+
+    def settled(xid):
+        # A session that has written sees its own uncommitted changes too.
+        if own_xid is None:
+            return xid < xmin
+        return or_(xid < xmin, xid == own_xid)
+
+    return (xmin, 0, _CHANGED, 0), settled
+
+
+def _changed_positions(session, user_id, since, settled, limit):
+    """Stream positions of articles changed after since, oldest first."""
+    xid, seq = Article.change_xid, Article.change_seq
+    query = select(xid, seq, Article.id).where(Article.user_id == user_id, settled(xid))
+    if since is not None:
+        after_xid, after_seq, kind, article_id = since
+        if kind == _CHANGED:
+            query = query.where(
+                tuple_(xid, seq, Article.id) > tuple_(after_xid, after_seq, article_id)
+            )
+        else:
+            query = query.where(tuple_(xid, seq) > tuple_(after_xid, after_seq))
+    rows = session.execute(query.order_by(xid, seq, Article.id).limit(limit)).all()
+    return [(x, s, _CHANGED, article_id) for x, s, article_id in rows]
+
+
+def _deleted_positions(session, user_id, since, settled, limit):
+    """Stream positions of tombstones after since, oldest first."""
+    after_xid, after_seq, kind, article_id = since
+    xid, seq = ArticleTombstone.change_xid, ArticleTombstone.change_seq
+    deleted_id = ArticleTombstone.article_id
+    if kind == _DELETED:
+        after = tuple_(xid, seq, deleted_id) > tuple_(after_xid, after_seq, article_id)
+    else:
+        after = tuple_(xid, seq) >= tuple_(after_xid, after_seq)
+    rows = session.execute(
+        select(xid, seq, deleted_id)
+        .where(ArticleTombstone.user_id == user_id, settled(xid), after)
+        .order_by(xid, seq, deleted_id)
+        .limit(limit)
+    ).all()
+    return [(x, s, _DELETED, article_id) for x, s, article_id in rows]
@@ -0,0 +1,188 @@
+"""
+Tag service - user-defined article tags and per-tag counts.
+
+Tags live in article.tags (text[] with a GIN index on PostgreSQL, a JSON
+array on SQLite), so "articles tagged X, newest first" is an index lookup
+on the user's matches rather than a scan of their library. Per-tag counts
+live in the user_tag table and are adjusted by article_service in the
+same transaction as each tag change, like counts_service does for the
+dashboard tabs; reconcile_tags() rebuilds them.
+"""
+
+import logging
+from collections.abc import Iterable
+
+from sqlalchemy import delete, exists, func, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from core.models import Article, UserTag
+from schemas.tag import TagCount
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_tags(tags: Iterable[str]) -> list[str]:
+    """
+    Clean up tag names as entered by a user.
+
+    Tags are trimmed, lower-cased and have runs of whitespace collapsed;
+    empty and repeated tags are dropped, keeping the first occurrence.
+
+    Args:
+        tags: Raw tag names.
+
+    Returns:
+        Normalized tags in their original order.
+    """
+    normalized = (" ".join(tag.split()).lower() for tag in tags)
+    return list(dict.fromkeys(tag for tag in normalized if tag))
+
+
+def parse_tags(text: str) -> list[str]:
+    """Split comma-separated tags typed into a form and normalize them."""
+    return normalize_tags(text.split(","))
+
+
+def tag_condition(session: Session, tag: str):
+    """SQL condition matching articles that carry tag."""
+    if _is_sqlite(session):
+        values = func.json_each(Article.tags).table_valued("value")
+        return exists(select(1).select_from(values).where(values.c.value == tag))
+    return Article.tags.contains([tag])
+
+
+def with_tag(session: Session, tag: str):
+    """SQL expression for article.tags with tag appended."""
+    if _is_sqlite(session):
+        return func.json_insert(Article.tags, "$[#]", tag)
+    return func.array_append(Article.tags, tag)
+
+
+def without_tag(session: Session, tag: str):
+    """SQL expression for article.tags with tag removed."""
+    if _is_sqlite(session):
+        values = func.json_each(Article.tags).table_valued("value")
+        return (
+            select(func.json_group_array(values.c.value))
+            .where(values.c.value != tag)
+            .scalar_subquery()
+        )
+    return func.array_remove(Article.tags, tag)
+
+
+def tag_delta(old: Iterable[str], new: Iterable[str]) -> dict[str, int]:
+    """
+    Per-tag count changes for an article whose tags went from old to new.
+
+    Args:
+        old: Tags before the change (empty for an inserted article).
+        new: Tags after the change (empty for a deleted article).
+
+    Returns:
+        Mapping of tag to +1 or -1 for tags that were added or removed.
+    """
+    old, new = set(old), set(new)
+    return {tag: 1 for tag in new - old} | {tag: -1 for tag in old - new}
+
+
+def apply_delta(session: Session, user_id: int, delta: dict[str, int]) -> None:
+    """
+    Adjust a user's tag counts in the current transaction (caller commits).
+
+    Tags that reach zero articles are removed from the user's tag list.
+
+    Args:
+        session: Database session.
+        user_id: ID of the user.
+        delta: Amount to add to each tag's count.
+    """
+    changes = {tag: amount for tag, amount in delta.items() if amount}
+    if not changes:
+        return
+
+    dialect = sqlite if _is_sqlite(session) else postgresql
+    statement = dialect.insert(UserTag).values(
+        [
+            {"user_id": user_id, "tag": tag, "article_count": amount}
+            for tag, amount in changes.items()
+        ]
+    )
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserTag.user_id, UserTag.tag],
+            set_={
+                "article_count": UserTag.article_count
+                + statement.excluded.article_count
+            },
+        )
+    )
+    session.execute(
+        delete(UserTag).where(
+            UserTag.user_id == user_id,
+            UserTag.tag.in_(list(changes)),
+            UserTag.article_count <= 0,
+        )
+    )
+
+
+def list_tags(session: Session, user_id: int) -> list[TagCount]:
+    """
+    Get a user's tags with article counts.
+
+    Args:
+        session: Database session.
+        user_id: ID of the user.
+
+    Returns:
+        Tags in alphabetical order.
+    """
+    rows = session.execute(
+        select(UserTag.tag, UserTag.article_count)
+        .where(UserTag.user_id == user_id)
+        .order_by(UserTag.tag)
+    ).all()
+    return [TagCount(tag=tag, count=count) for tag, count in rows]
+
+
+def reconcile_tags(session: Session, user_id: int | None = None) -> int:
+    """
+    Recompute tag counts from the article table (caller commits).
+
+    Args:
+        session: Database session.
+        user_id: Only rebuild this user's tags; all users if None.
+
+    Returns:
+        Number of tag rows written.
+    """
+    if _is_sqlite(session):
+        values = func.json_each(Article.tags).table_valued("value")
+    else:
+        values = func.unnest(Article.tags).table_valued("value").render_derived()
+    aggregate = (
+        select(Article.user_id, values.c.value, func.count())
+        .select_from(Article)
+        .join(values, true())
+        .group_by(Article.user_id, values.c.value)
+    )
+    clear = delete(UserTag)
+    if user_id is not None:
+        aggregate = aggregate.where(Article.user_id == user_id)
+        clear = clear.where(UserTag.user_id == user_id)
+
+    session.execute(clear)
+    result = session.execute(
+        UserTag.__table__.insert().from_select(
+            ["user_id", "tag", "article_count"], aggregate
+        )
+    )
+    session.expire_all()
+
+    logger.info(f"Reconciled {result.rowcount} tag count(s)")
+    return result.rowcount
+
+
+def _is_sqlite(session: Session) -> bool:
+    """Return True if the session is bound to a SQLite database."""
+    return session.get_bind().dialect.name == "sqlite"
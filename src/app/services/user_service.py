@@ -6,13 +6,19 @@ Handles user lookup and creation from OAuth data.
 
 import logging
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import Session, select
 
+from core.cache import TTLCache
 from core.models import User
 from schemas.user import UserSession
 
 logger = logging.getLogger(__name__)
 
+# Users are never renamed or deleted by the app, so a login within the TTL
+# can reuse the session data from the previous one.
+_login_cache = TTLCache(maxsize=1024, ttl=300.0, name="login")
+
 
 def get_user_by_email(session: Session, email: str) -> User | None:
     """
@@ -49,11 +55,18 @@ def create_user(session: Session, email: str, name: str | None = None) -> User:
     return user
 
 
-def get_or_create_user(session: Session, email: str, name: str | None = None) -> UserSession:
+def get_or_create_user(
+    session: Session, email: str, name: str | None = None
+) -> UserSession:
     """
     Get an existing user or create a new one.
 
-    This is the main entry point for OAuth callback handling.
+    This is the main entry point for OAuth callback handling. Uses a
+    single INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING, so
+    concurrent first logins for the same email both get the one row
+    instead of one failing on the unique constraint. The name is only
+    set when the user is created. Recent logins are served from a cache
+    without touching the database.
 
     Args:
         session: Database session.
@@ -63,13 +76,19 @@ def get_or_create_user(session: Session, email: str, name: str | None = None) ->
     Returns:
         UserSession for the user.
     """
-    user = get_user_by_email(session, email)
-
-    if not user:
-        user = create_user(session, email, name)
+    cached = _login_cache.get(email)
+    if cached is not None:
+        return cached
+
+    dialect = sqlite if session.get_bind().dialect.name == "sqlite" else postgresql
+    insert = dialect.insert(User).values(email=email, name=name)
+    # A no-op update, so RETURNING also yields the existing row.
+    statement = insert.on_conflict_do_update(
+        index_elements=[User.email], set_={"email": insert.excluded.email}
+    ).returning(User.id, User.email, User.name)
+    row = session.execute(statement).one()
+    session.commit()
 
-    return UserSession(
-        id=user.id,
-        email=user.email,
-        name=user.name,
-    )
+    user_session = UserSession(id=row.id, email=row.email, name=row.name)
+    _login_cache.set(email, user_session)
+    return user_session
@@ -22,6 +22,9 @@ mock_article_instance = MagicMock()
 mock_article_instance.title = "Test Article Title"
 mock_article_instance.text = "Test article content for testing purposes."
 mock_article_instance.top_image = "https://example.com/image.jpg"
+mock_article_instance.article_html = (
+    "<div><p>Test article content for testing purposes.</p></div>"
+)
 mock_article_instance.download = MagicMock()
 mock_article_instance.parse = MagicMock()
 
@@ -66,6 +69,15 @@ def restore_cwd():
     os.chdir(_original_cwd)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start each test with empty in-process caches."""
+    from core.cache import CACHES
+
+    for cache in CACHES.values():
+        cache.clear()
+
+
 @pytest.fixture(scope="session")
 def test_engine():
     """Create tables once per test session."""
@@ -168,11 +180,13 @@ def mock_article():
         title="Test Article Title",
         text="This is the test article content. " * 20,
         top_image="https://example.com/image.jpg",
+        article_html="<div><p>This is the test article content.</p></div>",
     ):
         mock = MagicMock()
         mock.title = title
         mock.text = text
         mock.top_image = top_image
+        mock.article_html = article_html
         mock.download = MagicMock()
         mock.parse = MagicMock()
         return mock
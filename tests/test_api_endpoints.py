@@ -94,6 +94,84 @@ class TestDashboard:
         finally:
             app.dependency_overrides.clear()
 
+    def test_dashboard_caches_cards_until_mutation(self, session, test_user):
+        """Should reuse a rendered card until the article changes."""
+        from api.routes import pages
+        from core.database import get_session
+        from core.models import Article
+        from core.security import require_login
+
+        from app import app
+
+        article = Article(
+            user_id=test_user.id, url="https://example.com", title="Cached Card"
+        )
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                first = client.get("/dashboard")
+                key = ("_article_card.html", test_user.id, article.id)
+                cached = [k for k in pages._fragment_cache._data if k[:3] == key]
+                second = client.get("/dashboard")
+                client.post(f"/article/{article.id}/toggle-favorite")
+                remaining = [k for k in pages._fragment_cache._data if k in cached]
+                size = len(pages._fragment_cache)
+                searched = client.get("/dashboard", params={"q": "cached"})
+
+                assert "Cached Card" in first.text
+                assert len(cached) == 1
+                assert second.text == first.text
+                assert remaining == []
+                assert searched.status_code == 200
+                assert len(pages._fragment_cache) == size
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestDashboardSuggest:
+    """Test suite for the dashboard typeahead fragment."""
+
+    def test_suggest_renders_matching_titles(self, session, test_user):
+        """Should render a list item linking to the matching article."""
+        from core.database import get_session
+        from core.models import Article
+        from core.security import require_login
+
+        from app import app
+
+        article = Article(
+            user_id=test_user.id, url="https://example.com", title="Fragment title"
+        )
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        def override_require_login():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = override_require_login
+
+        try:
+            with TestClient(app) as client:
+                response = client.get("/dashboard/suggest?q=fragm")
+
+                assert response.status_code == 200
+                assert "Fragment title" in response.text
+                assert f"/article/{article.id}" in response.text
+        finally:
+            app.dependency_overrides.clear()
+
 
 class TestArticleOperations:
     """Test suite for article CRUD operations."""
@@ -292,6 +370,183 @@ class TestArticleOperations:
         finally:
             app.dependency_overrides.clear()
 
+    def test_bulk_archive_from_dashboard(self, session, test_user):
+        """Should archive all selected articles in one request."""
+        from core.database import get_session
+        from core.models import Article
+        from core.security import require_login
+        from sqlmodel import select
+
+        from app import app
+
+        articles = [
+            Article(user_id=test_user.id, url=f"https://example.com/{i}", title="Test")
+            for i in range(2)
+        ]
+        session.add_all(articles)
+        session.commit()
+        ids = [a.id for a in articles]
+
+        def override_get_session():
+            yield session
+
+        def override_require_login():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = override_require_login
+
+        try:
+            with TestClient(app) as client:
+                response = client.post(
+                    "/article/bulk",
+                    data={"action": "archive", "article_ids": ids},
+                    follow_redirects=False,
+                )
+
+                assert response.status_code == 303
+
+                archived = session.exec(
+                    select(Article).where(Article.is_archived == True)  # noqa: E712
+                ).all()
+                assert len(archived) == 2
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_bulk_select_all_uses_filter_and_age(self, session, test_user):
+        """Should act on the whole tab by filter, limited by age, ignoring IDs."""
+        from datetime import timedelta
+
+        from core.database import get_session
+        from core.models import Article, utc_now
+        from core.security import require_login
+        from sqlmodel import select
+
+        from app import app
+
+        old = Article(
+            user_id=test_user.id,
+            url="https://example.com/old",
+            title="Old",
+            is_archived=True,
+            created_at=utc_now() - timedelta(days=60),
+        )
+        new = Article(
+            user_id=test_user.id,
+            url="https://example.com/new",
+            title="New",
+            is_archived=True,
+        )
+        session.add_all([old, new])
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        def override_require_login():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = override_require_login
+
+        try:
+            with TestClient(app) as client:
+                response = client.post(
+                    "/article/bulk",
+                    data={
+                        "action": "delete",
+                        "select_all": "true",
+                        "filter": "archived",
+                        "older_than_days": "30",
+                    },
+                    follow_redirects=False,
+                )
+
+                assert response.status_code == 303
+
+                titles = session.exec(select(Article.title)).all()
+                assert titles == ["New"]
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_bulk_tag_from_form(self, session, test_user):
+        """Should tag the selected articles; an empty tag box is ignored."""
+        from core.database import get_session
+        from core.models import Article
+        from core.security import require_login
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com")
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                for action, tag in (("favorite", ""), ("tag", "Later")):
+                    client.post(
+                        "/article/bulk",
+                        data={"action": action, "article_ids": article.id, "tag": tag},
+                        follow_redirects=False,
+                    )
+
+                session.refresh(article)
+                assert article.is_favorite is True
+                assert article.tags == ["later"]
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_bulk_rejects_too_many_ids(self, session, test_user):
+        """Should refuse over-limit ID lists instead of truncating them."""
+        from core.database import get_session
+        from core.models import Article
+        from core.security import require_login
+        from schemas.article import MAX_BULK_IDS
+        from sqlmodel import select
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com", title="T")
+        session.add(article)
+        session.commit()
+        ids = [article.id] + list(range(10**6, 10**6 + MAX_BULK_IDS))
+
+        def override_get_session():
+            yield session
+
+        def override_require_login():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = override_require_login
+
+        try:
+            with TestClient(app) as client:
+                response = client.post(
+                    "/article/bulk",
+                    data={
+                        "action": "archive",
+                        "article_ids": ids,
+                        "older_than_days": "",
+                    },
+                    follow_redirects=False,
+                )
+
+                assert response.status_code == 303
+
+                archived = session.exec(
+                    select(Article).where(Article.is_archived == True)  # noqa: E712
+                ).all()
+                assert archived == []
+        finally:
+            app.dependency_overrides.clear()
+
 
 class TestViewArticle:
     """Test suite for viewing individual articles."""
@@ -365,6 +620,112 @@ class TestViewArticle:
         finally:
             app.dependency_overrides.clear()
 
+    def test_view_article_revalidates(self, session, test_user):
+        """Should answer 304 on revisit unless a flash message is pending."""
+        from core.database import get_session
+        from core.models import Article
+        from core.security import require_login
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com")
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                url = f"/article/{article.id}"
+                etag = client.get(url).headers["ETag"]
+                revisit = client.get(url, headers={"If-None-Match": etag})
+                client.post(f"{url}/toggle-read")
+                after_toggle = client.get(url, headers={"If-None-Match": etag})
+
+                assert revisit.status_code == 304
+                assert revisit.headers["Cache-Control"] == "private, no-cache"
+                assert after_toggle.status_code == 200
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_view_article_caches_body_until_mutation(self, session, test_user):
+        """Should reuse the rendered body until the article changes."""
+        from api.routes import pages
+        from core.database import get_session
+        from core.models import Article
+        from core.security import require_login
+
+        from app import app
+
+        article = Article(
+            user_id=test_user.id, url="https://example.com", content="Line one\nTwo"
+        )
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = lambda: test_user
+
+        key = ("_article_body.html", test_user.id, article.id, article.updated_at)
+        try:
+            with TestClient(app) as client:
+                url = f"/article/{article.id}"
+                response = client.get(url)
+                cached = pages._fragment_cache.get(key)
+                client.post(f"{url}/delete")
+
+                assert "Line one<br>Two" in response.text
+                assert cached == "Line one<br>Two"
+                assert pages._fragment_cache.get(key) is None
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_view_article_serves_reader_html(self, session, test_user):
+        """Should embed stored reader HTML, and escape plain-text fallbacks."""
+        from core.database import get_session
+        from core.models import Article
+        from core.security import require_login
+
+        from app import app
+
+        structured = Article(
+            user_id=test_user.id,
+            url="https://example.com/a",
+            content="Heading",
+            content_html="<div><h2>Heading</h2></div>",
+        )
+        plain = Article(
+            user_id=test_user.id,
+            url="https://example.com/b",
+            content="<script>alert(1)</script>\nNext",
+        )
+        session.add_all([structured, plain])
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_login] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                rich = client.get(f"/article/{structured.id}")
+                fallback = client.get(f"/article/{plain.id}")
+
+                assert "<div><h2>Heading</h2></div>" in rich.text
+                assert "&lt;script&gt;alert(1)&lt;/script&gt;<br>Next" in fallback.text
+                assert "<script>alert(1)</script>" not in fallback.text
+        finally:
+            app.dependency_overrides.clear()
+
 
 class TestLogout:
     """Test suite for logout functionality."""
@@ -22,6 +22,19 @@ class TestAPIv1Health:
 
         assert response.json() == {"status": "healthy"}
 
+    def test_cache_stats(self, client):
+        """Should report counters for each named cache."""
+        response = client.get("/api/v1/health/caches")
+
+        assert response.status_code == 200
+        assert set(response.json()["article"]) == {
+            "size",
+            "maxsize",
+            "hits",
+            "misses",
+            "evictions",
+        }
+
 
 class TestAPIv1ArticlesAuth:
     """Test authentication requirements for API v1 articles."""
@@ -179,6 +192,158 @@ class TestAPIv1ArticlesList:
             app.dependency_overrides.clear()
 
 
+class TestAPIv1ArticlesSearch:
+    """Test suite for searching articles via API."""
+
+    def test_search_returns_ranked_results(self, session, test_user):
+        """Should return matching articles with snippets and a total."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        session.add(
+            Article(
+                user_id=test_user.id,
+                url="https://example.com",
+                title="Search Engines",
+                content="Inverted indexes make search fast.",
+            )
+        )
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        def override_auth():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = override_auth
+
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/v1/articles/search?q=indexes")
+
+                assert response.status_code == 200
+                data = response.json()
+                assert data["total"] == 1
+                assert data["results"][0]["title"] == "Search Engines"
+                assert "<mark>" in data["results"][0]["snippet"]
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_search_requires_query(self, session, test_user):
+        """Should return 422 without a search query."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+
+        from app import app
+
+        def override_get_session():
+            yield session
+
+        def override_auth():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = override_auth
+
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/v1/articles/search")
+
+                assert response.status_code == 422
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestAPIv1ArticlesSuggest:
+    """Test suite for typeahead suggestions via API."""
+
+    def test_suggest_returns_matches(self, session, test_user):
+        """Should return articles whose title matches partial input."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        session.add(
+            Article(
+                user_id=test_user.id,
+                url="https://news.example.org/a",
+                title="Typeahead design",
+            )
+        )
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        def override_auth():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = override_auth
+
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/v1/articles/suggest?q=typeah")
+
+                assert response.status_code == 200
+                suggestions = response.json()["suggestions"]
+                assert suggestions[0]["title"] == "Typeahead design"
+                assert suggestions[0]["host"] == "news.example.org"
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestAPIv1ArticlesCounts:
+    """Test suite for per-user article totals via API."""
+
+    def test_counts_match_tabs(self, session, test_user):
+        """Should return unread, favorite and archived totals."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        session.add_all(
+            [
+                Article(user_id=test_user.id, url="https://a.io", is_favorite=True),
+                Article(user_id=test_user.id, url="https://b.io", is_archived=True),
+                Article(user_id=test_user.id, url="https://c.io", is_read=True),
+            ]
+        )
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        def override_auth():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = override_auth
+
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/v1/articles/counts")
+
+                assert response.status_code == 200
+                assert response.json() == {
+                    "all": 2,
+                    "unread": 1,
+                    "favorites": 1,
+                    "archived": 1,
+                }
+        finally:
+            app.dependency_overrides.clear()
+
+
 class TestAPIv1ArticlesCreate:
     """Test suite for creating articles via API."""
 
@@ -314,6 +479,46 @@ class TestAPIv1ArticlesGet:
         finally:
             app.dependency_overrides.clear()
 
+    def test_get_article_compressed(self, session, test_user):
+        """Should send large articles compressed, reusing the cached copy."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+        from services import article_service
+
+        from app import app
+
+        article = Article(
+            user_id=test_user.id,
+            url="https://example.com",
+            content="Long article text. " * 500,
+        )
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                url = f"/api/v1/articles/{article.id}"
+                first = client.get(url, headers={"Accept-Encoding": "gzip"})
+                second = client.get(url, headers={"Accept-Encoding": "gzip"})
+                _, _, variants = article_service.get_article_payload(
+                    session, article.id, test_user.id
+                )
+
+                assert first.headers["Content-Encoding"] == "gzip"
+                assert int(first.headers["Content-Length"]) < 1000
+                assert first.json()["content"] == article.content
+                assert second.content == first.content
+                assert list(variants) == ["gzip"]
+        finally:
+            app.dependency_overrides.clear()
+
 
 class TestAPIv1ArticlesUpdate:
     """Test suite for updating articles via API."""
@@ -428,6 +633,589 @@ class TestAPIv1ArticlesUpdate:
             app.dependency_overrides.clear()
 
 
+class TestAPIv1ArticlesBulk:
+    """Test suite for bulk article actions via API."""
+
+    def test_bulk_archive_returns_count(self, session, test_user):
+        """Should archive the given articles and return how many changed."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        articles = [
+            Article(user_id=test_user.id, url=f"https://example.com/{i}", title="Test")
+            for i in range(3)
+        ]
+        session.add_all(articles)
+        session.commit()
+        ids = [a.id for a in articles]
+
+        def override_get_session():
+            yield session
+
+        def override_auth():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = override_auth
+
+        try:
+            with TestClient(app) as client:
+                response = client.post(
+                    "/api/v1/articles/bulk",
+                    json={"action": "archive", "ids": ids},
+                )
+
+                assert response.status_code == 200
+                assert response.json() == {"action": "archive", "count": 3}
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_bulk_requires_selector(self, session, test_user):
+        """Should return 422 when no articles are selected."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+
+        from app import app
+
+        def override_get_session():
+            yield session
+
+        def override_auth():
+            return test_user
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = override_auth
+
+        try:
+            with TestClient(app) as client:
+                response = client.post(
+                    "/api/v1/articles/bulk", json={"action": "delete"}
+                )
+
+                assert response.status_code == 422
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestAPIv1ArticlesProgress:
+    """Test suite for reading progress via API."""
+
+    def test_progress_is_buffered(self, session, test_user):
+        """Should accept a report without writing it immediately."""
+        from api.routes.v1.deps import require_api_auth
+        from services import progress_service
+
+        from app import app
+
+        progress_service._pending.clear()
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                response = client.put(
+                    "/api/v1/articles/42/progress", json={"progress": 0.5}
+                )
+                invalid = client.put(
+                    "/api/v1/articles/42/progress", json={"progress": 1.5}
+                )
+
+                assert response.status_code == 202
+                assert invalid.status_code == 422
+                assert progress_service._pending == {(test_user.id, 42): 0.5}
+                progress_service._pending.clear()
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_mark_read(self, session, test_user):
+        """Should set the read flag through PATCH."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com")
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                response = client.patch(
+                    f"/api/v1/articles/{article.id}", json={"is_read": True}
+                )
+                unread = client.get("/api/v1/articles?filter=unread")
+
+                assert response.status_code == 200
+                assert response.json()["is_read"] is True
+                assert unread.json()["count"] == 0
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestAPIv1Tags:
+    """Test suite for tags via API."""
+
+    def test_tag_article_and_list_tags(self, session, test_user):
+        """Should set tags with PATCH and list them with counts."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com")
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                response = client.patch(
+                    f"/api/v1/articles/{article.id}", json={"tags": ["Reading"]}
+                )
+                tags = client.get("/api/v1/tags")
+                tagged = client.get("/api/v1/articles?tag=reading")
+
+                assert response.json()["tags"] == ["reading"]
+                assert tags.json() == {"tags": [{"tag": "reading", "count": 1}]}
+                assert tagged.json()["count"] == 1
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_bulk_tag_requires_tag(self, session, test_user):
+        """Should reject tag actions without a tag."""
+        from api.routes.v1.deps import require_api_auth
+
+        from app import app
+
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                response = client.post(
+                    "/api/v1/articles/bulk", json={"action": "tag", "ids": [1]}
+                )
+
+                assert response.status_code == 422
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestAPIv1ConditionalGet:
+    """Test suite for ETag revalidation via API."""
+
+    def test_article_not_modified_until_changed(self, session, test_user):
+        """Should answer 304 for a current ETag and 200 after an update."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com")
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                url = f"/api/v1/articles/{article.id}"
+                etag = client.get(url).headers["ETag"]
+                cached = client.get(url, headers={"If-None-Match": etag})
+                client.patch(url, json={"is_favorite": True})
+                changed = client.get(url, headers={"If-None-Match": etag})
+
+                assert cached.status_code == 304
+                assert cached.content == b""
+                assert cached.headers["ETag"] == etag
+                assert changed.status_code == 200
+                assert changed.headers["ETag"] != etag
+                assert changed.json()["is_favorite"] is True
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_list_not_modified_until_delete(self, session, test_user):
+        """Should change the list ETag when an article is deleted."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        articles = [
+            Article(user_id=test_user.id, url=f"https://example.com/{i}")
+            for i in range(2)
+        ]
+        session.add_all(articles)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                etag = client.get("/api/v1/articles").headers["ETag"]
+                cached = client.get(
+                    "/api/v1/articles?filter=favorites",
+                    headers={"If-None-Match": etag},
+                )
+                client.delete(f"/api/v1/articles/{articles[0].id}")
+                changed = client.get(
+                    "/api/v1/articles", headers={"If-None-Match": etag}
+                )
+
+                assert cached.status_code == 304
+                assert changed.status_code == 200
+                assert changed.json()["count"] == 1
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_etag_covers_media_type(self, session, test_user):
+        """Should not confirm a JSON copy to a client asking for MessagePack."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com")
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        msgpack_accept = {"Accept": "application/msgpack"}
+        try:
+            with TestClient(app) as client:
+                for url in ("/api/v1/articles", f"/api/v1/articles/{article.id}"):
+                    etag = client.get(url).headers["ETag"]
+                    packed = client.get(
+                        url, headers={**msgpack_accept, "If-None-Match": etag}
+                    )
+                    cached = client.get(
+                        url,
+                        headers={
+                            **msgpack_accept,
+                            "If-None-Match": packed.headers["ETag"],
+                        },
+                    )
+
+                    assert packed.status_code == 200
+                    assert packed.headers["content-type"] == "application/msgpack"
+                    assert packed.headers["ETag"] != etag
+                    assert cached.status_code == 304
+                    assert "Accept" in cached.headers["vary"]
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestAPIv1Sync:
+    """Test suite for delta sync via API."""
+
+    def test_sync_pages_changes_and_deletes(self, session, test_user):
+        """Should page through articles, then report a delete after the token."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from services import article_service
+
+        from app import app
+
+        ids = [
+            article_service.create_article(
+                session, test_user.id, "https://example.com", f"A{i}", "", "", None
+            ).id
+            for i in range(2)
+        ]
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                first = client.get("/api/v1/sync?limit=1").json()
+                second = client.get(
+                    f"/api/v1/sync?limit=1&since={first['next_token']}"
+                ).json()
+                client.delete(f"/api/v1/articles/{ids[0]}")
+                third = client.get(f"/api/v1/sync?since={second['next_token']}").json()
+
+                assert [a["id"] for a in first["changed"] + second["changed"]] == ids
+                assert first["has_more"] is True
+                assert third["changed"] == []
+                assert third["deleted"] == [ids[0]]
+                assert third["has_more"] is False
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_sync_rejects_bad_token(self, session, test_user):
+        """Should return 400 for a malformed token."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+
+        from app import app
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/v1/sync?since=garbage")
+
+                assert response.status_code == 400
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestAPIv1ArticlesLookup:
+    """Test suite for fetching articles by ID list via API."""
+
+    def _lookup(self, session, test_user, body):
+        """POST body to the lookup endpoint as test_user."""
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+
+        from app import app
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                return client.post("/api/v1/articles/lookup", json=body)
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_lookup_returns_articles_and_missing_ids(self, session, test_user):
+        """Should return owned articles in order and report the others."""
+        from core.models import Article, User
+
+        other = User(email="other@example.com", name="Other")
+        session.add(other)
+        session.commit()
+        first = Article(user_id=test_user.id, url="https://example.com/1")
+        second = Article(user_id=test_user.id, url="https://example.com/2")
+        foreign = Article(user_id=other.id, url="https://example.com/3")
+        session.add_all([first, second, foreign])
+        session.commit()
+
+        response = self._lookup(
+            session,
+            test_user,
+            {"ids": [second.id, foreign.id, first.id, second.id, 9999]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [a["id"] for a in data["articles"]] == [second.id, first.id]
+        assert data["articles"][0]["url"] == "https://example.com/2"
+        assert data["missing"] == [foreign.id, 9999]
+
+    def test_lookup_selects_fields(self, session, test_user):
+        """Should return only the selected fields, always with the ID."""
+        from core.models import Article
+
+        article = Article(
+            user_id=test_user.id, url="https://example.com", title="T", content="Body"
+        )
+        session.add(article)
+        session.commit()
+
+        response = self._lookup(
+            session, test_user, {"ids": [article.id], "fields": ["title", "is_read"]}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["articles"] == [
+            {"id": article.id, "title": "T", "is_read": False}
+        ]
+
+    def test_lookup_validates_request(self, session, test_user):
+        """Should reject empty, oversized and unknown-field lookups."""
+        from schemas.article import MAX_LOOKUP_IDS
+
+        too_many = list(range(1, MAX_LOOKUP_IDS + 2))
+        for body in (
+            {"ids": []},
+            {"ids": too_many},
+            {"ids": [1], "fields": ["content_zstd"]},
+        ):
+            assert self._lookup(session, test_user, body).status_code == 422
+
+
+class TestAPIv1MsgPack:
+    """Test suite for MessagePack content negotiation."""
+
+    def test_msgpack_responses_match_json(self, session, test_user):
+        """Should return the JSON shapes as MessagePack when asked for."""
+        import msgpack
+
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com", title="T")
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        msgpack_accept = {"Accept": "application/msgpack"}
+        try:
+            with TestClient(app) as client:
+                for url in (
+                    "/api/v1/articles",
+                    f"/api/v1/articles/{article.id}",
+                    "/api/v1/articles/counts",
+                    "/api/v1/sync",
+                ):
+                    as_json = client.get(url)
+                    packed = client.get(url, headers=msgpack_accept)
+
+                    assert packed.headers["content-type"] == "application/msgpack"
+                    assert "Accept" in packed.headers["vary"]
+                    assert "Accept" in as_json.headers["vary"]
+                    if url != "/api/v1/sync":  # next_token moves on
+                        assert msgpack.unpackb(packed.content) == as_json.json()
+
+                missing = client.get("/api/v1/articles/9999", headers=msgpack_accept)
+                assert missing.status_code == 404
+                assert missing.json() == {"detail": "Article not found"}
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_msgpack_request_bodies(self, session, test_user):
+        """Should decode MessagePack request bodies like JSON ones."""
+        import msgpack
+
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_session
+        from core.models import Article
+
+        from app import app
+
+        article = Article(user_id=test_user.id, url="https://example.com")
+        session.add(article)
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                url = f"/api/v1/articles/{article.id}"
+                updated = client.patch(
+                    url,
+                    content=msgpack.packb({"is_favorite": True}),
+                    headers={"Content-Type": "application/msgpack"},
+                )
+                invalid = client.patch(
+                    url,
+                    content=msgpack.packb({"is_favorite": [1]}),
+                    headers={"Content-Type": "application/msgpack"},
+                )
+
+                assert updated.status_code == 200
+                assert updated.json()["is_favorite"] is True
+                assert invalid.status_code == 422
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestAPIv1Export:
+    """Test suite for library export via API."""
+
+    def test_export_ndjson_and_zip(self, session, test_user):
+        """Should stream the library as NDJSON by default, or as a ZIP."""
+        import io
+        import json
+        import zipfile
+
+        from api.routes.v1.deps import require_api_auth
+        from core.database import get_streaming_session
+        from core.models import Article
+
+        from app import app
+
+        session.add_all(
+            [
+                Article(user_id=test_user.id, url=f"https://example.com/{i}")
+                for i in range(3)
+            ]
+        )
+        session.commit()
+
+        def override_get_session():
+            yield session
+
+        app.dependency_overrides[get_streaming_session] = override_get_session
+        app.dependency_overrides[require_api_auth] = lambda: test_user
+
+        try:
+            with TestClient(app) as client:
+                ndjson = client.get("/api/v1/export")
+                archive = client.get("/api/v1/export", params={"format": "zip"})
+                invalid = client.get("/api/v1/export", params={"format": "csv"})
+
+                lines = [json.loads(line) for line in ndjson.text.splitlines()]
+                assert ndjson.headers["content-type"] == "application/x-ndjson"
+                assert (
+                    "timstapaper-export.ndjson" in ndjson.headers["content-disposition"]
+                )
+                assert [line["url"] for line in lines] == [
+                    f"https://example.com/{i}" for i in range(3)
+                ]
+                assert archive.headers["content-type"] == "application/zip"
+                with zipfile.ZipFile(io.BytesIO(archive.content)) as zf:
+                    assert len(zf.namelist()) == 3
+                assert invalid.status_code == 422
+        finally:
+            app.dependency_overrides.clear()
+
+
 class TestAPIv1ArticlesDelete:
     """Test suite for deleting articles via API."""
 
@@ -60,6 +60,18 @@ class TestArticleExtraction:
         assert result.excerpt == short_content
         assert not result.excerpt.endswith("...")
 
+    def test_extracts_sanitized_html(self, mock_article):
+        """Should keep the article's markup, sanitized, for the reader."""
+        mock = mock_article(
+            article_html='<div><h2>Part</h2><p onclick="x()">Body</p>'
+            "<script>x()</script></div>"
+        )
+
+        with patch("services.article_service.NewspaperArticle", return_value=mock):
+            result = extract_article_content("https://example.com/article")
+
+        assert result.content_html == "<div><div><h2>Part</h2><p>Body</p></div></div>"
+
     def test_uses_hostname_when_title_missing(self, mock_article):
         """Should use hostname as title when article has no title."""
         mock = mock_article(title="")
@@ -116,6 +128,7 @@ class TestArticleExtraction:
         mock.title = None
         mock.text = None
         mock.top_image = None
+        mock.article_html = None
 
         with patch("services.article_service.NewspaperArticle", return_value=mock):
             result = extract_article_content("https://example.com/article")
@@ -123,3 +136,4 @@ class TestArticleExtraction:
         assert result.title == "example.com"
         assert result.content == ""
         assert result.image_url is None
+        assert result.content_html is None
@@ -0,0 +1,454 @@
+"""
+Tests for article service database operations.
+"""
+
+from services import article_service
+
+
+class TestArticleMutations:
+    """Test suite for single-statement article mutations."""
+
+    def test_toggle_favorite_flips_flag(self, session, sample_article, test_user):
+        """Should flip is_favorite and report success."""
+        from core.models import Article
+
+        result = article_service.toggle_favorite(
+            session, sample_article["id"], test_user.id
+        )
+
+        assert result is True
+        article = session.get(Article, sample_article["id"])
+        assert article.is_favorite is True
+
+    def test_toggle_archive_twice_restores_flag(
+        self, session, sample_article, test_user
+    ):
+        """Should return to the original state after two toggles."""
+        from core.models import Article
+
+        article_service.toggle_archive(session, sample_article["id"], test_user.id)
+        article_service.toggle_archive(session, sample_article["id"], test_user.id)
+
+        article = session.get(Article, sample_article["id"])
+        assert article.is_archived is False
+
+    def test_toggle_is_one_statement(self, session, sample_article, test_user):
+        """Should move counts and announce the change in the toggle's statement."""
+        from sqlalchemy import event
+
+        from services import counts_service
+
+        article_id = sample_article["id"]
+        counts_service.get_counts(session, test_user.id)
+        article_service.get_article_payload(session, article_id, test_user.id)
+        queries = []
+
+        def record(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        event.listen(session.get_bind(), "before_cursor_execute", record)
+        try:
+            article_service.toggle_read(session, article_id, test_user.id)
+        finally:
+            event.remove(session.get_bind(), "before_cursor_execute", record)
+
+        assert len(queries) == 1
+        assert "pg_notify" in queries[0]
+        assert counts_service.get_counts(session, test_user.id).unread == 0
+        assert article_service._article_cache.get((test_user.id, article_id)) is None
+
+    def test_toggle_rejects_other_users_article(self, session, sample_article):
+        """Should return False when the article belongs to another user."""
+        result = article_service.toggle_favorite(session, sample_article["id"], 99999)
+
+        assert result is False
+
+    def test_update_article_sets_both_fields(self, session, sample_article, test_user):
+        """Should set favorite and archive status in one call."""
+        article = article_service.update_article(
+            session,
+            sample_article["id"],
+            test_user.id,
+            is_favorite=True,
+            is_archived=True,
+        )
+
+        assert article is not None
+        assert article.is_favorite is True
+        assert article.is_archived is True
+        assert article.title == sample_article["title"]
+
+    def test_update_article_without_fields_returns_article(
+        self, session, sample_article, test_user
+    ):
+        """Should return the unchanged article when nothing is set."""
+        article = article_service.update_article(
+            session, sample_article["id"], test_user.id
+        )
+
+        assert article is not None
+        assert article.is_favorite is False
+
+    def test_update_article_not_found(self, session, test_user):
+        """Should return None for a missing article."""
+        article = article_service.update_article(
+            session, 9999, test_user.id, is_favorite=True
+        )
+
+        assert article is None
+
+
+class TestArticleCache:
+    """Test suite for cached article payloads."""
+
+    def test_second_read_is_a_hit(self, session, sample_article, test_user):
+        """Should serve the serialized article from cache without a query."""
+        import json
+
+        from sqlalchemy import event
+
+        article_id = sample_article["id"]
+        first = article_service.get_article_payload(session, article_id, test_user.id)
+        queries = []
+
+        def record(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        event.listen(session.get_bind(), "before_cursor_execute", record)
+        try:
+            second = article_service.get_article_payload(
+                session, article_id, test_user.id
+            )
+        finally:
+            event.remove(session.get_bind(), "before_cursor_execute", record)
+
+        assert second == first
+        assert queries == []
+        assert json.loads(second[1])["id"] == article_id
+        assert article_service._article_cache.stats()["hits"] >= 1
+
+    def test_mutations_invalidate(self, session, sample_article, test_user):
+        """Should drop the cached payload when the article changes."""
+        import json
+
+        article_id = sample_article["id"]
+
+        def cached_flags():
+            _, payload, _ = article_service.get_article_payload(
+                session, article_id, test_user.id
+            )
+            data = json.loads(payload)
+            return data["is_favorite"], data["is_archived"], data["tags"]
+
+        assert cached_flags() == (False, False, [])
+        article_service.toggle_favorite(session, article_id, test_user.id)
+        assert cached_flags() == (True, False, [])
+        article_service.update_article(session, article_id, test_user.id, tags=["x"])
+        assert cached_flags() == (True, False, ["x"])
+        article_service.bulk_update_articles(
+            session, test_user.id, "archive", article_ids=[article_id]
+        )
+        assert cached_flags() == (True, True, ["x"])
+        article_service.delete_article(session, article_id, test_user.id)
+        assert (
+            article_service.get_article_payload(session, article_id, test_user.id)
+            is None
+        )
+
+    def test_reset_clears_every_entry(self, session, sample_article, test_user):
+        """Should empty the cache when invalidation events may have been missed."""
+        from core import invalidation
+
+        article_service.get_article_payload(session, sample_article["id"], test_user.id)
+
+        invalidation.reset_all()
+
+        assert len(article_service._article_cache) == 0
+
+    def test_other_user_not_served(self, session, sample_article, test_user):
+        """Should key entries by user so ownership still applies."""
+        article_service.get_article_payload(session, sample_article["id"], test_user.id)
+
+        assert (
+            article_service.get_article_payload(
+                session, sample_article["id"], test_user.id + 1
+            )
+            is None
+        )
+
+
+class TestBulkUpdateArticles:
+    """Test suite for set-based bulk article actions."""
+
+    def _create_articles(self, session, user_id, count, **fields):
+        """Create count articles for a user and return their IDs."""
+        from core.models import Article
+
+        articles = [
+            Article(
+                user_id=user_id, url=f"https://example.com/{i}", title=f"A{i}", **fields
+            )
+            for i in range(count)
+        ]
+        session.add_all(articles)
+        session.commit()
+        return [a.id for a in articles]
+
+    def test_bulk_archive_by_ids(self, session, test_user):
+        """Should archive only the selected articles."""
+        ids = self._create_articles(session, test_user.id, 3)
+
+        count = article_service.bulk_update_articles(
+            session, test_user.id, "archive", article_ids=ids[:2]
+        )
+
+        assert count == 2
+        assert (
+            len(article_service.list_articles(session, test_user.id, "archived")) == 2
+        )
+        assert len(article_service.list_articles(session, test_user.id, "all")) == 1
+
+    def test_bulk_delete_by_filter_and_age(self, session, test_user):
+        """Should delete archived articles older than the cutoff only."""
+        from datetime import timedelta
+
+        from core.models import Article, utc_now
+
+        old_ids = self._create_articles(session, test_user.id, 2, is_archived=True)
+        self._create_articles(session, test_user.id, 1, is_archived=True)
+        for article_id in old_ids:
+            article = session.get(Article, article_id)
+            article.created_at = utc_now() - timedelta(days=60)
+        session.commit()
+
+        count = article_service.bulk_update_articles(
+            session, test_user.id, "delete", filter_type="archived", older_than_days=30
+        )
+
+        assert count == 2
+        assert (
+            len(article_service.list_articles(session, test_user.id, "archived")) == 1
+        )
+
+    def test_bulk_ignores_other_users_articles(self, session, test_user):
+        """Should not touch IDs owned by another user."""
+        ids = self._create_articles(session, test_user.id, 2)
+
+        count = article_service.bulk_update_articles(
+            session, 99999, "favorite", article_ids=ids
+        )
+
+        assert count == 0
+
+    def test_bulk_empty_id_list_is_noop(self, session, test_user):
+        """Should affect nothing for an empty ID list."""
+        self._create_articles(session, test_user.id, 2)
+
+        count = article_service.bulk_update_articles(
+            session, test_user.id, "delete", article_ids=[]
+        )
+
+        assert count == 0
+
+
+class TestSearchArticles:
+    """Test suite for PostgreSQL full-text search."""
+
+    def _create(self, session, user_id, title, content, **fields):
+        """Create and return an article."""
+        from core.models import Article
+
+        article = Article(
+            user_id=user_id,
+            url="https://example.com",
+            title=title,
+            content=content,
+            **fields,
+        )
+        session.add(article)
+        session.commit()
+        return article
+
+    def test_search_matches_content_with_highlight(self, session, test_user):
+        """Should find articles by body text and highlight the match."""
+        self._create(
+            session, test_user.id, "Gardening", "Tomatoes need plenty of sunlight."
+        )
+        self._create(session, test_user.id, "Cooking", "Pasta water should be salty.")
+
+        results, total = article_service.search_articles(
+            session, test_user.id, "tomato"
+        )
+
+        assert total == 1
+        assert results[0].title == "Gardening"
+        assert "<mark>Tomatoes</mark>" in results[0].snippet
+
+    def test_search_ranks_title_matches_first(self, session, test_user):
+        """Should rank a title match above a body-only match."""
+        self._create(session, test_user.id, "Unrelated", "A short note about rust.")
+        self._create(session, test_user.id, "Rust ownership", "Borrowing explained.")
+
+        results, _ = article_service.search_articles(session, test_user.id, "rust")
+
+        assert [r.title for r in results] == ["Rust ownership", "Unrelated"]
+
+    def test_search_escapes_html_in_snippet(self, session, test_user):
+        """Should escape article text so snippets are safe to render."""
+        self._create(
+            session, test_user.id, "XSS", "keyword <img src=x onerror=alert(1)>"
+        )
+
+        results, _ = article_service.search_articles(session, test_user.id, "keyword")
+
+        assert "<img" not in results[0].snippet
+        assert "&lt;img" in results[0].snippet
+
+    def test_search_paginates_and_counts_total(self, session, test_user):
+        """Should return one page of results with the full match count."""
+        for i in range(3):
+            self._create(session, test_user.id, f"Python {i}", "python")
+
+        results, total = article_service.search_articles(
+            session, test_user.id, "python", limit=2, offset=2
+        )
+
+        assert total == 3
+        assert len(results) == 1
+
+    def test_search_respects_filter_and_owner(self, session, test_user):
+        """Should apply the dashboard filter and only search the user's articles."""
+        self._create(
+            session, test_user.id, "Archived python", "python", is_archived=True
+        )
+        self._create(session, test_user.id, "Unread python", "python")
+
+        results, _ = article_service.search_articles(
+            session, test_user.id, "python", filter_type="archived"
+        )
+        other_results, other_total = article_service.search_articles(
+            session, 99999, "python"
+        )
+
+        assert [r.title for r in results] == ["Archived python"]
+        assert other_results == [] and other_total == 0
+
+    def test_search_blank_query_returns_nothing(self, session, test_user):
+        """Should not query for blank search text."""
+        assert article_service.search_articles(session, test_user.id, "   ") == ([], 0)
+
+
+class TestSuggestArticles:
+    """Test suite for search-as-you-type suggestions."""
+
+    def _create(self, session, user_id, title, url):
+        """Create and return an article."""
+        from core.models import Article
+
+        article = Article(user_id=user_id, url=url, title=title)
+        session.add(article)
+        session.commit()
+        return article
+
+    def test_suggest_matches_partial_host(self, session, test_user):
+        """Should match a partial domain, ignoring www."""
+        self._create(
+            session, test_user.id, "CPU news", "https://www.arstechnica.com/gadgets/1"
+        )
+        self._create(session, test_user.id, "Other", "https://example.com/2")
+
+        suggestions = article_service.suggest_articles(session, test_user.id, "arstech")
+
+        assert [s.host for s in suggestions] == ["arstechnica.com"]
+
+    def test_suggest_matches_partial_title(self, session, test_user):
+        """Should match part of a word in the title, case-insensitively."""
+        self._create(session, test_user.id, "Understanding Kubernetes", "https://a.io")
+
+        suggestions = article_service.suggest_articles(session, test_user.id, "KUBER")
+
+        assert suggestions[0].title == "Understanding Kubernetes"
+
+    def test_suggest_treats_wildcards_literally(self, session, test_user):
+        """Should not let % in the query match every article."""
+        self._create(session, test_user.id, "Plain title", "https://a.io")
+
+        assert article_service.suggest_articles(session, test_user.id, "%%") == []
+
+    def test_suggest_ignores_short_queries(self, session, test_user):
+        """Should return nothing for a single character."""
+        self._create(session, test_user.id, "A title", "https://a.io")
+
+        assert article_service.suggest_articles(session, test_user.id, "a") == []
+
+    def test_suggest_caches_results(self, session, test_user):
+        """Should serve a repeated query from the result cache."""
+        self._create(session, test_user.id, "Cached title", "https://a.io")
+        hits = article_service._suggest_cache.hits
+
+        first = article_service.suggest_articles(session, test_user.id, "cached")
+        second = article_service.suggest_articles(session, test_user.id, "cached")
+
+        assert first == second
+        assert article_service._suggest_cache.hits == hits + 1
+
+    def test_suggest_tolerates_typos(self, session, test_user):
+        """Should match a misspelled host when pg_trgm is installed."""
+        import pytest
+
+        if not article_service._has_trigram(session):
+            pytest.skip("pg_trgm is not installed on the test server")
+
+        self._create(session, test_user.id, "CPU news", "https://arstechnica.com/1")
+
+        suggestions = article_service.suggest_articles(
+            session, test_user.id, "arstecnica"
+        )
+
+        assert [s.host for s in suggestions] == ["arstechnica.com"]
+
+
+class TestLookupArticles:
+    """Test suite for fetching articles by ID list."""
+
+    def test_returns_owned_articles_in_requested_order(self, session, test_user):
+        """Should skip unknown and foreign IDs and keep the requested order."""
+        from core.models import Article, User
+
+        other = User(email="other@example.com", name="Other")
+        session.add(other)
+        session.commit()
+        articles = [
+            Article(user_id=test_user.id, url=f"https://example.com/{i}")
+            for i in range(3)
+        ]
+        foreign = Article(user_id=other.id, url="https://example.com/x")
+        session.add_all([*articles, foreign])
+        session.commit()
+        ids = [articles[2].id, foreign.id, 9999, articles[0].id]
+
+        result = article_service.lookup_articles(session, test_user.id, ids)
+
+        assert [a.id for a in result] == [articles[2].id, articles[0].id]
+
+    def test_defers_bodies_without_content(self, session, test_user):
+        """Should not load body columns when content is not wanted."""
+        from core.models import Article
+
+        article = Article(
+            user_id=test_user.id, url="https://example.com", content="Body"
+        )
+        session.add(article)
+        session.commit()
+        article_id = article.id
+        session.expunge_all()
+
+        with_body = article_service.lookup_articles(session, test_user.id, [article_id])
+        session.expunge_all()
+        without_body = article_service.lookup_articles(
+            session, test_user.id, [article_id], with_content=False
+        )
+
+        assert with_body[0].content == "Body"
+        assert "content" not in without_body[0].__dict__
+        assert without_body[0].url == "https://example.com"
@@ -0,0 +1,61 @@
+"""
+Tests for the content-addressed cold-tier blob store.
+"""
+
+from core.blobstore import BlobStore
+
+
+class TestBlobStore:
+    """Test suite for BlobStore."""
+
+    def test_put_get_round_trip(self, tmp_path):
+        """Should return the stored text by its key."""
+        store = BlobStore(tmp_path)
+
+        key = store.put("archived body")
+
+        assert store.get(key) == "archived body"
+        assert store.path(key).exists()
+
+    def test_identical_content_stored_once(self, tmp_path):
+        """Should give identical text the same key and file."""
+        store = BlobStore(tmp_path)
+
+        assert store.put("same") == store.put("same")
+        assert len(list(store.keys())) == 1
+
+    def test_delete_removes_blob(self, tmp_path):
+        """Should delete a blob and tolerate deleting it again."""
+        store = BlobStore(tmp_path)
+        key = store.put("gone")
+
+        store.delete(key)
+        store.delete(key)
+
+        assert list(store.keys()) == []
+
+    def test_storing_again_refreshes_mtime(self, tmp_path):
+        """Should mark re-stored content as recently used."""
+        import os
+
+        store = BlobStore(tmp_path)
+        key = store.put("again")
+        os.utime(store.path(key), (0, 0))
+
+        store.put("again")
+
+        assert store.path(key).stat().st_mtime > 0
+
+    def test_begin_delete_hides_blob_until_cancelled(self, tmp_path):
+        """Should set a blob aside, and put it back on cancel."""
+        store = BlobStore(tmp_path)
+        key = store.put("aside")
+
+        assert store.begin_delete(key) is not None
+        assert list(store.keys()) == []
+        store.cancel_delete(key)
+        assert store.get(key) == "aside"
+
+        store.begin_delete(key)
+        store.finish_delete(key)
+        assert store.begin_delete(key) is None
@@ -0,0 +1,58 @@
+"""
+Tests for the in-process TTL cache.
+"""
+
+from unittest.mock import patch
+
+from core.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test suite for TTLCache."""
+
+    def test_get_returns_stored_value(self):
+        """Should return a value that was set and count a hit."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_get_missing_returns_default(self):
+        """Should return the default and count a miss."""
+        cache = TTLCache()
+
+        assert cache.get("missing", "default") == "default"
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Should evict the entry that was used least recently."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Should treat entries older than the TTL as missing."""
+        cache = TTLCache(ttl=10)
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("core.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_delete_where_removes_matching_keys(self):
+        """Should remove only keys the predicate selects."""
+        cache = TTLCache()
+        for key in [(1, 1), (1, 2), (2, 1)]:
+            cache.set(key, "value")
+
+        removed = cache.delete_where(lambda key: key[0] == 1)
+
+        assert removed == 2
+        assert cache.get((2, 1)) == "value"
@@ -0,0 +1,36 @@
+"""
+Tests for ETag and If-None-Match helpers.
+"""
+
+from types import SimpleNamespace
+
+from core.conditional import etag_matches, weak_etag
+
+
+def _request(if_none_match=None):
+    """Stand-in request carrying only headers."""
+    headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return SimpleNamespace(headers=headers)
+
+
+class TestWeakEtag:
+    """Test suite for building and matching ETags."""
+
+    def test_depends_on_every_part(self):
+        """Should be stable for equal parts and differ when any part changes."""
+        assert weak_etag(1, "a") == weak_etag(1, "a")
+        assert weak_etag(1, "a") != weak_etag(1, "b")
+        assert weak_etag(1, "a").startswith('W/"')
+
+    def test_matches_any_listed_tag_weakly(self):
+        """Should compare opaque tags, ignoring the weak prefix."""
+        etag = weak_etag(1)
+        strong = etag.removeprefix("W/")
+
+        assert etag_matches(_request(f'"other", {strong}'), etag)
+        assert etag_matches(_request("*"), etag)
+
+    def test_no_match_without_header_or_on_change(self):
+        """Should not match a missing header or a stale tag."""
+        assert not etag_matches(_request(), weak_etag(1))
+        assert not etag_matches(_request(weak_etag(1)), weak_etag(2))
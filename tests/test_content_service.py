@@ -0,0 +1,290 @@
+"""
+Tests for compressed article body storage.
+"""
+
+import pytest
+
+from services import article_service, content_service
+
+BODY = "Long-form article body about compression. " * 50
+
+
+@pytest.fixture
+def compression(monkeypatch):
+    """Enable content compression for the test."""
+    from core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "content_compression", True)
+
+
+def _create(session, user_id, content=BODY):
+    """Save an article through the service and return it."""
+    return article_service.create_article(
+        session, user_id, "https://example.com", "Title", content, "excerpt", None
+    )
+
+
+class TestCompression:
+    """Test suite for the zstd codec."""
+
+    def test_round_trip_with_dictionary(self):
+        """Should restore the original text using a trained dictionary."""
+        from core.compression import compress_text, decompress_text, train_dictionary
+
+        samples = [
+            f"Sample article {i} about databases and caching." * 20 for i in range(200)
+        ]
+        dictionary = train_dictionary(samples, size=4096)
+
+        data = compress_text(BODY, dictionary)
+
+        assert decompress_text(data, dictionary) == BODY
+        assert len(data) < len(BODY)
+
+
+class TestContentService:
+    """Test suite for transparent compressed storage."""
+
+    def test_disabled_stores_plain_text(self, session, test_user):
+        """Should keep content as plain text by default."""
+        article = _create(session, test_user.id)
+
+        assert article.content == BODY
+        assert article.content_zstd is None
+
+    def test_create_stores_compressed_body(self, session, test_user, compression):
+        """Should store only the compressed body but return plain content."""
+        from sqlmodel import select
+
+        from core.models import Article
+
+        article = _create(session, test_user.id)
+        stored = session.exec(
+            select(Article.content, Article.content_zstd).where(
+                Article.id == article.id
+            )
+        ).one()
+
+        assert article.content == BODY
+        assert stored.content is None
+        assert len(stored.content_zstd) < len(BODY)
+
+    def test_reads_are_transparent(self, session, test_user, compression):
+        """Should return plain content from get and list."""
+        article = _create(session, test_user.id)
+        session.expunge_all()
+
+        fetched = article_service.get_article_by_id(session, article.id, test_user.id)
+        listed = article_service.list_articles(session, test_user.id)
+
+        assert fetched.content == BODY
+        assert listed[0].content == BODY
+
+    def test_update_returns_plain_content(self, session, test_user, compression):
+        """Should inflate the article built from the UPDATE ... RETURNING row."""
+        article = _create(session, test_user.id)
+
+        updated = article_service.update_article(
+            session, article.id, test_user.id, is_favorite=True
+        )
+
+        assert updated.content == BODY
+
+    def test_reads_leave_storage_alone(self, session, test_user, monkeypatch):
+        """Should leave compressing pre-existing plain bodies to the batch job."""
+        from core.config import get_settings
+
+        article = _create(session, test_user.id)
+        monkeypatch.setattr(get_settings(), "content_compression", True)
+
+        fetched = article_service.get_article_by_id(session, article.id, test_user.id)
+        assert fetched.content == BODY
+        assert fetched.content_zstd is None
+
+        content_service.compress_existing(session)
+        session.expire_all()
+        assert fetched.content_zstd is not None
+
+    def test_compressed_bodies_stay_searchable(self, session, test_user, monkeypatch):
+        """Should keep body words in the search index in any storage."""
+        from core.config import get_settings
+
+        plain = _create(session, test_user.id, "A body about lighthouses.")
+        monkeypatch.setattr(get_settings(), "content_compression", True)
+        content_service.compress_existing(session)
+        compressed = _create(session, test_user.id, "A body about glaciers.")
+
+        for word, article in (("lighthouses", plain), ("glaciers", compressed)):
+            results, _ = article_service.search_articles(session, test_user.id, word)
+            assert [r.id for r in results] == [article.id]
+
+    def test_trained_dictionary_used_for_new_bodies(
+        self, session, test_user, compression
+    ):
+        """Should compress with the newest dictionary and still read back."""
+        for i in range(200):
+            _create(session, test_user.id, f"Sample {i} about databases. " * 20)
+
+        dictionary_id = content_service.train(session)
+        article = _create(session, test_user.id)
+        session.expunge_all()
+
+        fetched = article_service.get_article_by_id(session, article.id, test_user.id)
+
+        assert dictionary_id is not None
+        assert fetched.content_dictionary_id == dictionary_id
+        assert fetched.content == BODY
+
+    def test_compress_existing_batches(self, session, test_user, compression):
+        """Should compress plain bodies until none are left."""
+        from core.config import get_settings
+
+        get_settings().content_compression = False
+        for _ in range(3):
+            _create(session, test_user.id)
+        get_settings().content_compression = True
+
+        assert content_service.compress_existing(session, batch_size=2) == 2
+        assert content_service.compress_existing(session, batch_size=2) == 1
+        assert content_service.compress_existing(session, batch_size=2) == 0
+
+
+class TestColdTier:
+    """Test suite for offloading archived bodies to the blob store."""
+
+    @pytest.fixture(autouse=True)
+    def blob_store(self, monkeypatch, tmp_path):
+        """Point the blob store at a temporary directory."""
+        from core.blobstore import BlobStore
+
+        store = BlobStore(tmp_path)
+        monkeypatch.setattr(content_service, "get_blob_store", lambda: store)
+        return store
+
+    def _archive_long_ago(self, session, article, days=120):
+        """Archive an article and backdate its archive time."""
+        from datetime import timedelta
+
+        from core.models import Article, utc_now
+
+        article_service.toggle_archive(session, article.id, article.user_id)
+        row = session.get(Article, article.id)
+        row.archived_at = utc_now() - timedelta(days=days)
+        session.commit()
+
+    def test_toggle_archive_sets_archived_at(self, session, test_user):
+        """Should stamp archived_at on archive and clear it on unarchive."""
+        from core.models import Article
+
+        article = _create(session, test_user.id)
+
+        article_service.toggle_archive(session, article.id, test_user.id)
+        assert session.get(Article, article.id).archived_at is not None
+
+        article_service.toggle_archive(session, article.id, test_user.id)
+        session.expire_all()
+        assert session.get(Article, article.id).archived_at is None
+
+    def test_offload_moves_old_archived_bodies(self, session, test_user, blob_store):
+        """Should move only bodies archived before the cutoff."""
+        old = _create(session, test_user.id)
+        recent = _create(session, test_user.id, "Recently archived body")
+        _create(session, test_user.id, "Unread body")
+        self._archive_long_ago(session, old)
+        self._archive_long_ago(session, recent, days=1)
+
+        moved = content_service.offload_archived(session, older_than_days=90)
+        session.expire_all()
+        fetched = article_service.get_article_by_id(session, old.id, test_user.id)
+
+        assert moved == 1
+        assert fetched.content_blob is not None
+        assert fetched.content == BODY
+        assert blob_store.get(fetched.content_blob) == BODY
+
+    def test_listing_without_content_reads_no_blobs(
+        self, session, test_user, blob_store, monkeypatch
+    ):
+        """Should list offloaded articles without fetching their bodies."""
+        article = _create(session, test_user.id)
+        self._archive_long_ago(session, article)
+        content_service.offload_archived(session, older_than_days=90)
+        article_id = article.id
+        session.expunge_all()
+
+        def unexpected_read(key):
+            raise AssertionError(f"read blob {key}")
+
+        monkeypatch.setattr(blob_store, "get", unexpected_read)
+        listed = article_service.list_articles(
+            session, test_user.id, "archived", with_content=False
+        )
+
+        assert [a.id for a in listed] == [article_id]
+        assert "content" not in listed[0].__dict__
+
+    def test_unarchived_article_returns_to_hot_table(
+        self, session, test_user, blob_store
+    ):
+        """Should restore unarchived bodies in the batch job, not on read."""
+        from sqlmodel import select
+
+        from core.models import Article
+
+        article = _create(session, test_user.id, "A body about lighthouses.")
+        self._archive_long_ago(session, article)
+        content_service.offload_archived(session, older_than_days=90)
+        article_service.toggle_archive(session, article.id, test_user.id)
+        article_service.get_article_by_id(session, article.id, test_user.id)
+
+        query = select(Article.content, Article.content_blob).where(
+            Article.id == article.id
+        )
+        assert session.exec(query).one().content_blob is not None
+        results, _ = article_service.search_articles(
+            session, test_user.id, "lighthouses"
+        )
+        assert [r.id for r in results] == [article.id]
+
+        assert content_service.restore_unarchived(session) == 1
+        stored = session.exec(query).one()
+        assert stored.content == "A body about lighthouses."
+        assert stored.content_blob is None
+
+    def test_prune_deletes_unreferenced_blobs(self, session, test_user, blob_store):
+        """Should delete blobs whose article is gone."""
+        article = _create(session, test_user.id)
+        self._archive_long_ago(session, article)
+        content_service.offload_archived(session, older_than_days=90)
+        article_service.delete_article(session, article.id, test_user.id)
+
+        assert content_service.prune_blobs(session, min_age_seconds=0) == 1
+        assert list(blob_store.keys()) == []
+
+    def test_prune_keeps_blobs_stored_again(
+        self, session, test_user, blob_store, monkeypatch
+    ):
+        """Should keep an old blob that is referenced again before deletion."""
+        import os
+
+        article = _create(session, test_user.id)
+        self._archive_long_ago(session, article)
+        content_service.offload_archived(session, older_than_days=90)
+        article_service.delete_article(session, article.id, test_user.id)
+        ((key, _),) = blob_store.keys()
+        os.utime(blob_store.path(key), (0, 0))
+
+        # An offload of the same body commits while the prune is running.
+        begin_delete = blob_store.begin_delete
+
+        def offload_meanwhile(candidate):
+            modified = begin_delete(candidate)
+            again = _create(session, test_user.id)
+            self._archive_long_ago(session, again)
+            content_service.offload_archived(session, older_than_days=90)
+            return modified
+
+        monkeypatch.setattr(blob_store, "begin_delete", offload_meanwhile)
+
+        assert content_service.prune_blobs(session, min_age_seconds=3600) == 0
+        assert blob_store.get(key) == BODY
@@ -0,0 +1,182 @@
+"""
+Tests for incrementally maintained per-user article counts.
+"""
+
+from services import article_service, counts_service
+
+
+def _counts(session, user_id):
+    """Return the user's counts as a tuple (all, unread, favorites, archived)."""
+    counts = counts_service.get_counts(session, user_id)
+    return counts.all, counts.unread, counts.favorites, counts.archived
+
+
+def _version(session, user_id):
+    """Return the user's library version."""
+    return counts_service.get_library_version(session, user_id)
+
+
+def _create(session, user_id, title="Article"):
+    """Save an article through the service and return it."""
+    return article_service.create_article(
+        session, user_id, "https://example.com", title, "content", "excerpt", None
+    )
+
+
+class TestArticleCounts:
+    """Test suite for counter maintenance across article mutations."""
+
+    def test_counts_built_on_first_read(self, session, test_user):
+        """Should reconcile counts for a user without a counts row."""
+        from core.models import Article
+
+        session.add(Article(user_id=test_user.id, url="https://a.io", is_archived=True))
+        session.commit()
+
+        assert _counts(session, test_user.id) == (0, 0, 0, 1)
+
+    def test_create_increments_unread(self, session, test_user):
+        """Should count a newly saved article as unread."""
+        _counts(session, test_user.id)
+
+        _create(session, test_user.id)
+        _create(session, test_user.id)
+
+        assert _counts(session, test_user.id) == (2, 2, 0, 0)
+
+    def test_toggles_move_article_between_tabs(self, session, test_user):
+        """Should follow favorite and archive toggles."""
+        article = _create(session, test_user.id)
+        _counts(session, test_user.id)
+
+        article_service.toggle_favorite(session, article.id, test_user.id)
+        assert _counts(session, test_user.id) == (1, 1, 1, 0)
+
+        article_service.toggle_archive(session, article.id, test_user.id)
+        assert _counts(session, test_user.id) == (0, 0, 0, 1)
+
+    def test_update_article_adjusts_counts(self, session, test_user):
+        """Should use the previous flags returned by the update."""
+        article = _create(session, test_user.id)
+        _counts(session, test_user.id)
+
+        article_service.update_article(
+            session, article.id, test_user.id, is_favorite=True, is_archived=True
+        )
+        assert _counts(session, test_user.id) == (0, 0, 0, 1)
+
+        article_service.update_article(
+            session, article.id, test_user.id, is_archived=False
+        )
+        assert _counts(session, test_user.id) == (1, 1, 1, 0)
+
+    def test_read_state_moves_article_out_of_unread(self, session, test_user):
+        """Should follow toggle_read, update_article and archiving a read article."""
+        article = _create(session, test_user.id)
+        _counts(session, test_user.id)
+
+        article_service.toggle_read(session, article.id, test_user.id)
+        assert _counts(session, test_user.id) == (1, 0, 0, 0)
+
+        article_service.update_article(session, article.id, test_user.id, is_read=False)
+        assert _counts(session, test_user.id) == (1, 1, 0, 0)
+
+        article_service.update_article(
+            session, article.id, test_user.id, is_read=True, is_archived=True
+        )
+        assert _counts(session, test_user.id) == (0, 0, 0, 1)
+
+        article_service.toggle_archive(session, article.id, test_user.id)
+        assert _counts(session, test_user.id) == (1, 0, 0, 0)
+
+    def test_reading_to_the_end_leaves_unread(self, session, test_user):
+        """Should count articles marked read by the progress flush."""
+        from services import progress_service
+
+        article = _create(session, test_user.id)
+        other = _create(session, test_user.id)
+        _counts(session, test_user.id)
+
+        progress_service.record_progress(test_user.id, article.id, 0.99)
+        progress_service.record_progress(test_user.id, other.id, 0.5)
+        progress_service.flush(session)
+        assert _counts(session, test_user.id) == (2, 1, 0, 0)
+
+        # Already read: scrolling to the end again changes nothing.
+        progress_service.record_progress(test_user.id, article.id, 1.0)
+        progress_service.flush(session)
+        assert _counts(session, test_user.id) == (2, 1, 0, 0)
+
+    def test_delete_decrements_counts(self, session, test_user):
+        """Should remove a deleted favorite from unread and favorites."""
+        article = _create(session, test_user.id)
+        article_service.toggle_favorite(session, article.id, test_user.id)
+        _counts(session, test_user.id)
+
+        assert article_service.delete_article(session, article.id, test_user.id)
+        assert _counts(session, test_user.id) == (0, 0, 0, 0)
+
+    def test_bulk_update_reconciles_counts(self, session, test_user):
+        """Should rebuild counts after a bulk action."""
+        ids = [_create(session, test_user.id, f"A{i}").id for i in range(3)]
+        _counts(session, test_user.id)
+
+        article_service.bulk_update_articles(
+            session, test_user.id, "archive", article_ids=ids[:2]
+        )
+
+        assert _counts(session, test_user.id) == (1, 1, 0, 2)
+
+    def test_reconcile_repairs_drift(self, session, test_user):
+        """Should overwrite counts that disagree with the article table."""
+        from core.models import ArticleCounts
+
+        _create(session, test_user.id)
+        _counts(session, test_user.id)
+        session.get(ArticleCounts, test_user.id).unread_count = 42
+        session.commit()
+
+        counts_service.reconcile_counts(session)
+        session.commit()
+
+        assert _counts(session, test_user.id) == (1, 1, 0, 0)
+
+
+class TestLibraryVersion:
+    """Test suite for the per-user library version behind list ETags."""
+
+    def test_every_change_moves_version(self, session, test_user):
+        """Should move forward with each kind of article mutation."""
+        from services import progress_service
+
+        article = _create(session, test_user.id)
+        versions = [_version(session, test_user.id)]
+
+        article_service.toggle_favorite(session, article.id, test_user.id)
+        versions.append(_version(session, test_user.id))
+        article_service.bulk_update_articles(
+            session, test_user.id, "tag", article_ids=[article.id], tag="db"
+        )
+        versions.append(_version(session, test_user.id))
+        progress_service.record_progress(test_user.id, article.id, 0.3)
+        progress_service.flush(session)
+        versions.append(_version(session, test_user.id))
+        article_service.delete_article(session, article.id, test_user.id)
+        versions.append(_version(session, test_user.id))
+
+        assert versions == sorted(set(versions))
+
+    def test_reconcile_moves_version_only_on_drift(self, session, test_user):
+        """Should keep the version when the counts were already right."""
+        from core.models import Article
+
+        _create(session, test_user.id)
+        version = _version(session, test_user.id)
+
+        counts_service.reconcile_counts(session, test_user.id)
+        unchanged = _version(session, test_user.id)
+        session.add(Article(user_id=test_user.id, url="https://a.io"))
+        counts_service.reconcile_counts(session, test_user.id)
+
+        assert unchanged == version
+        assert _version(session, test_user.id) > version
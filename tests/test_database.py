@@ -185,3 +185,132 @@ class TestDatabaseOperations:
 
         result = session.exec(select(Article).where(Article.id == article_id)).first()
         assert result is None
+
+
+class TestMigrations:
+    """Test suite for schema migrations."""
+
+    def test_fresh_schema_has_no_pending_migrations(self, test_engine):
+        """Should create search objects with the table, leaving nothing to migrate."""
+        from core.migrations import pending_migrations
+
+        assert pending_migrations(test_engine) == []
+
+    def test_startup_fails_on_pending_migrations(self, monkeypatch, test_engine):
+        """Should refuse to start rather than serve on an old schema."""
+        import core.database
+        from core.migrations import PendingMigrationsError
+
+        monkeypatch.setattr(core.database, "get_engine", lambda: test_engine)
+        monkeypatch.setattr(
+            core.database, "pending_migrations", lambda engine: ["article.tags"]
+        )
+
+        with pytest.raises(PendingMigrationsError, match="article.tags"):
+            core.database.init_db()
+        # The migration command itself must still be able to start.
+        core.database.init_db(check_migrations=False)
+
+    def test_search_vector_is_generated(self, session, test_user):
+        """Should populate search_vector from title and content on insert."""
+        from core.models import Article
+        from sqlalchemy import text
+
+        article = Article(
+            user_id=test_user.id, url="https://example.com", title="Hello"
+        )
+        session.add(article)
+        session.commit()
+
+        vector = session.execute(
+            text("SELECT search_vector::text FROM article WHERE id = :id"),
+            {"id": article.id},
+        ).scalar_one()
+        assert "'hello'" in vector
+
+
+class TestReadSession:
+    """Test suite for read replica routing."""
+
+    @pytest.fixture
+    def replica(self, monkeypatch, test_engine):
+        """Configure the test database as the read replica."""
+        from core import database
+
+        monkeypatch.setattr(database, "replica_engine", test_engine)
+
+    def _read_session(self, request, primary):
+        """Return the session chosen by get_read_session."""
+        from core.database import get_read_session
+
+        return next(get_read_session(request, primary))
+
+    def test_without_replica_reads_from_primary(self, session):
+        """Should reuse the primary session when no replica is configured."""
+        from types import SimpleNamespace
+
+        request = SimpleNamespace(session={}, state=SimpleNamespace())
+
+        assert self._read_session(request, session) is session
+
+    def test_replica_used_without_recent_write(self, replica, session):
+        """Should read from the replica and mark the session read-only."""
+        from types import SimpleNamespace
+
+        request = SimpleNamespace(session={}, state=SimpleNamespace())
+        read_session = self._read_session(request, session)
+
+        assert read_session is not session
+        assert read_session.info["read_only"] is True
+        read_session.close()
+
+    def test_commit_makes_reads_sticky_to_primary(self, replica):
+        """Should read from the primary right after the user's own write."""
+        from types import SimpleNamespace
+
+        from core.database import LAST_WRITE_KEY, get_session
+
+        request = SimpleNamespace(session={}, state=SimpleNamespace())
+        sessions = get_session(request)
+        primary = next(sessions)
+        primary.commit()
+
+        assert LAST_WRITE_KEY in request.session
+        assert self._read_session(request, primary) is primary
+        sessions.close()
+
+
+class TestConnectionTiming:
+    """Test suite for lazy session checkout and hold timing."""
+
+    def test_unused_session_holds_no_connection(self):
+        """Should not check out a connection until the first query."""
+        from types import SimpleNamespace
+
+        from core.database import get_engine, get_session
+
+        request = SimpleNamespace(session={}, state=SimpleNamespace())
+        checked_out = get_engine().pool.checkedout()
+        sessions = get_session(request)
+        next(sessions)
+
+        assert get_engine().pool.checkedout() == checked_out
+        sessions.close()
+        assert request.state.db_seconds == 0.0
+
+    def test_hold_time_recorded_until_commit(self):
+        """Should add the transaction's duration to the request total."""
+        from types import SimpleNamespace
+
+        from sqlalchemy import text
+
+        from core.database import get_session
+
+        request = SimpleNamespace(session={}, state=SimpleNamespace())
+        sessions = get_session(request)
+        session = next(sessions)
+        session.execute(text("SELECT pg_sleep(0.01)"))
+        session.commit()
+        sessions.close()
+
+        assert request.state.db_seconds >= 0.01
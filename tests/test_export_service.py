@@ -0,0 +1,90 @@
+"""
+Tests for streaming library export.
+"""
+
+import io
+import json
+import zipfile
+
+from services import article_service, export_service
+
+
+def _create(session, user_id, title="Article", content="content", html=None):
+    """Save an article through the service and return it."""
+    return article_service.create_article(
+        session,
+        user_id,
+        "https://example.com",
+        title,
+        content,
+        "excerpt",
+        None,
+        content_html=html,
+    )
+
+
+class TestIterBatches:
+    """Test suite for iter_batches function."""
+
+    def test_yields_batches_in_id_order(self, session, test_user):
+        """Should page through every article and release each batch."""
+        ids = [_create(session, test_user.id, f"A{i}").id for i in range(5)]
+        session.expunge_all()
+
+        batches = []
+        for batch in export_service.iter_batches(session, test_user.id, batch_size=2):
+            batches.append([a.id for a in batch])
+            assert all(a in session for a in batch)
+
+        assert batches == [ids[0:2], ids[2:4], ids[4:5]]
+        assert len(session.identity_map) == 0
+
+    def test_only_exports_own_articles(self, session, test_user):
+        """Should not include another user's articles."""
+        _create(session, test_user.id)
+
+        assert list(export_service.iter_batches(session, test_user.id + 1)) == []
+
+
+class TestNdjsonExport:
+    """Test suite for ndjson_chunks function."""
+
+    def test_one_article_per_line(self, session, test_user):
+        """Should emit one ArticleResponse object per line."""
+        first = _create(session, test_user.id, "First", "Body\nlines")
+        second = _create(session, test_user.id, "Second")
+
+        body = b"".join(export_service.ndjson_chunks(session, test_user.id))
+        lines = [json.loads(line) for line in body.splitlines()]
+
+        assert body.endswith(b"\n")
+        assert [line["id"] for line in lines] == [first.id, second.id]
+        assert lines[0]["content"] == "Body\nlines"
+        assert lines[0]["title"] == "First"
+
+
+class TestZipExport:
+    """Test suite for zip_chunks function."""
+
+    def test_one_html_file_per_article(self, session, test_user):
+        """Should build a valid archive of standalone HTML documents."""
+        rich = _create(session, test_user.id, "Rich: Story!", html="<p>Rich</p>")
+        plain = _create(session, test_user.id, None, "<b>raw</b>")
+
+        data = b"".join(export_service.zip_chunks(session, test_user.id))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            names = archive.namelist()
+            rich_html = archive.read(names[0]).decode()
+            plain_html = archive.read(names[1]).decode()
+
+        assert names == [f"{rich.id}-rich-story.html", f"{plain.id}-article.html"]
+        assert "<p>Rich</p>" in rich_html
+        assert "<title>Rich: Story!</title>" in rich_html
+        assert "&lt;b&gt;raw&lt;/b&gt;" in plain_html
+
+    def test_empty_library_is_a_valid_archive(self, session, test_user):
+        """Should still produce an (empty) archive."""
+        data = b"".join(export_service.zip_chunks(session, test_user.id))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.namelist() == []
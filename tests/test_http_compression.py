@@ -0,0 +1,184 @@
+"""
+Tests for negotiated response compression.
+"""
+
+import asyncio
+import gzip
+import zlib
+from types import SimpleNamespace
+
+import zstandard
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from core.http_compression import (
+    CompressionMiddleware,
+    negotiate,
+    precompressed_response,
+)
+
+BODY = b"article text " * 500
+
+
+def _client() -> TestClient:
+    """App with large, small, already compressed and 304 responses."""
+    application = FastAPI()
+    application.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @application.get("/large")
+    def large():
+        return Response(BODY, media_type="text/plain")
+
+    @application.get("/small")
+    def small():
+        return Response(b"tiny", media_type="text/plain")
+
+    @application.get("/image")
+    def image():
+        return Response(BODY, media_type="image/png")
+
+    @application.get("/unchanged")
+    def unchanged():
+        return Response(status_code=304)
+
+    return TestClient(application)
+
+
+def _raw_get(client: TestClient, path: str, encoding: str):
+    """GET without letting the client decode the body."""
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as r:
+        return r, b"".join(r.iter_raw())
+
+
+class TestNegotiate:
+    """Test suite for picking a content coding."""
+
+    def test_prefers_zstd_over_gzip(self):
+        """Should pick zstd when both are accepted."""
+        assert negotiate("gzip, deflate, br, zstd") == "zstd"
+        assert negotiate("gzip, deflate") == "gzip"
+
+    def test_honours_quality_values(self):
+        """Should skip codings the client refuses with q=0."""
+        assert negotiate("zstd;q=0, gzip") == "gzip"
+        assert negotiate("*;q=0.5, zstd;q=0") == "gzip"
+        assert negotiate("*") == "zstd"
+
+    def test_returns_none_without_supported_coding(self):
+        """Should send identity when nothing supported is accepted."""
+        assert negotiate("") is None
+        assert negotiate("br, deflate") is None
+        assert negotiate("gzip;q=0") is None
+
+
+class TestCompressionMiddleware:
+    """Test suite for CompressionMiddleware."""
+
+    def test_compresses_large_bodies(self):
+        """Should compress with the negotiated coding and fix Content-Length."""
+        client = _client()
+
+        zstd_response, zstd_body = _raw_get(client, "/large", "zstd")
+        gzip_response, gzip_body = _raw_get(client, "/large", "gzip")
+
+        assert zstd_response.headers["Content-Encoding"] == "zstd"
+        assert zstd_response.headers["Vary"] == "Accept-Encoding"
+        assert zstd_response.headers["Content-Length"] == str(len(zstd_body))
+        assert (
+            zstandard.ZstdDecompressor().decompressobj().decompress(zstd_body) == BODY
+        )
+        assert gzip_response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(gzip_body) == BODY
+        assert len(gzip_body) < len(BODY) // 10
+
+    def test_leaves_small_excluded_and_empty_responses_alone(self):
+        """Should not encode small bodies, compressed formats or 304s."""
+        client = _client()
+
+        small, small_body = _raw_get(client, "/small", "gzip")
+        image, image_body = _raw_get(client, "/image", "gzip")
+        unchanged, _ = _raw_get(client, "/unchanged", "gzip")
+        identity, identity_body = _raw_get(client, "/large", "identity")
+
+        assert "Content-Encoding" not in small.headers
+        assert small_body == b"tiny"
+        assert "Content-Encoding" not in image.headers
+        assert image_body == BODY
+        assert unchanged.status_code == 304
+        assert "Content-Encoding" not in unchanged.headers
+        assert "Content-Encoding" not in identity.headers
+        assert identity_body == BODY
+        assert identity.headers["Vary"] == "Accept-Encoding"
+
+    def test_flushes_each_streamed_chunk(self):
+        """Should make every streamed chunk decodable as soon as it is sent."""
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            for i in range(3):
+                body = b"line %d\n" % i
+                await send(
+                    {"type": "http.response.body", "body": body, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, None, send))
+
+        decoder = zlib.decompressobj(31)
+        lines = [decoder.decompress(message["body"]) for message in sent[1:]]
+        headers = dict(sent[0]["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        assert lines == [b"line 0\n", b"line 1\n", b"line 2\n", b""]
+        assert decoder.eof
+
+
+class TestPrecompressedResponse:
+    """Test suite for precompressed_response function."""
+
+    def test_compresses_once_per_coding(self):
+        """Should store a compressed copy and reuse it on later requests."""
+        request = SimpleNamespace(headers={"accept-encoding": "gzip"})
+        variants = {}
+
+        first = precompressed_response(
+            request, BODY, variants, "application/json", minimum_size=100
+        )
+        variants["gzip"] = b"cached"
+        second = precompressed_response(
+            request, BODY, variants, "application/json", minimum_size=100
+        )
+
+        assert first.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(first.body) == BODY
+        assert second.body == b"cached"
+
+    def test_sends_identity_when_small_or_not_accepted(self):
+        """Should return the plain body below the threshold or without a coding."""
+        variants = {}
+
+        small = precompressed_response(
+            SimpleNamespace(headers={"accept-encoding": "gzip"}),
+            b"{}",
+            variants,
+            "application/json",
+            minimum_size=100,
+        )
+        identity = precompressed_response(
+            SimpleNamespace(headers={}),
+            BODY,
+            variants,
+            "application/json",
+            minimum_size=100,
+        )
+
+        assert small.body == b"{}"
+        assert identity.body == BODY
+        assert "Content-Encoding" not in identity.headers
+        assert variants == {}
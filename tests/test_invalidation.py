@@ -0,0 +1,107 @@
+"""
+Tests for cross-process cache invalidation over LISTEN/NOTIFY.
+"""
+
+import asyncio
+import json
+import select
+
+import pytest
+from sqlmodel import Session
+
+from core import invalidation
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Record 'test' events dispatched in this process."""
+    monkeypatch.setattr(invalidation, "_handlers", {})
+    received = []
+    invalidation.subscribe("test", lambda user_id, ids: received.append((user_id, ids)))
+    return received
+
+
+class TestPublish:
+    """Test suite for publishing events with a transaction."""
+
+    def test_applied_locally_on_commit(self, session, events):
+        """Should run handlers only once the transaction commits."""
+        invalidation.publish(session, "test", 1, [2, 3])
+
+        assert events == []
+        session.commit()
+        assert events == [(1, [2, 3])]
+
+    def test_discarded_on_rollback(self, test_engine, events):
+        """Should drop events of a transaction that rolls back."""
+        with Session(test_engine) as other:
+            invalidation.publish(other, "test", 1, [2])
+            other.rollback()
+            other.commit()
+
+        assert events == []
+
+    def test_notifies_other_connections(self, test_engine):
+        """Should deliver a NOTIFY to listening connections on commit."""
+        listener = invalidation._connect(test_engine)
+        try:
+            with Session(test_engine) as other:
+                invalidation.publish(other, "test", 1, [2])
+                other.commit()
+            payloads = _received(listener)
+        finally:
+            listener.close()
+
+        assert {"kind": "test", "user_id": 1, "ids": [2]} in payloads
+
+    def test_large_id_lists_widen_to_user(self, test_engine):
+        """Should send ids=None when the ID list does not fit a payload."""
+        listener = invalidation._connect(test_engine)
+        try:
+            with Session(test_engine) as other:
+                invalidation.publish(other, "test", 1, range(5000))
+                other.commit()
+            payloads = _received(listener)
+        finally:
+            listener.close()
+
+        assert {"kind": "test", "user_id": 1, "ids": None} in payloads
+
+
+class TestListen:
+    """Test suite for the per-worker listener task."""
+
+    def test_applies_events_from_other_processes(self, test_engine, events):
+        """Should reset caches on connect, then apply published events."""
+
+        async def scenario():
+            task = asyncio.create_task(invalidation.listen(test_engine))
+            try:
+                async with asyncio.timeout(5):
+                    while not events:
+                        await asyncio.sleep(0.01)
+                    await asyncio.to_thread(_publish_elsewhere, test_engine)
+                    while len(events) < 3:
+                        await asyncio.sleep(0.01)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+
+        # The commit applies the event locally too; the NOTIFY repeats it.
+        assert events == [(None, None), (7, [8]), (7, [8])]
+
+
+def _publish_elsewhere(engine):
+    """Commit an event on a separate session, as another worker would."""
+    with Session(engine) as other:
+        invalidation.publish(other, "test", 7, [8])
+        other.commit()
+
+
+def _received(listener, timeout=5.0):
+    """Wait for notifications on a listening connection; return payloads."""
+    if select.select([listener], [], [], timeout)[0]:
+        listener.poll()
+    return [json.loads(n.payload) for n in listener.notifies]
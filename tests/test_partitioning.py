@@ -0,0 +1,113 @@
+"""
+Tests for optional partitioning of the article table.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def scratch(session):
+    """Run the test in an empty schema inside the test transaction."""
+    connection = session.connection()
+    connection.execute(text("CREATE SCHEMA partition_test"))
+    connection.execute(text("SET LOCAL search_path TO partition_test"))
+    return connection
+
+
+def _create_supporting_tables(connection):
+    """Create every table except article in the current schema."""
+    from sqlmodel import SQLModel
+
+    from core.models import Article
+
+    SQLModel.metadata.create_all(
+        connection,
+        tables=[
+            t for t in SQLModel.metadata.sorted_tables if t is not Article.__table__
+        ],
+    )
+
+
+def _insert_user(connection):
+    """Insert a user and return its ID."""
+    return connection.execute(
+        text(
+            'INSERT INTO "user" (email, created_at) '
+            "VALUES ('p@example.com', now()) RETURNING id"
+        )
+    ).scalar_one()
+
+
+class TestPartitioning:
+    """Test suite for partitioned article tables."""
+
+    def test_hash_partitioned_queries_prune(self, session, scratch):
+        """Should serve per-user queries from a single partition."""
+        from core.partitioning import create_partitioned_article, partition_scheme
+        from services import article_service
+
+        _create_supporting_tables(scratch)
+        create_partitioned_article(scratch, "hash", hash_partitions=4)
+        user_id = _insert_user(scratch)
+
+        article = article_service.create_article(
+            session, user_id, "https://a.io", "Title", "body", "excerpt", None
+        )
+        article_service.toggle_favorite(session, article.id, user_id)
+        plan = "\n".join(
+            scratch.execute(
+                text(f"EXPLAIN SELECT * FROM article WHERE user_id = {user_id}")
+            ).scalars()
+        )
+
+        assert partition_scheme(scratch) == "hash"
+        assert article_service.list_articles(session, user_id, "favorites")
+        assert plan.count(" on article_p") == 1
+
+    def test_convert_then_retire_range_partitions(self, scratch):
+        """Should copy rows into monthly partitions and drop old months."""
+        from sqlmodel import SQLModel
+
+        from core.partitioning import convert, partition_scheme, retire_months
+
+        SQLModel.metadata.create_all(scratch)
+        user_id = _insert_user(scratch)
+        for created_at in (datetime(2020, 1, 15), datetime.now()):
+            scratch.execute(
+                text(
+                    "INSERT INTO article (user_id, url, is_archived, is_favorite, "
+                    "created_at) VALUES (:user_id, 'https://a.io', false, false, "
+                    ":created_at)"
+                ),
+                {"user_id": user_id, "created_at": created_at},
+            )
+
+        scratch.execute(
+            text(
+                "INSERT INTO article_counts (user_id, all_count, unread_count, "
+                "favorite_count, archived_count) VALUES (:user_id, 2, 2, 0, 0)"
+            ),
+            {"user_id": user_id},
+        )
+
+        convert(scratch, "range")
+        dropped = retire_months(scratch, before=date(2020, 2, 1))
+
+        assert partition_scheme(scratch) == "range"
+        assert dropped == ["article_2020_01"]
+        assert (
+            scratch.execute(text("SELECT count(*) FROM article_tombstone")).scalar()
+            == 1
+        )
+        assert scratch.execute(text("SELECT count(*) FROM article")).scalar() == 1
+        assert (
+            scratch.execute(text("SELECT unread_count FROM article_counts")).scalar()
+            == 1
+        )
+        assert (
+            scratch.execute(text("SELECT count(*) FROM article_unpartitioned")).scalar()
+            == 2
+        )
@@ -0,0 +1,152 @@
+"""
+Tests for buffered reading progress and the unread filter.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from services import article_service, progress_service
+
+
+@pytest.fixture(autouse=True)
+def clear_pending():
+    """Start each test with an empty progress buffer."""
+    progress_service._pending.clear()
+    yield
+    progress_service._pending.clear()
+
+
+def _create(session, user_id, title="Article"):
+    """Save an article through the service and return it."""
+    return article_service.create_article(
+        session, user_id, "https://example.com", title, "content", "excerpt", None
+    )
+
+
+class TestProgressBuffer:
+    """Test suite for coalesced progress writes."""
+
+    def test_reports_coalesce_until_flush(self, session, test_user):
+        """Should keep only the latest report per article and write it on flush."""
+        article = _create(session, test_user.id)
+
+        progress_service.record_progress(test_user.id, article.id, 0.2)
+        progress_service.record_progress(test_user.id, article.id, 0.4)
+
+        assert progress_service.pending_count() == 1
+        assert progress_service.flush(session) == 1
+        session.refresh(article)
+        assert article.read_progress == pytest.approx(0.4)
+        assert article.is_read is False
+        assert progress_service.pending_count() == 0
+
+    def test_reaching_end_marks_read(self, session, test_user):
+        """Should mark an article read at the threshold and keep it read."""
+        article = _create(session, test_user.id)
+
+        progress_service.record_progress(test_user.id, article.id, 1.0)
+        progress_service.flush(session)
+        progress_service.record_progress(test_user.id, article.id, 0.1)
+        progress_service.flush(session)
+
+        session.refresh(article)
+        assert article.is_read is True
+        assert article.read_progress == pytest.approx(0.1)
+
+    def test_flush_batches_many_articles(self, session, test_user):
+        """Should write every pending article in one flush."""
+        articles = [_create(session, test_user.id, f"A{i}") for i in range(3)]
+        for i, article in enumerate(articles):
+            progress_service.record_progress(test_user.id, article.id, i / 4)
+
+        assert progress_service.flush(session) == 3
+        for i, article in enumerate(articles):
+            session.refresh(article)
+            assert article.read_progress == pytest.approx(i / 4)
+
+    def test_other_users_article_untouched(self, session, test_user):
+        """Should drop reports for articles the user does not own."""
+        article = _create(session, test_user.id)
+
+        progress_service.record_progress(test_user.id + 1, article.id, 1.0)
+        progress_service.flush(session)
+
+        session.refresh(article)
+        assert article.read_progress == 0
+        assert article.is_read is False
+
+    def test_flush_invalidates_cached_article(self, session, test_user):
+        """Should drop cached payloads of articles whose progress was written."""
+        article = _create(session, test_user.id)
+        article_service.get_article_payload(session, article.id, test_user.id)
+
+        progress_service.record_progress(test_user.id, article.id, 0.5)
+        progress_service.flush(session)
+        _, payload, _ = article_service.get_article_payload(
+            session, article.id, test_user.id
+        )
+
+        assert b'"read_progress":0.5' in payload
+
+    def test_failed_flush_keeps_reports(self, session, test_user, monkeypatch):
+        """Should put a failed batch back without overwriting newer reports."""
+        monkeypatch.setattr(progress_service, "_write", _fail_then_record)
+
+        progress_service.record_progress(test_user.id, 1, 0.3)
+        progress_service.record_progress(test_user.id, 2, 0.5)
+        with pytest.raises(RuntimeError):
+            progress_service.flush(session)
+
+        assert progress_service._pending == {
+            (test_user.id, 1): 0.9,
+            (test_user.id, 2): 0.5,
+        }
+
+
+def _fail_then_record(session, batch):
+    """Stand-in for _write: a newer report arrives, then the write fails."""
+    user_id = next(iter(batch))[0]
+    progress_service.record_progress(user_id, 1, 0.9)
+    raise RuntimeError("database unavailable")
+
+
+class TestUnreadFilter:
+    """Test suite for the unread dashboard filter."""
+
+    def test_lists_unread_only(self, session, test_user):
+        """Should exclude read and archived articles."""
+        unread = _create(session, test_user.id, "Unread")
+        read = _create(session, test_user.id, "Read")
+        archived = _create(session, test_user.id, "Archived")
+        article_service.toggle_read(session, read.id, test_user.id)
+        article_service.update_article(
+            session, archived.id, test_user.id, is_archived=True
+        )
+
+        articles = article_service.list_articles(session, test_user.id, "unread")
+
+        assert [a.id for a in articles] == [unread.id]
+
+    def test_uses_partial_index(self, session, test_user):
+        """Should plan the unread listing on the partial index."""
+        from core.models import Article
+        from sqlmodel import select
+
+        # Tiny test tables favour other plans; rule them out.
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        session.execute(text("SET LOCAL enable_sort = off"))
+        query = (
+            select(Article.id)
+            .where(
+                Article.user_id == test_user.id,
+                *article_service._filter_conditions("unread"),
+            )
+            .order_by(Article.created_at.desc())
+        )
+        compiled = query.compile(
+            session.get_bind(), compile_kwargs={"literal_binds": True}
+        )
+
+        plan = session.execute(text(f"EXPLAIN {compiled}")).scalars().all()
+
+        assert "ix_article_user_unread" in "\n".join(plan)
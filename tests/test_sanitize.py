@@ -0,0 +1,63 @@
+"""
+Tests for sanitizing extracted article HTML.
+"""
+
+from core.sanitize import sanitize_html
+
+BASE = "https://example.com/posts/article"
+
+
+class TestSanitizeHtml:
+    """Test suite for sanitize_html function."""
+
+    def test_keeps_structure(self):
+        """Should keep headings, lists, emphasis and tables."""
+        html = sanitize_html(
+            "<h2>Title</h2><ul><li><em>one</em></li></ul>"
+            "<table><tr><td>cell</td></tr></table>",
+            BASE,
+        )
+
+        assert "<h2>Title</h2>" in html
+        assert "<li><em>one</em></li>" in html
+        assert "<td>cell</td>" in html
+
+    def test_removes_scripts_handlers_and_styles(self):
+        """Should drop script content, event handlers, styles and forms."""
+        html = sanitize_html(
+            '<p onclick="steal()" style="color:red" class="x">Text</p>'
+            "<script>steal()</script><style>p{}</style>"
+            '<iframe src="https://evil.example"></iframe><form><input></form>',
+            BASE,
+        )
+
+        assert html == "<div><p>Text</p></div>"
+
+    def test_keeps_escaped_text_escaped(self):
+        """Should not turn escaped markup in the text back into tags."""
+        html = sanitize_html("<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>", BASE)
+
+        assert "<script>" not in html
+        assert "&lt;script&gt;" in html
+
+    def test_resolves_links_and_blocks_unsafe_schemes(self):
+        """Should make links absolute and drop javascript: and data: URLs."""
+        html = sanitize_html(
+            '<p><a href="../other">rel</a> <a href="javascript:alert(1)">js</a>'
+            '<img src="data:image/png;base64,AAAA"><img src="/hero.png"></p>',
+            BASE,
+        )
+
+        assert (
+            '<a href="https://example.com/other" rel="nofollow noopener noreferrer">'
+            in html
+        )
+        assert '<a rel="nofollow noopener noreferrer">js</a>' in html
+        assert "data:" not in html
+        assert '<img src="https://example.com/hero.png" loading="lazy">' in html
+
+    def test_returns_empty_string_without_content(self):
+        """Should return an empty string when nothing readable is left."""
+        assert sanitize_html("", BASE) == ""
+        assert sanitize_html("   ", BASE) == ""
+        assert sanitize_html("<script>steal()</script>", BASE) == ""
@@ -155,3 +155,37 @@ class TestArticleSchemas:
         update = ArticleUpdate(is_archived=True)
         assert update.is_archived is True
         assert update.is_favorite is None
+
+
+class TestArticleBulkUpdateSchema:
+    """Test suite for bulk action selector validation."""
+
+    def test_bulk_requires_selector(self):
+        """Should reject a request that selects nothing."""
+        from schemas.article import ArticleBulkUpdate
+
+        with pytest.raises(ValidationError):
+            ArticleBulkUpdate(action="archive")
+
+    def test_bulk_rejects_zero_day_age(self):
+        """Should not accept older_than_days=0, which would match every article."""
+        from schemas.article import ArticleBulkUpdate
+
+        with pytest.raises(ValidationError):
+            ArticleBulkUpdate(action="archive", older_than_days=0)
+
+    def test_bulk_delete_requires_ids_or_filter(self):
+        """Should not allow deleting by age alone."""
+        from schemas.article import ArticleBulkUpdate
+
+        with pytest.raises(ValidationError):
+            ArticleBulkUpdate(action="delete", older_than_days=30)
+
+    def test_bulk_delete_with_filter_and_age(self):
+        """Should allow deleting archived articles older than N days."""
+        from schemas.article import ArticleBulkUpdate
+
+        bulk = ArticleBulkUpdate(action="delete", filter="archived", older_than_days=30)
+
+        assert bulk.filter == "archived"
+        assert bulk.older_than_days == 30
@@ -0,0 +1,90 @@
+"""
+Tests for single-pass JSON serialization of API schemas.
+"""
+
+import json
+from types import SimpleNamespace
+
+import msgpack
+
+from core.models import Article
+from core.serialization import dump_json, get_adapter, schema_response, wants_msgpack
+from schemas.article import ArticleListResponse, ArticleResponse
+
+
+def _request(accept=None):
+    """Stand-in request carrying only an Accept header."""
+    return SimpleNamespace(headers={"accept": accept} if accept else {})
+
+
+def _articles():
+    """Transient ORM articles."""
+    return [
+        Article(id=i, user_id=1, url=f"https://example.com/{i}", tags=["t"])
+        for i in range(3)
+    ]
+
+
+class TestSerialization:
+    """Test suite for dump_json and schema_response."""
+
+    def test_matches_model_serialization(self):
+        """Should produce the same document as validating item by item."""
+        articles = _articles()
+        expected = ArticleListResponse(
+            articles=[ArticleResponse.model_validate(a) for a in articles],
+            count=3,
+        ).model_dump_json()
+
+        body = dump_json(ArticleListResponse, {"articles": articles, "count": 3})
+
+        assert json.loads(body) == json.loads(expected)
+
+    def test_serializes_plain_lists(self):
+        """Should accept list types, not only models."""
+        body = dump_json(list[ArticleResponse], _articles())
+
+        assert [item["id"] for item in json.loads(body)] == [0, 1, 2]
+
+    def test_reuses_adapters(self):
+        """Should build one adapter per schema."""
+        assert get_adapter(ArticleListResponse) is get_adapter(ArticleListResponse)
+
+    def test_schema_response(self):
+        """Should return a raw JSON response with the given status."""
+        response = schema_response(
+            _request(), list[ArticleResponse], [], status_code=201
+        )
+
+        assert response.status_code == 201
+        assert response.media_type == "application/json"
+        assert response.body == b"[]"
+
+    def test_schema_response_msgpack(self):
+        """Should encode MessagePack with the JSON document's shape."""
+        articles = _articles()
+        data = {"articles": articles, "count": 3}
+
+        response = schema_response(
+            _request("application/msgpack"), ArticleListResponse, data
+        )
+
+        assert response.media_type == "application/msgpack"
+        assert msgpack.unpackb(response.body) == json.loads(
+            dump_json(ArticleListResponse, data)
+        )
+
+
+class TestWantsMsgpack:
+    """Test suite for wants_msgpack function."""
+
+    def test_negotiates_by_quality(self):
+        """Should pick MessagePack only when preferred at least as much as JSON."""
+        assert wants_msgpack(_request("application/msgpack"))
+        assert wants_msgpack(_request("application/x-msgpack, application/json"))
+        assert not wants_msgpack(
+            _request("application/msgpack;q=0.5, application/json")
+        )
+        assert not wants_msgpack(_request("application/msgpack;q=0"))
+        assert not wants_msgpack(_request("*/*"))
+        assert not wants_msgpack(_request())
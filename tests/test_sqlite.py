@@ -0,0 +1,197 @@
+"""
+Tests for the embedded SQLite backend.
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel
+
+from services import article_service, counts_service
+
+
+@pytest.fixture
+def sqlite_session(tmp_path):
+    """Session on a fresh SQLite database file."""
+    from core.database import _create_engine
+    from core.models import User
+
+    engine = _create_engine(f"sqlite:///{tmp_path / 'timstapaper.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(email="lite@example.com", name="Lite"))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _create(session, title, content="", url="https://example.com/a"):
+    """Save an article for the first user and return it."""
+    return article_service.create_article(
+        session, 1, url, title, content, content[:20], None
+    )
+
+
+class TestSQLiteBackend:
+    """Test suite for SQLite mode."""
+
+    def test_pragmas_applied(self, sqlite_session):
+        """Should run in WAL mode with foreign keys enforced."""
+        journal_mode = sqlite_session.execute(text("PRAGMA journal_mode")).scalar()
+        foreign_keys = sqlite_session.execute(text("PRAGMA foreign_keys")).scalar()
+
+        assert journal_mode == "wal"
+        assert foreign_keys == 1
+
+    def test_mutations_keep_counts(self, sqlite_session):
+        """Should support RETURNING-based mutations and counters."""
+        first = _create(sqlite_session, "One")
+        second = _create(sqlite_session, "Two")
+        counts_service.get_counts(sqlite_session, 1)
+        version = counts_service.get_library_version(sqlite_session, 1)
+
+        article_service.toggle_favorite(sqlite_session, first.id, 1)
+        updated = article_service.update_article(
+            sqlite_session, second.id, 1, is_archived=True
+        )
+        counts = counts_service.get_counts(sqlite_session, 1)
+
+        assert updated.is_archived is True
+        assert (counts.unread, counts.favorites, counts.archived) == (1, 1, 1)
+        assert counts_service.get_library_version(sqlite_session, 1) > version
+        assert article_service.delete_article(sqlite_session, first.id, 1)
+
+    def test_search_uses_fts(self, sqlite_session):
+        """Should rank title matches first and highlight the snippet."""
+        _create(sqlite_session, "Notes", "A short note about gardening tomatoes.")
+        _create(sqlite_session, "Tomato season", "Harvest time.")
+        _create(sqlite_session, "Cooking", "Pasta water should be salty.")
+
+        results, total = article_service.search_articles(sqlite_session, 1, "tomatoes")
+
+        assert total == 2
+        assert results[0].title == "Tomato season"
+        assert "<mark>tomatoes</mark>" in results[1].snippet
+
+    def test_search_tracks_updates_and_deletes(self, sqlite_session):
+        """Should keep the FTS index in sync with the article table."""
+        article = _create(sqlite_session, "Ephemeral", "kiwi")
+
+        article_service.delete_article(sqlite_session, article.id, 1)
+
+        assert article_service.search_articles(sqlite_session, 1, "kiwi") == ([], 0)
+
+    def test_search_covers_compressed_bodies(self, sqlite_session, monkeypatch):
+        """Should index and delete bodies stored compressed."""
+        from core.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "content_compression", True)
+        article = _create(
+            sqlite_session, "Stored", "Notes from a trip to the glaciers."
+        )
+
+        results, _ = article_service.search_articles(sqlite_session, 1, "glaciers")
+        assert [r.id for r in results] == [article.id]
+        assert "<mark>glaciers</mark>" in results[0].snippet
+
+        article_service.delete_article(sqlite_session, article.id, 1)
+        integrity = "INSERT INTO article_fts (article_fts) VALUES ('integrity-check')"
+        sqlite_session.execute(text(integrity))
+        assert article_service.search_articles(sqlite_session, 1, "glaciers") == (
+            [],
+            0,
+        )
+
+    def test_migrate_rebuilds_fts_over_stored_bodies(self, sqlite_session):
+        """Should replace an index that could not see compressed bodies."""
+        from core.migrations import pending_migrations, run_migrations
+
+        engine = sqlite_session.get_bind()
+        sqlite_session.execute(text("DROP VIEW article_search"))
+        sqlite_session.commit()
+        assert pending_migrations(engine) == ["article_search view"]
+
+        run_migrations(engine)
+        assert pending_migrations(engine) == []
+
+    def test_search_treats_operators_literally(self, sqlite_session):
+        """Should not raise on FTS5 syntax in user input."""
+        _create(sqlite_session, "Quotes", "plain text")
+
+        results, _ = article_service.search_articles(
+            sqlite_session, 1, 'NEAR( "unbalanced'
+        )
+
+        assert results == []
+
+    def test_suggest_matches_host(self, sqlite_session):
+        """Should match partial hosts via the url_host() SQL function."""
+        _create(sqlite_session, "CPU news", url="https://www.arstechnica.com/1")
+
+        suggestions = article_service.suggest_articles(sqlite_session, 1, "arstech")
+
+        assert [s.host for s in suggestions] == ["arstechnica.com"]
+
+    def test_bulk_update_reconciles_counts(self, sqlite_session):
+        """Should rebuild counts with SQLite's upsert."""
+        ids = [_create(sqlite_session, f"A{i}").id for i in range(3)]
+
+        article_service.bulk_update_articles(
+            sqlite_session, 1, "archive", article_ids=ids
+        )
+        counts = counts_service.get_counts(sqlite_session, 1)
+
+        assert counts.archived == 3
+
+    def test_progress_flush(self, sqlite_session):
+        """Should write buffered reading progress without UPDATE ... FROM."""
+        from services import progress_service
+
+        article = _create(sqlite_session, "Long read")
+        progress_service._pending.clear()
+        progress_service.record_progress(1, article.id, 0.97)
+        progress_service.flush(sqlite_session)
+
+        sqlite_session.refresh(article)
+        unread = article_service.list_articles(sqlite_session, 1, "unread")
+
+        assert (article.read_progress, article.is_read) == (0.97, True)
+        assert unread == []
+
+    def test_tags(self, sqlite_session):
+        """Should filter, bulk-edit and count JSON tag arrays."""
+        from services import tag_service
+
+        first = _create(sqlite_session, "One")
+        second = _create(sqlite_session, "Two")
+        article_service.update_article(sqlite_session, first.id, 1, tags=["db", "x"])
+        article_service.bulk_update_articles(
+            sqlite_session, 1, "tag", article_ids=[first.id, second.id], tag="db"
+        )
+        article_service.bulk_update_articles(
+            sqlite_session, 1, "untag", article_ids=[first.id], tag="x"
+        )
+        tagged = article_service.list_articles(sqlite_session, 1, tag="db")
+        counts = {t.tag: t.count for t in tag_service.list_tags(sqlite_session, 1)}
+        tag_service.reconcile_tags(sqlite_session, 1)
+        rebuilt = {t.tag: t.count for t in tag_service.list_tags(sqlite_session, 1)}
+
+        assert [a.id for a in tagged] == [second.id, first.id]
+        assert [a.tags for a in tagged] == [["db"], ["db"]]
+        assert counts == rebuilt == {"db": 2}
+
+    def test_sync(self, sqlite_session):
+        """Should page changes and tombstones with row-value keyset reads."""
+        from services import sync_service
+
+        first = _create(sqlite_session, "One")
+        second = _create(sqlite_session, "Two")
+        _, _, token, _ = sync_service.changes_since(sqlite_session, 1, None, 10)
+        article_service.toggle_read(sqlite_session, second.id, 1)
+        article_service.delete_article(sqlite_session, first.id, 1)
+
+        changed, deleted, _, has_more = sync_service.changes_since(
+            sqlite_session, 1, token, 10
+        )
+
+        assert [(a.id, a.is_read) for a in changed] == [(second.id, True)]
+        assert (deleted, has_more) == ([first.id], False)
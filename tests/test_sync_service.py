@@ -0,0 +1,194 @@
+"""
+Tests for delta sync tokens, tombstones and paging.
+"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+from core.models import Article, utc_now
+from services import article_service, progress_service, sync_service
+
+
+def _create(session, user_id, title="Article"):
+    """Save an article through the service and return it."""
+    return article_service.create_article(
+        session, user_id, "https://example.com", title, "content", "excerpt", None
+    )
+
+
+def _position(token):
+    """Stream position a token points at, without its issue time."""
+    return sync_service.decode_token(token)[0]
+
+
+def _sync_all(session, user_id, token=None, limit=100):
+    """Follow pages until has_more is false; return ids, deletes and token."""
+    changed, deleted = [], []
+    while True:
+        page, gone, token, has_more = sync_service.changes_since(
+            session, user_id, token, limit
+        )
+        changed += [a.id for a in page]
+        deleted += gone
+        if not has_more:
+            return changed, deleted, token
+
+
+class TestSyncTokens:
+    """Test suite for sync token encoding."""
+
+    def test_round_trip(self):
+        """Should decode to the position it was made from, issued now."""
+        position = (1234, 56, 1, 42)
+
+        token = sync_service.encode_token(position)
+        decoded, issued = sync_service.decode_token(token)
+
+        assert decoded == position
+        assert utc_now() - issued < timedelta(seconds=5)
+
+    @pytest.mark.parametrize("token", ["not-a-token", "WzEsMl0", "bnVsbA"])
+    def test_rejects_malformed(self, token):
+        """Should raise ValueError for anything encode_token did not make."""
+        with pytest.raises(ValueError):
+            sync_service.decode_token(token)
+
+    def test_updated_at_tokens_expire(self):
+        """Should send clients holding a timestamp token back to a full sync."""
+        token = "WyIyMDI2LTAxLTAxVDAwOjAwOjAwIiwgMCwgMV0"  # [iso time, 0, 1]
+
+        with pytest.raises(sync_service.SyncTokenExpired):
+            sync_service.decode_token(token)
+
+
+class TestChangesSince:
+    """Test suite for reading changes after a token."""
+
+    def test_initial_sync_pages_through_everything(self, session, test_user):
+        """Should return every article once, oldest change first, in pages."""
+        ids = [_create(session, test_user.id, f"A{i}").id for i in range(3)]
+
+        first, _, token, has_more = sync_service.changes_since(
+            session, test_user.id, None, 2
+        )
+        rest, _, token, more_after = sync_service.changes_since(
+            session, test_user.id, token, 2
+        )
+        again, deleted, same_token, _ = sync_service.changes_since(
+            session, test_user.id, token, 2
+        )
+
+        assert [a.id for a in first + rest] == ids
+        assert (has_more, more_after) == (True, False)
+        assert (again, deleted) == ([], [])
+        assert _position(same_token) == _position(token)
+
+    def test_returns_only_changed_articles(self, session, test_user):
+        """Should return articles touched after the token, with new state."""
+        kept = _create(session, test_user.id, "Kept")
+        changed = _create(session, test_user.id, "Changed")
+        tagged = _create(session, test_user.id, "Tagged")
+        *_, token = _sync_all(session, test_user.id)
+
+        article_service.toggle_favorite(session, changed.id, test_user.id)
+        article_service.bulk_update_articles(
+            session, test_user.id, "tag", article_ids=[tagged.id], tag="db"
+        )
+        page, _, _, _ = sync_service.changes_since(session, test_user.id, token, 10)
+
+        assert kept.id not in [a.id for a in page]
+        assert [(a.id, a.is_favorite, a.tags) for a in page] == [
+            (changed.id, True, []),
+            (tagged.id, False, ["db"]),
+        ]
+
+    def test_progress_flush_counts_as_change(self, session, test_user):
+        """Should sync reading progress written by the batch flush."""
+        article = _create(session, test_user.id)
+        *_, token = _sync_all(session, test_user.id)
+
+        progress_service.record_progress(test_user.id, article.id, 0.5)
+        progress_service.flush(session)
+        changed, _, _ = _sync_all(session, test_user.id, token)
+
+        assert changed == [article.id]
+
+    def test_deletes_come_back_as_tombstones(self, session, test_user):
+        """Should report single and bulk deletes after the token."""
+        articles = [_create(session, test_user.id, f"A{i}") for i in range(3)]
+        *_, token = _sync_all(session, test_user.id)
+
+        article_service.delete_article(session, articles[0].id, test_user.id)
+        article_service.bulk_update_articles(
+            session,
+            test_user.id,
+            "delete",
+            article_ids=[articles[1].id, articles[2].id],
+        )
+        changed, deleted, _ = _sync_all(session, test_user.id, token, limit=1)
+
+        assert changed == []
+        assert sorted(deleted) == sorted(a.id for a in articles)
+
+    def test_other_users_changes_hidden(self, session, test_user):
+        """Should only return the user's own changes and deletes."""
+        article = _create(session, test_user.id)
+        *_, token = _sync_all(session, test_user.id + 1)
+
+        article_service.delete_article(session, article.id, test_user.id)
+
+        assert _sync_all(session, test_user.id + 1, token)[:2] == ([], [])
+
+    def test_order_follows_commits_not_clock(self, session, test_user):
+        """Should return a change stamped with an older updated_at."""
+        article = _create(session, test_user.id)
+        *_, token = _sync_all(session, test_user.id)
+
+        skewed = utc_now() - timedelta(hours=1)
+        session.execute(
+            update(Article)
+            .where(Article.id == article.id)
+            .values(title="Late", updated_at=skewed)
+        )
+        page, _, _, _ = sync_service.changes_since(session, test_user.id, token, 10)
+
+        assert [a.title for a in page] == ["Late"]
+
+    def test_idle_library_token_stays_fresh(self, session, test_user, monkeypatch):
+        """Should issue a new token on every sync, even with nothing changed."""
+        _create(session, test_user.id)
+        real_now = sync_service.utc_now
+        monkeypatch.setattr(
+            sync_service, "utc_now", lambda: real_now() - timedelta(days=80)
+        )
+        *_, token = _sync_all(session, test_user.id)
+        monkeypatch.setattr(sync_service, "utc_now", real_now)
+
+        *_, next_token = _sync_all(session, test_user.id, token)
+
+        assert _position(next_token) == _position(token)
+        assert utc_now() - sync_service.decode_token(next_token)[1] < timedelta(
+            seconds=5
+        )
+
+    def test_expired_token(self, session, test_user, monkeypatch):
+        """Should refuse tokens older than the tombstone retention."""
+        real_now = sync_service.utc_now
+        monkeypatch.setattr(
+            sync_service, "utc_now", lambda: real_now() - timedelta(days=365)
+        )
+        token = sync_service.encode_token((1, 1, 0, 1))
+        monkeypatch.setattr(sync_service, "utc_now", real_now)
+
+        with pytest.raises(sync_service.SyncTokenExpired):
+            sync_service.changes_since(session, test_user.id, token, 10)
+
+    def test_prune_tombstones(self, session, test_user):
+        """Should drop tombstones past the retention period only."""
+        article = _create(session, test_user.id)
+        article_service.delete_article(session, article.id, test_user.id)
+
+        assert sync_service.prune_tombstones(session, days=1) == 0
+        assert sync_service.prune_tombstones(session, days=-1) == 1
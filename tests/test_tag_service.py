@@ -0,0 +1,121 @@
+"""
+Tests for article tags and per-tag counts.
+"""
+
+from sqlalchemy import text
+
+from services import article_service, tag_service
+
+
+def _create(session, user_id, title="Article"):
+    """Save an article through the service and return it."""
+    return article_service.create_article(
+        session, user_id, "https://example.com", title, "content", "excerpt", None
+    )
+
+
+def _tag_counts(session, user_id):
+    """Return the user's tag counts as a dict."""
+    return {t.tag: t.count for t in tag_service.list_tags(session, user_id)}
+
+
+class TestNormalizeTags:
+    """Test suite for tag name cleanup."""
+
+    def test_normalizes_and_dedupes(self):
+        """Should trim, lower-case, collapse spaces and drop repeats."""
+        tags = tag_service.normalize_tags([" Python ", "python", "Long   Read", ""])
+
+        assert tags == ["python", "long read"]
+
+    def test_parses_form_input(self):
+        """Should split comma-separated input."""
+        assert tag_service.parse_tags("a, B ,,c") == ["a", "b", "c"]
+
+
+class TestArticleTags:
+    """Test suite for tagging articles."""
+
+    def test_update_sets_tags_and_counts(self, session, test_user):
+        """Should replace tags and adjust counts for added and removed tags."""
+        first = _create(session, test_user.id, "First")
+        second = _create(session, test_user.id, "Second")
+
+        article_service.update_article(
+            session, first.id, test_user.id, tags=["Python", "db"]
+        )
+        article_service.update_article(session, second.id, test_user.id, tags=["db"])
+        updated = article_service.update_article(
+            session, first.id, test_user.id, tags=["db", "news"]
+        )
+
+        assert updated.tags == ["db", "news"]
+        assert _tag_counts(session, test_user.id) == {"db": 2, "news": 1}
+
+    def test_list_by_tag(self, session, test_user):
+        """Should list only articles carrying the tag, newest first."""
+        older = _create(session, test_user.id, "Older")
+        _create(session, test_user.id, "Untagged")
+        newer = _create(session, test_user.id, "Newer")
+        for article in (older, newer):
+            article_service.update_article(
+                session, article.id, test_user.id, tags=["db"]
+            )
+
+        articles = article_service.list_articles(session, test_user.id, tag="db")
+
+        assert [a.id for a in articles] == [newer.id, older.id]
+
+    def test_delete_decrements_counts(self, session, test_user):
+        """Should drop a tag from the list when its last article is deleted."""
+        article = _create(session, test_user.id)
+        article_service.update_article(session, article.id, test_user.id, tags=["x"])
+
+        article_service.delete_article(session, article.id, test_user.id)
+
+        assert _tag_counts(session, test_user.id) == {}
+
+    def test_bulk_tag_and_untag(self, session, test_user):
+        """Should count only articles whose tags actually change."""
+        ids = [_create(session, test_user.id, f"A{i}").id for i in range(3)]
+        article_service.update_article(session, ids[0], test_user.id, tags=["db"])
+
+        tagged = article_service.bulk_update_articles(
+            session, test_user.id, "tag", article_ids=ids, tag="DB"
+        )
+        assert tagged == 2
+        assert _tag_counts(session, test_user.id) == {"db": 3}
+
+        untagged = article_service.bulk_update_articles(
+            session, test_user.id, "untag", tagged="db", tag="db"
+        )
+        assert untagged == 3
+        assert _tag_counts(session, test_user.id) == {}
+
+    def test_reconcile_matches_incremental_counts(self, session, test_user):
+        """Should rebuild the same counts from the article table."""
+        for tags in (["a", "b"], ["b"], []):
+            article = _create(session, test_user.id)
+            article_service.update_article(session, article.id, test_user.id, tags=tags)
+        expected = _tag_counts(session, test_user.id)
+
+        tag_service.reconcile_tags(session, test_user.id)
+
+        assert _tag_counts(session, test_user.id) == expected == {"a": 1, "b": 2}
+
+    def test_tag_lookup_uses_index(self, session, test_user):
+        """Should find tagged articles through the GIN index."""
+        from core.models import Article
+        from sqlmodel import select
+
+        # Without btree_gin the index holds only tags, and on tiny test
+        # tables the user_id index wins, so check the tag predicate alone.
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        query = select(Article.id).where(tag_service.tag_condition(session, "db"))
+        compiled = query.compile(
+            session.get_bind(), compile_kwargs={"literal_binds": True}
+        )
+
+        plan = session.execute(text(f"EXPLAIN {compiled}")).scalars().all()
+
+        assert "ix_article_user_tags" in "\n".join(plan)
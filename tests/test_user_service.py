@@ -0,0 +1,62 @@
+"""
+Tests for user lookup and creation on login.
+"""
+
+import pytest
+from sqlmodel import select
+
+from services import user_service
+
+
+@pytest.fixture(autouse=True)
+def clear_login_cache():
+    """Start each test with an empty login cache (ids differ per test)."""
+    user_service._login_cache.clear()
+    yield
+    user_service._login_cache.clear()
+
+
+class TestGetOrCreateUser:
+    """Test suite for the login upsert."""
+
+    def test_creates_new_user(self, session):
+        """Should insert a user for an unknown email."""
+        from core.models import User
+
+        user = user_service.get_or_create_user(session, "new@example.com", "New")
+
+        row = session.exec(select(User).where(User.email == "new@example.com")).one()
+        assert user.id == row.id
+        assert user.name == "New"
+
+    def test_returns_existing_user(self, session, test_user):
+        """Should return the existing row without changing its name."""
+        user = user_service.get_or_create_user(session, test_user.email, "Renamed")
+
+        assert user.id == test_user.id
+        assert user.name == "Test User"
+
+    def test_repeat_login_skips_database(self, session, monkeypatch):
+        """Should serve a recent login from the cache."""
+        first = user_service.get_or_create_user(session, "repeat@example.com")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("database was queried")
+
+        monkeypatch.setattr(session, "execute", fail)
+        second = user_service.get_or_create_user(session, "repeat@example.com")
+
+        assert second.id == first.id
+
+    def test_concurrent_first_login_reuses_row(self, session):
+        """Should return the row created by a racing login, not fail."""
+        from core.models import User
+
+        first = user_service.get_or_create_user(session, "race@example.com")
+        user_service._login_cache.clear()
+
+        second = user_service.get_or_create_user(session, "race@example.com")
+
+        rows = session.exec(select(User).where(User.email == "race@example.com"))
+        assert second.id == first.id
+        assert len(rows.all()) == 1